@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# IPC benchmark for _LayerShellDisplay against a stub helper.  No Wayland,
+# no compositor and no display needed (GTK must be importable).
+#
+# The stub speaks the same stdin protocol as _LAYER_SHELL_HELPER — it even
+# parses with the same _HELPER_PROTOCOL code — but instead of painting it
+# timestamps every line it receives and dumps the log as JSON on exit.
+# Control messages carry a sequence number in their arguments, so the
+# main-process send time and the stub receipt time can be matched up
+# (both sides use CLOCK_MONOTONIC, which is shared across processes).
+#
+#   python3 benchmarks/bench_ipc.py                     # fps 10, 30, saturate
+#   python3 benchmarks/bench_ipc.py --fps 0 --size 400x250 --duration 10
+#   python3 benchmarks/bench_ipc.py --paint-ms 5        # slow consumer
+#
+# Per run it reports:
+#   fps          FRAME lines received by the stub per second
+#   MB/s         bytes written to the helper's stdin (bytes_sent)
+#   dropped      frames replaced in the pipe channel's drop-old frame slot
+#   enq ms       mean main-thread cost of send_frame(), including the
+#                non-blocking write when the pipe has room
+#   ACTIVE/SIZE/POS  send -> receipt latency, p50 / p95 / max in ms
+
+import argparse, json, os, statistics, sys, tempfile, time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+import eve_o_preview_linux as eop
+from gi.repository import GdkPixbuf, GLib
+
+_STUB_HELPER = eop._HELPER_PROTOCOL + r"""
+import json, os, sys, time
+
+_OUT = os.environ["EVE_BENCH_IPC_OUT"]
+_PAINT_S = float(os.environ.get("EVE_BENCH_IPC_PAINT_MS", "0")) / 1000.0
+frames, frame_bytes, ctrl = 0, 0, []
+
+stdin = sys.stdin.buffer
+for raw in iter(stdin.readline, b""):
+    t = time.monotonic_ns()
+    line = raw.decode("ascii", "replace").rstrip("\n")
+    parsed = _parse_command(line)
+    if parsed is None:
+        continue
+    cmd, args = parsed
+    if cmd == "QUIT":
+        break
+    if cmd == "FRAME":
+        frames += 1
+        frame_bytes += len(raw)
+        if _PAINT_S:
+            time.sleep(_PAINT_S)
+    elif cmd == "POS":
+        ctrl.append(("POS", args[0], t))
+    elif cmd == "SIZE":
+        ctrl.append(("SIZE", args[0], t))
+    elif cmd == "ACTIVE":
+        ctrl.append(("ACTIVE", int(args[1].lstrip("#"), 16), t))
+
+with open(_OUT, "w") as f:
+    json.dump({"frames": frames, "frame_bytes": frame_bytes, "ctrl": ctrl}, f)
+"""
+
+def _pixbuf(w, h):
+    data = bytes((i * 7) & 0xFF for i in range(w * 4)) * h
+    return GdkPixbuf.Pixbuf.new_from_bytes(
+        GLib.Bytes.new(data), GdkPixbuf.Colorspace.RGB, True, 8, w, h, w * 4)
+
+def _pct(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))]
+
+def run_once(fps, size, args):
+    w, h = size
+    fd, out = tempfile.mkstemp(prefix="eve-o-ipc-", suffix=".json")
+    os.close(fd)
+    os.environ["EVE_BENCH_IPC_OUT"] = out
+    os.environ["EVE_BENCH_IPC_PAINT_MS"] = str(args.paint_ms)
+    disp = eop._LayerShellDisplay(0, 0, w, h, None, None, None)
+    pb = _pixbuf(w, h)
+    loop = GLib.MainLoop()
+    sent = {}            # (kind, seq) -> monotonic ns at send
+    enqueue_ns = []
+    # Sequence numbers start high so they never match the SIZE/POS values
+    # the constructor sends during setup.
+    seq = [100000]
+
+    def push_frame():
+        t0 = time.monotonic_ns()
+        disp.send_frame(pb)
+        enqueue_ns.append(time.monotonic_ns() - t0)
+        return True
+
+    def push_ctrl():
+        # One of each per tick, like a hover (SIZE), an activation change
+        # (ACTIVE) and a drag (POS) all arriving while frames stream.
+        seq[0] += 1
+        n = seq[0]
+        now = time.monotonic_ns()
+        sent[("ACTIVE", n)] = now
+        disp.send_active(n % 2 == 0, f"#{n:06X}")
+        sent[("SIZE", n)] = now
+        disp.set_size(n, h)
+        sent[("POS", n)] = now
+        disp.set_pos(n, 0)
+        return True
+
+    if fps > 0:
+        frame_src = GLib.timeout_add(max(1, int(1000 / fps)), push_frame)
+    else:
+        frame_src = GLib.idle_add(push_frame)
+    ctrl_src = GLib.timeout_add(int(1000 / args.ctrl_hz), push_ctrl)
+    # bytes_sent includes the two setup messages; measure from a clean start.
+    base_bytes = disp.bytes_sent
+    t_start = time.monotonic()
+    GLib.timeout_add(int(args.duration * 1000), loop.quit)
+    loop.run()
+    span = time.monotonic() - t_start
+    GLib.source_remove(frame_src)
+    GLib.source_remove(ctrl_src)
+    bytes_sent = disp.bytes_sent - base_bytes
+    dropped = disp.frames_dropped
+
+    # The pipe is driven from the main loop: let it finish the frame in
+    # flight and the QUIT before waiting for the stub.
+    disp.destroy()
+    ctx = GLib.MainContext.default()
+    while disp._chan.pending:
+        ctx.iteration(True)
+    try:
+        disp._proc.wait(timeout=30)
+    except Exception:
+        disp._proc.kill()
+    with open(out) as f:
+        log = json.load(f)
+    os.unlink(out)
+
+    latency = {"ACTIVE": [], "SIZE": [], "POS": []}
+    for kind, n, t_recv in log["ctrl"]:
+        t_sent = sent.get((kind, n))
+        if t_sent is not None:
+            latency[kind].append((t_recv - t_sent) / 1e6)
+    return {
+        "fps_target": fps,
+        "size": f"{w}x{h}",
+        "frames_received": log["frames"],
+        "fps": log["frames"] / span,
+        "mb_per_s": bytes_sent / span / 1e6,
+        "frames_sent": len(enqueue_ns),
+        "frames_dropped": dropped,
+        "enqueue_ms_mean": statistics.mean(enqueue_ns) / 1e6 if enqueue_ns else 0.0,
+        "latency_ms": {k: {"n": len(v),
+                           "p50": _pct(v, 50), "p95": _pct(v, 95),
+                           "max": max(v) if v else 0.0}
+                       for k, v in latency.items()},
+    }
+
+def main():
+    ap = argparse.ArgumentParser(description="_LayerShellDisplay IPC benchmark.")
+    ap.add_argument("--fps", type=int, nargs="+", default=[10, 30, 0],
+                    help="frame rates to test; 0 = saturate the pipe")
+    ap.add_argument("--size", default="320x200", help="thumbnail size")
+    ap.add_argument("--ctrl-hz", type=float, default=20.0,
+                    help="ACTIVE+SIZE+POS bursts per second")
+    ap.add_argument("--paint-ms", type=float, default=0.0,
+                    help="stub per-frame consumer delay (simulates paint)")
+    ap.add_argument("--duration", type=float, default=5.0)
+    ap.add_argument("--json", help="also write results to this file")
+    args = ap.parse_args()
+    size = tuple(int(v) for v in args.size.lower().split("x"))
+
+    # The stub replaces the real helper for every display created below.
+    eop._LAYER_SHELL_HELPER = _STUB_HELPER
+
+    results = []
+    print(f"{'fps':>4} {'recv':>6} {'MB/s':>7} {'sent':>6} {'drop':>6} {'enq ms':>7}"
+          + "".join(f" {k + ' p50/p95/max':>22}" for k in ("ACTIVE", "SIZE", "POS")))
+    for fps in args.fps:
+        r = run_once(fps, size, args)
+        results.append(r)
+        lat = "".join(
+            f" {r['latency_ms'][k]['p50']:>6.2f}/{r['latency_ms'][k]['p95']:>6.2f}"
+            f"/{r['latency_ms'][k]['max']:>7.2f}" for k in ("ACTIVE", "SIZE", "POS"))
+        print(f"{fps if fps else 'max':>4} {r['fps']:>6.1f} {r['mb_per_s']:>7.2f} "
+              f"{r['frames_sent']:>6} {r['frames_dropped']:>6} "
+              f"{r['enqueue_ms_mean']:>7.3f}{lat}", flush=True)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# Micro-benchmarks for the pure-Python hot paths.  No display needed (GTK
+# and GdkPixbuf must be importable; NumPy is optional).
+#
+#   python3 benchmarks/bench_micro.py                 # run and print
+#   python3 benchmarks/bench_micro.py --save          # store as baseline
+#   python3 benchmarks/bench_micro.py --compare       # flag regressions
+#   python3 benchmarks/bench_micro.py --compare --threshold 0.10 -k scale
+#
+# Baselines are JSON files, per machine by default:
+#   benchmarks/baselines/micro-<hostname>.json
+# --compare exits with status 1 when any benchmark is slower than its
+# baseline by more than --threshold (default 15 %), so it can gate CI.
+
+import argparse, base64, json, os, platform, socket, statistics, sys, time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+import eve_o_preview_linux as eop
+from gi.repository import GdkPixbuf, GLib
+
+DEFAULT_BASELINE = os.path.join(HERE, "baselines", f"micro-{socket.gethostname()}.json")
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+class _FakeWnckWindow:
+    """Just enough of Wnck.Window for is_eve_window_steamaware()."""
+
+    def __init__(self, name, pid):
+        self._name, self._pid = name, pid
+
+    def get_name(self):
+        return self._name
+
+    def get_pid(self):
+        return self._pid
+
+class _FakeProc:
+    """Stands in for the helper: stdin is /dev/null, nothing is read."""
+
+    def __init__(self):
+        self.stdin = open(os.devnull, "wb", buffering=0)
+
+def _display_without_helper():
+    """A _LayerShellDisplay whose pipe channel writes to /dev/null."""
+    disp = object.__new__(eop._LayerShellDisplay)
+    chan = object.__new__(eop._PipeChannel)
+    chan._proc = _FakeProc()
+    chan._wfd = chan._proc.stdin.fileno()
+    chan._ctrl = eop._collections.deque()
+    chan._frame = chan._out = chan._out_watch = None
+    chan._out_is_frame = chan._closing = False
+    chan.bytes_sent = chan.frames_dropped = 0
+    disp._chan = chan
+    return disp
+
+def _pixbuf(w, h, alpha):
+    n = 4 if alpha else 3
+    data = bytes((i * 7) & 0xFF for i in range(w * n)) * h
+    return GdkPixbuf.Pixbuf.new_from_bytes(
+        GLib.Bytes.new(data), GdkPixbuf.Colorspace.RGB, alpha, 8, w, h, w * n)
+
+# ---------------------------------------------------------------------------
+# Benchmarks — each returns a zero-argument callable (one "operation").
+# ---------------------------------------------------------------------------
+
+def bench_classify():
+    # A parent PID is a real /proc entry that is not SELF_PID, so the
+    # cmdline-reading branches run for titles that reach them.
+    pid = os.getppid()
+    windows = [_FakeWnckWindow(n, pid) for n in (
+        "EVE - Some Pilot", "EVE", "EVE Launcher", "Untitled window",
+        "Wine Desktop", "Firefox", "EVE - Alt Two [Omega]", "")]
+
+    def run():
+        for w in windows:
+            eop.is_eve_window_steamaware(w)
+    return run
+
+def bench_character_name():
+    titles = ["EVE - Some Pilot", "EVE - Alt Two [Omega]", "EVE",
+              "EVE - Name With Spaces - Dash"]
+
+    def run():
+        for t in titles:
+            eop._character_name(t)
+    return run
+
+def bench_send_frame():
+    disp = _display_without_helper()
+    pb = _pixbuf(320, 200, True)
+
+    def run():
+        disp.send_frame(pb)
+    return run
+
+def bench_send_frame_rgb():
+    # RGB input pays for add_alpha() as well.
+    disp = _display_without_helper()
+    pb = _pixbuf(320, 200, False)
+
+    def run():
+        disp.send_frame(pb)
+    return run
+
+def bench_pipe_flush():
+    # One operation = 50 queued control messages + 1 frame written by one
+    # _PipeChannel._flush(), as when an OUT watch fires after a full pipe.
+    frame = b"FRAME 320 200 1280 " + base64.b64encode(bytes(320 * 200 * 4)) + b"\n"
+    ctrl = [b"POS 100 200\n", b"ACTIVE 1 #00FF00\n", b"SIZE 400 250\n"] * 17
+    chan = _display_without_helper()._chan
+
+    def run():
+        chan._ctrl.extend(ctrl[:50])
+        chan._frame = frame
+        chan._flush()
+    return run
+
+def _helper_parser():
+    ns = {}
+    exec(eop._HELPER_PROTOCOL, ns)
+    return ns["_parse_command"]
+
+def bench_helper_parse_ctrl():
+    parse = _helper_parser()
+    lines = ["POS 100 200", "SIZE 400 250", "ACTIVE 1 #00FF00",
+             "TITLE Some Pilot", "SHOW", "HIDE"]
+
+    def run():
+        for line in lines:
+            parse(line)
+    return run
+
+def bench_helper_parse_frame():
+    parse = _helper_parser()
+    line = "FRAME 320 200 1280 " + base64.b64encode(bytes(320 * 200 * 4)).decode()
+
+    def run():
+        parse(line)
+    return run
+
+def bench_scale_gdk():
+    pb = _pixbuf(2560, 1440, False)
+
+    def run():
+        pb.scale_simple(320, 200, GdkPixbuf.InterpType.BILINEAR)
+    return run
+
+def bench_scale_numpy():
+    if eop._np is None:
+        return None
+    pb = _pixbuf(2560, 1440, False)
+    scaler = eop._AreaScaler()
+
+    def run():
+        eop._array_to_pixbuf(scaler.scale(eop._pixbuf_array(pb), 320, 200))
+    return run
+
+def bench_scale_numpy_nearest():
+    if eop._np is None:
+        return None
+    pb = _pixbuf(2560, 1440, False)
+    scaler = eop._AreaScaler()
+
+    def run():
+        eop._array_to_pixbuf(scaler.nearest(eop._pixbuf_array(pb), 320, 200))
+    return run
+
+def bench_scale_numpy_tiles():
+    if eop._np is None:
+        return None
+    pb = _pixbuf(2560, 1440, False)
+    scaler = eop._AreaScaler()
+
+    def run():
+        eop._array_to_pixbuf(scaler.tiles(eop._pixbuf_array(pb), 320, 200))
+    return run
+
+def bench_scale_pooled():
+    # The tick's pooled path: capture surface -> out surface, no new buffers.
+    if eop._cairo is None:
+        return None
+    pool = eop._FramePool()
+    src, arr = pool.surface("src", 2560, 1440)
+    scaler = eop._AreaScaler() if eop._np is not None else None
+
+    def run():
+        pool.scale(src, arr, 320, 200, "bilinear", scaler)
+    return run
+
+BENCHMARKS = [
+    ("classify_windows", bench_classify),
+    ("character_name", bench_character_name),
+    ("send_frame_rgba_320x200", bench_send_frame),
+    ("send_frame_rgb_320x200", bench_send_frame_rgb),
+    ("pipe_flush_50ctrl_1frame", bench_pipe_flush),
+    ("helper_parse_ctrl", bench_helper_parse_ctrl),
+    ("helper_parse_frame_320x200", bench_helper_parse_frame),
+    ("scale_gdk_bilinear_2560x1440", bench_scale_gdk),
+    ("scale_numpy_area_2560x1440", bench_scale_numpy),
+    ("scale_numpy_nearest_2560x1440", bench_scale_numpy_nearest),
+    ("scale_numpy_tiles_2560x1440", bench_scale_numpy_tiles),
+    ("scale_pooled_2560x1440", bench_scale_pooled),
+]
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def _measure(fn, repeats, min_time):
+    fn()  # warm-up
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - t0 >= min_time:
+            break
+        number *= 2
+    samples = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - t0) / number * 1e6)
+    return {"median_us": statistics.median(samples), "min_us": min(samples),
+            "number": number, "repeats": repeats}
+
+def _compare(results, baseline, threshold):
+    regressions = []
+    print(f"\n{'benchmark':<32}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, cur in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            print(f"{name:<32}{'—':>12}{cur['median_us']:>10.1f}us{'new':>9}")
+            continue
+        change = cur["median_us"] / base["median_us"] - 1.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<32}{base['median_us']:>10.1f}us{cur['median_us']:>10.1f}us"
+              f"{change * 100:>+8.1f}%{flag}")
+    return regressions
+
+def main():
+    ap = argparse.ArgumentParser(description="Micro-benchmarks with stored baselines.")
+    ap.add_argument("-k", dest="pattern", help="only run benchmarks containing this")
+    ap.add_argument("--repeats", type=int, default=5)
+    ap.add_argument("--min-time", type=float, default=0.1,
+                    help="seconds per repeat (auto-scales iterations)")
+    ap.add_argument("--save", nargs="?", const=DEFAULT_BASELINE,
+                    help=f"write results as baseline (default {DEFAULT_BASELINE})")
+    ap.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE,
+                    help="compare against a baseline file")
+    ap.add_argument("--threshold", type=float, default=0.15,
+                    help="relative slowdown that counts as a regression")
+    args = ap.parse_args()
+
+    results = {}
+    for name, factory in BENCHMARKS:
+        if args.pattern and args.pattern not in name:
+            continue
+        fn = factory()
+        if fn is None:
+            print(f"{name:<32}{'skipped':>12}")
+            continue
+        r = _measure(fn, args.repeats, args.min_time)
+        results[name] = r
+        print(f"{name:<32}{r['median_us']:>10.1f}us  (min {r['min_us']:.1f}us, "
+              f"{r['number']}x{r['repeats']})", flush=True)
+
+    status = 0
+    if args.compare:
+        try:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+        except OSError as e:
+            print(f"\nno baseline to compare against: {e}")
+        else:
+            regressions = _compare(results, baseline, args.threshold)
+            if regressions:
+                print(f"\n{len(regressions)} regression(s) beyond "
+                      f"{args.threshold * 100:.0f}%: {', '.join(regressions)}")
+                status = 1
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump({"host": socket.gethostname(),
+                       "python": platform.python_version(),
+                       "numpy": getattr(eop._np, "__version__", None),
+                       "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                       "results": results}, f, indent=2)
+        print(f"\nbaseline written to {args.save}")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# Scaling benchmark: GdkPixbuf.scale_simple() vs the NumPy area scaler.
+#
+# Needs GTK/GdkPixbuf (python3-gobject) and NumPy, but no display.
+#
+#   python3 benchmarks/bench_scale.py
+#   python3 benchmarks/bench_scale.py --iterations 200
+#
+# Each case builds a synthetic source frame at a typical EVE client
+# resolution and scales it to a typical thumbnail size.  The NumPy column
+# includes the pixbuf -> array view and the array -> pixbuf wrap, i.e. the
+# full cost ThumbnailWindow._scale() pays per tick.
+
+import argparse, os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import eve_o_preview_linux as eop
+from gi.repository import GdkPixbuf, GLib
+
+CASES = [
+    # (source w, h) -> (thumbnail w, h)
+    ((2560, 1440), (320, 200)),   # default thumbnail size, non-integer ratio
+    ((2560, 1440), (320, 180)),   # 8:1 integer box-filter fast path
+    ((2560, 1440), (400, 250)),   # zoomed (1.25x) default thumbnail
+    ((1920, 1080), (320, 180)),   # 6:1 integer
+    ((3840, 2160), (320, 200)),   # 4K client
+]
+
+def _make_source(w, h, alpha=False):
+    n = 4 if alpha else 3
+    # Gradient + noise: compressible enough to look like a frame, busy
+    # enough that a nearest-neighbour sampler would alias visibly.
+    rng = eop._np.random.default_rng(0)
+    arr = rng.integers(0, 256, size=(h, w, n), dtype=eop._np.uint8)
+    arr[..., 0] = (eop._np.arange(w) * 255 // w).astype(eop._np.uint8)
+    return GdkPixbuf.Pixbuf.new_from_bytes(
+        GLib.Bytes.new(arr.tobytes()), GdkPixbuf.Colorspace.RGB,
+        alpha, 8, w, h, w * n)
+
+def _time(fn, iterations):
+    fn()  # warm-up (builds the scaler plan, faults in pages)
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - t0) * 1000.0 / iterations
+
+def main():
+    ap = argparse.ArgumentParser(
+        description="Compare scale_simple() against the NumPy area scaler.")
+    ap.add_argument("--iterations", type=int, default=50)
+    args = ap.parse_args()
+
+    if eop._np is None:
+        print("NumPy is not installed — nothing to compare against.")
+        return 1
+
+    interps = [
+        ("nearest", GdkPixbuf.InterpType.NEAREST),
+        ("tiles", GdkPixbuf.InterpType.TILES),
+        ("bilinear", GdkPixbuf.InterpType.BILINEAR),
+    ]
+    header = f"{'source':>11} -> {'target':<9}"
+    header += "".join(f"{name:>11}" for name, _ in interps)
+    header += f"{'np-nearest':>11}{'np-tiles':>11}{'numpy':>11}{'speedup':>9}"
+    print(f"ms per frame, {args.iterations} iterations")
+    print(header)
+    print("-" * len(header))
+
+    for (sw, sh), (dw, dh) in CASES:
+        pb = _make_source(sw, sh)
+        scaler = eop._AreaScaler()
+        cols = []
+        for _name, interp in interps:
+            cols.append(_time(lambda: pb.scale_simple(dw, dh, interp),
+                              args.iterations))
+        cols.append(_time(
+            lambda: eop._array_to_pixbuf(
+                scaler.nearest(eop._pixbuf_array(pb), dw, dh)),
+            args.iterations))
+        cols.append(_time(
+            lambda: eop._array_to_pixbuf(
+                scaler.tiles(eop._pixbuf_array(pb), dw, dh)),
+            args.iterations))
+        np_ms = _time(
+            lambda: eop._array_to_pixbuf(
+                scaler.scale(eop._pixbuf_array(pb), dw, dh)),
+            args.iterations)
+        bilinear = cols[2]
+        line = f"{sw:>5}x{sh:<5} -> {dw:>3}x{dh:<5}"
+        line += "".join(f"{ms:>11.2f}" for ms in cols)
+        line += f"{np_ms:>11.2f}{bilinear / np_ms:>8.1f}x"
+        print(line)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
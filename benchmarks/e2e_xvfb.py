@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# Headless end-to-end benchmark: Xvfb + EWMH window manager + N synthetic
+# EVE clients + eve_o_preview_linux.py, measured from the outside.
+#
+# Requires: Xvfb, one of the window managers in WINDOW_MANAGERS, and the
+# same GTK/Wnck packages as the app itself.  No real EVE clients needed.
+#
+#   python3 benchmarks/e2e_xvfb.py                      # N = 1, 4, 10, 25
+#   python3 benchmarks/e2e_xvfb.py --clients 4 10 --fps 15 --duration 20
+#   python3 benchmarks/e2e_xvfb.py --json bench_output.json
+#
+# Per run it reports, for the preview process only:
+#   cpu%/client  utime+stime over the measurement window / N
+#   fps          capture spans per client per second (from --trace)
+#   cap ms       mean / p95 duration of the capture span
+#   rss MB       resident set size at the end of the run
+#   lag ms       main-loop lag (mean / max of the loop_lag_ms counter)
+
+import argparse, json, os, shutil, signal, subprocess, sys, tempfile, time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+APP = os.path.join(ROOT, "eve_o_preview_linux.py")
+CLIENT = os.path.join(HERE, "synthetic_client.py")
+
+# Lightweight window managers that implement the EWMH hints Wnck relies on
+# (_NET_CLIENT_LIST, _NET_ACTIVE_WINDOW).
+WINDOW_MANAGERS = [
+    ["openbox"],
+    ["fluxbox"],
+    ["icewm"],
+    ["xfwm4", "--compositor=off"],
+    ["metacity", "--replace"],
+]
+
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+
+def _free_display():
+    for n in range(99, 200):
+        if not os.path.exists(f"/tmp/.X11-unix/X{n}") and \
+                not os.path.exists(f"/tmp/.X{n}-lock"):
+            return n
+    raise RuntimeError("no free X display number")
+
+def _wait_for(pred, timeout, what):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if pred():
+            return
+        time.sleep(0.05)
+    raise RuntimeError(f"timed out waiting for {what}")
+
+def _cpu_seconds(pid):
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    # fields[11], fields[12] = utime, stime (0-based after the comm field)
+    return (int(fields[11]) + int(fields[12])) / CLK_TCK
+
+def _rss_mb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024.0
+    return 0.0
+
+def _percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))]
+
+class Session:
+    """Xvfb + window manager, torn down on exit."""
+
+    def __init__(self, screen):
+        self.display = f":{_free_display()}"
+        self.procs = []
+        self.env = dict(os.environ, DISPLAY=self.display, XDG_SESSION_TYPE="x11",
+                        GDK_BACKEND="x11")
+        self.env.pop("WAYLAND_DISPLAY", None)
+        self._spawn(["Xvfb", self.display, "-screen", "0", f"{screen}x24",
+                     "-nolisten", "tcp"])
+        num = self.display[1:]
+        _wait_for(lambda: os.path.exists(f"/tmp/.X11-unix/X{num}"), 10, "Xvfb")
+        for wm in WINDOW_MANAGERS:
+            if shutil.which(wm[0]):
+                self._spawn(wm)
+                time.sleep(1.0)
+                break
+        else:
+            raise RuntimeError("no supported window manager found: "
+                               + ", ".join(w[0] for w in WINDOW_MANAGERS))
+
+    def _spawn(self, argv, **kw):
+        p = subprocess.Popen(argv, env=kw.pop("env", self.env),
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **kw)
+        self.procs.append(p)
+        return p
+
+    def close(self):
+        for p in reversed(self.procs):
+            if p.poll() is None:
+                p.terminate()
+        for p in reversed(self.procs):
+            try:
+                p.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                p.kill()
+
+def run_once(session, n_clients, args):
+    home = tempfile.mkdtemp(prefix="eve-o-bench-")
+    trace = os.path.join(home, "trace.json")
+    cfg_dir = os.path.join(home, ".config", "eve-o-preview-linux")
+    os.makedirs(cfg_dir)
+    with open(os.path.join(cfg_dir, "config.json"), "w") as f:
+        json.dump({"refresh_fps": args.fps,
+                   "thumbnail_width": args.thumb[0],
+                   "thumbnail_height": args.thumb[1]}, f)
+
+    clients = [session._spawn([sys.executable, CLIENT, "exefile.exe",
+                               "--name", f"Char{i + 1}",
+                               "--fps", str(args.client_fps),
+                               "--size", args.client_size])
+               for i in range(n_clients)]
+    time.sleep(1.0 + 0.05 * n_clients)
+
+    env = dict(session.env, HOME=home)
+    app = subprocess.Popen([sys.executable, APP, "--trace", trace], env=env,
+                           stdout=subprocess.DEVNULL if not args.verbose else None,
+                           stderr=subprocess.DEVNULL if not args.verbose else None)
+    try:
+        time.sleep(args.warmup)
+        t_start = time.monotonic()
+        cpu_start = _cpu_seconds(app.pid)
+        time.sleep(args.duration)
+        cpu = _cpu_seconds(app.pid) - cpu_start
+        t_end = time.monotonic()
+        rss = _rss_mb(app.pid)
+    finally:
+        app.send_signal(signal.SIGTERM)
+        try:
+            app.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            app.kill()
+        for c in clients:
+            c.terminate()
+        for c in clients:
+            c.wait(timeout=5)
+            session.procs.remove(c)
+
+    with open(trace) as f:
+        events = json.load(f)["traceEvents"]
+    lo, hi = t_start * 1e6, t_end * 1e6   # trace ts are monotonic microseconds
+    per_client, durations, lags = {}, [], []
+    for ev in events:
+        ts = ev.get("ts", 0)
+        if not lo <= ts <= hi:
+            continue
+        if ev.get("ph") == "X" and ev.get("name") == "capture":
+            xid = ev.get("args", {}).get("xid")
+            per_client[xid] = per_client.get(xid, 0) + 1
+            durations.append(ev["dur"] / 1000.0)
+        elif ev.get("ph") == "C" and ev.get("name") == "loop_lag_ms":
+            lags.append(ev["args"]["loop_lag_ms"])
+    shutil.rmtree(home, ignore_errors=True)
+
+    span = t_end - t_start
+    fps = [c / span for c in per_client.values()]
+    return {
+        "clients": n_clients,
+        "detected": len(per_client),
+        "cpu_pct_per_client": 100.0 * cpu / span / n_clients,
+        "cpu_pct_total": 100.0 * cpu / span,
+        "fps_mean": sum(fps) / len(fps) if fps else 0.0,
+        "fps_min": min(fps) if fps else 0.0,
+        "capture_ms_mean": sum(durations) / len(durations) if durations else 0.0,
+        "capture_ms_p95": _percentile(durations, 95),
+        "rss_mb": rss,
+        "loop_lag_ms_mean": sum(lags) / len(lags) if lags else 0.0,
+        "loop_lag_ms_max": max(lags) if lags else 0.0,
+    }
+
+def main():
+    ap = argparse.ArgumentParser(description="Xvfb end-to-end benchmark.")
+    ap.add_argument("--clients", type=int, nargs="+", default=[1, 4, 10, 25])
+    ap.add_argument("--fps", type=int, default=10, help="preview refresh_fps")
+    ap.add_argument("--client-fps", type=float, default=30.0,
+                    help="synthetic client repaint rate")
+    ap.add_argument("--client-size", default="1280x720")
+    ap.add_argument("--thumb", type=int, nargs=2, default=[320, 200],
+                    metavar=("W", "H"))
+    ap.add_argument("--screen", default="2560x1440")
+    ap.add_argument("--warmup", type=float, default=5.0)
+    ap.add_argument("--duration", type=float, default=15.0)
+    ap.add_argument("--json", help="also write results to this file")
+    ap.add_argument("--verbose", action="store_true", help="show app output")
+    args = ap.parse_args()
+
+    session = Session(args.screen)
+    results = []
+    try:
+        print(f"{'N':>3} {'found':>5} {'cpu%/cl':>8} {'cpu%':>7} {'fps':>11} "
+              f"{'cap ms':>13} {'rss MB':>7} {'lag ms':>12}")
+        for n in args.clients:
+            r = run_once(session, n, args)
+            results.append(r)
+            print(f"{n:>3} {r['detected']:>5} {r['cpu_pct_per_client']:>8.1f} "
+                  f"{r['cpu_pct_total']:>7.1f} "
+                  f"{r['fps_mean']:>5.1f}/{r['fps_min']:<5.1f} "
+                  f"{r['capture_ms_mean']:>6.2f}/{r['capture_ms_p95']:<6.2f} "
+                  f"{r['rss_mb']:>7.1f} "
+                  f"{r['loop_lag_ms_mean']:>5.1f}/{r['loop_lag_ms_max']:<6.1f}",
+                  flush=True)
+    finally:
+        session.close()
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# Synthetic EVE client for the Xvfb end-to-end benchmark (e2e_xvfb.py).
+#
+# Opens one X11 window titled "EVE - <name>" and repaints it at a fixed
+# rate with a moving pattern, so captures always see changing pixels.
+# The first argument is a marker that ends up in /proc/<pid>/cmdline;
+# passing "exefile.exe" makes _is_real_eve_client_process() accept the
+# window exactly like a Wine/Proton EVE client.
+#
+#   python3 benchmarks/synthetic_client.py exefile.exe --name Char1 --fps 30
+
+import argparse, os, sys
+
+os.environ["GDK_BACKEND"] = "x11"
+import gi
+gi.require_version("Gtk", "3.0")
+from gi.repository import Gtk, GLib
+
+def main():
+    ap = argparse.ArgumentParser(description="Animated stand-in for an EVE client window.")
+    ap.add_argument("marker", help="process marker, e.g. exefile.exe")
+    ap.add_argument("--name", default="Char1")
+    ap.add_argument("--fps", type=float, default=30.0,
+                    help="repaint rate; 0 = static window")
+    ap.add_argument("--size", default="1280x720")
+    args = ap.parse_args()
+    w, h = (int(v) for v in args.size.lower().split("x"))
+
+    win = Gtk.Window(title=f"EVE - {args.name}")
+    win.set_default_size(w, h)
+    area = Gtk.DrawingArea()
+    win.add(area)
+    frame = [0]
+
+    def draw(widget, cr):
+        aw, ah = widget.get_allocated_width(), widget.get_allocated_height()
+        t = frame[0]
+        cr.set_source_rgb(0.05, 0.07, 0.12)
+        cr.paint()
+        # Sweeping bars + a moving block: cheap to draw, never static.
+        for i in range(16):
+            x = (t * 7 + i * aw // 16) % aw
+            cr.set_source_rgb((i * 37 % 255) / 255.0, (t % 255) / 255.0, 0.6)
+            cr.rectangle(x, 0, aw // 64, ah)
+            cr.fill()
+        cr.set_source_rgb(1.0, 0.8, 0.2)
+        cr.rectangle((t * 11) % aw, (t * 5) % ah, aw // 8, ah // 8)
+        cr.fill()
+        return False
+
+    def tick():
+        frame[0] += 1
+        area.queue_draw()
+        return True
+
+    area.connect("draw", draw)
+    win.connect("destroy", Gtk.main_quit)
+    if args.fps > 0:
+        GLib.timeout_add(max(1, int(1000 / args.fps)), tick)
+    win.show_all()
+    Gtk.main()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -64,16 +64,146 @@ except ValueError as _e:
 from gi.repository import Gtk, Gdk, GdkPixbuf, Wnck, GLib, GdkX11
 import ctypes, ctypes.util
 
+# NumPy is optional. When it is importable, thumbnails are downscaled with an
+# area-averaging filter on a view of the captured pixels instead of
+# GdkPixbuf.scale_simple(BILINEAR), which aliases badly at 8:1 and beyond.
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+# pycairo is optional as well.  With it, frames are captured into reusable
+# cairo surfaces (_FramePool) instead of a fresh GdkPixbuf every tick.
+try:
+    import cairo as _cairo
+except ImportError:
+    _cairo = None
+
+# ---------------------------------------------------------------------------
+# Helper stdin protocol parser.  Prepended to _LAYER_SHELL_HELPER and kept as
+# a separate, GTK-free string so benchmarks can exec() and time exactly the
+# code the helper runs.
+# ---------------------------------------------------------------------------
+_HELPER_PROTOCOL = r"""
+import base64
+
+def _parse_command(line):
+    '''Parse one main-process -> helper line.
+
+    Returns (cmd, args) with args ready to pass to the handler, or None for
+    unknown or malformed lines.  FRAME payloads are base64-decoded here.
+    '''
+    parts = line.split(" ", 4)
+    cmd = parts[0]
+    n = len(parts)
+    if cmd == "FRAME" and n == 5:
+        return cmd, (int(parts[1]), int(parts[2]), int(parts[3]),
+                     base64.b64decode(parts[4]))
+    if cmd in ("POS", "SIZE") and n == 3:
+        return cmd, (int(parts[1]), int(parts[2]))
+    if cmd == "ACTIVE" and n == 3:
+        return cmd, (parts[1] == "1", parts[2])
+    if cmd == "ZOOM" and n == 2:
+        return cmd, (float(parts[1]),)
+    if cmd == "SHMFRAME" and n >= 3:
+        return cmd, (int(parts[1]), " ".join(parts[2:]))
+    if cmd == "TITLE":
+        return cmd, (" ".join(parts[1:]),)
+    if cmd in ("SHOW", "HIDE", "QUIT"):
+        return cmd, ()
+    return None
+"""
+
+# ---------------------------------------------------------------------------
+# Shared-memory frame slots.  A slot is a file on tmpfs holding two buffers
+# that a capture worker fills alternately and readers mmap.  Each buffer
+# starts with a 32-byte header (seq, w, h, rowstride, format); seq is zeroed while
+# the pixels are written and set last, so a reader that sees the same
+# non-zero seq before and after its copy holds a whole frame (a seqlock).
+# Prepended to the worker and layer-shell helper scripts and exec'd into
+# this module, so all three processes share one implementation.
+# ---------------------------------------------------------------------------
+_SHM_FRAMES = r"""
+import struct as _struct
+
+_SHM_HDR = 32
+
+# Pixel formats.  RGBA is GdkPixbuf's layout; the others are cairo image
+# formats (native-endian, so BGRX / BGRA in memory on x86 and ARM) that
+# readers wrap in a surface without converting.
+_FMT_RGBA, _FMT_RGB24, _FMT_RGB565, _FMT_A8, _FMT_ARGB32 = range(5)
+
+def _shm_write(mm, seq, w, h, rs, data, fmt=_FMT_RGBA):
+    '''Write a frame into buffer seq % 2; return its offset, or -1 if too big.'''
+    half = len(mm) // 2
+    if _SHM_HDR + h * rs > half:
+        return -1
+    off = (seq % 2) * half
+    mm[off:off + 8] = bytes(8)
+    mm[off + _SHM_HDR:off + _SHM_HDR + len(data)] = data
+    mm[off + 8:off + 24] = _struct.pack("<IIII", w, h, rs, fmt)
+    mm[off:off + 8] = _struct.pack("<Q", seq)
+    return off
+
+def _shm_read(mm, off):
+    '''Copy the frame at off: (seq, w, h, rs, data, fmt), or None if empty/torn.'''
+    seq, w, h, rs, fmt = _struct.unpack_from("<QIIII", mm, off)
+    if not seq or _SHM_HDR + h * rs > len(mm) // 2:
+        return None
+    data = mm[off + _SHM_HDR:off + _SHM_HDR + h * rs]
+    if _struct.unpack_from("<Q", mm, off)[0] != seq:
+        return None
+    return seq, w, h, rs, data, fmt
+"""
+exec(_SHM_FRAMES)
+
 # ---------------------------------------------------------------------------
 # gtk-layer-shell subprocess helper script
 # Each thumbnail spawns one instance of this script with GDK_BACKEND=wayland.
 # It creates a GtkLayerShell OVERLAY window — guaranteed above every fullscreen
 # surface by the Wayland compositor — and communicates via stdin/stdout pipes.
 # ---------------------------------------------------------------------------
-_LAYER_SHELL_HELPER = r"""
-import sys, os, base64, threading, time as _time, ctypes as _ct
+_LAYER_SHELL_HELPER = _HELPER_PROTOCOL + _SHM_FRAMES + r"""
+import sys, os, base64, threading, mmap, time as _time, ctypes as _ct
 os.environ.setdefault("GDK_BACKEND", "wayland")
 
+# SHMFRAME support: frames a capture worker left in a shared-memory slot.
+_slots = {}
+
+def _read_shm_slot(off, path):
+    mm = _slots.get(path)
+    if mm is None:
+        try:
+            with open(path, "rb") as f:
+                mm = _slots[path] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError:
+            return None
+    frame = _shm_read(mm, off)
+    return frame[1:] if frame else None
+
+# --trace support: spans are kept in memory and dumped as a JSON list when
+# the helper exits; the main process merges them into its own trace file.
+_TRACE_PATH = os.environ.get("EVE_PREVIEW_TRACE_FILE")
+_trace_events = []
+
+def _trace(name, t0_ns, **args):
+    if _TRACE_PATH:
+        t1_ns = _time.monotonic_ns()
+        _trace_events.append({
+            "name": name, "cat": "helper", "ph": "X", "pid": os.getpid(),
+            "tid": threading.get_native_id(),
+            "ts": t0_ns / 1000.0, "dur": (t1_ns - t0_ns) / 1000.0,
+            "args": args})
+
+def _dump_trace():
+    if _TRACE_PATH:
+        import json
+        try:
+            with open(_TRACE_PATH, "w") as f:
+                json.dump(_trace_events, f)
+        except Exception as e:
+            sys.stderr.write(f"trace: {e}\n")
+
 # ---------------------------------------------------------------------------
 # XQueryPointer — true screen-absolute pointer position via X11/XWayland.
 # GDK3 Wayland derives "root" coordinates as window_origin + local_x, but
@@ -124,6 +254,12 @@ import gi
 gi.require_version('Gtk', '3.0')
 gi.require_version('GtkLayerShell', '0.1')
 from gi.repository import Gtk, Gdk, GdkPixbuf, GtkLayerShell, GLib
+try:
+    import cairo
+    _CAIRO_FORMATS = {_FMT_RGB24: cairo.FORMAT_RGB24, _FMT_RGB565: cairo.FORMAT_RGB16_565,
+                      _FMT_A8: cairo.FORMAT_A8, _FMT_ARGB32: cairo.FORMAT_ARGB32}
+except ImportError:
+    cairo = None     # the main process then only sends RGBA
 
 class _Thumb(Gtk.Window):
     def __init__(self):
@@ -161,6 +297,17 @@ class _Thumb(Gtk.Window):
         # draws children, so a plain connect() puts the border UNDER the image.
         self._border_color = None
         self.connect_after("draw", self._draw_border)
+        self._grey = None
+
+        # Hover zoom is applied here, not in the main process: SIZE sets the
+        # base size, ZOOM the factor (0 = off).  The last frame is kept so
+        # it can be rescaled at once; ENTER/LEAVE only tell the main process
+        # to switch capture size.
+        self._base = (0, 0)
+        self._zoom = 0.0
+        self._hover = False
+        self._leave_timer = None
+        self._shown = None            # (pixbuf or surface, w, h) as received
 
         # Drag / click state
         self._mx = self._my = 0
@@ -189,18 +336,110 @@ class _Thumb(Gtk.Window):
         GtkLayerShell.set_margin(self, GtkLayerShell.Edge.LEFT, x)
         GtkLayerShell.set_margin(self, GtkLayerShell.Edge.TOP, y)
 
-    def set_frame(self, w, h, rs, data):
+    def set_frame(self, w, h, rs, data, fmt=_FMT_RGBA):
         # new_from_bytes() wraps data in a GLib.Bytes that the pixbuf keeps
         # alive — unlike new_from_data(destroy_fn=None) which holds a raw
         # pointer that Python's GC can free while the pixbuf still uses it.
+        t0 = _time.monotonic_ns()
         try:
-            pb = GdkPixbuf.Pixbuf.new_from_bytes(
-                GLib.Bytes.new(data),
-                GdkPixbuf.Colorspace.RGB, True, 8, w, h, rs)
-            self._img.set_from_pixbuf(pb)
+            if fmt == _FMT_RGBA:
+                img = GdkPixbuf.Pixbuf.new_from_bytes(
+                    GLib.Bytes.new(data),
+                    GdkPixbuf.Colorspace.RGB, True, 8, w, h, rs)
+            else:
+                img = self._native_surface(w, h, rs, data, fmt)
+            self._shown = (img, w, h)
+            self._show()
+            _trace("paint", t0, w=w, h=h)
         except Exception as e:
             sys.stderr.write(f"frame: {e}\n")
 
+    def _size(self):
+        bw, bh = self._base
+        if self._hover and self._zoom > 1.0:
+            return int(bw * self._zoom), int(bh * self._zoom)
+        return bw, bh
+
+    def _show(self):
+        # Frames that don't match the surface size — the last one right
+        # after a zoom change, or any still in flight from before it — are
+        # rescaled here until the main process catches up.
+        if self._shown is None:
+            return
+        img, w, h = self._shown
+        tw, th = self._size()
+        if tw and th and (w, h) != (tw, th):
+            if isinstance(img, GdkPixbuf.Pixbuf):
+                img = img.scale_simple(tw, th, GdkPixbuf.InterpType.BILINEAR)
+            else:
+                out = cairo.ImageSurface(cairo.FORMAT_RGB24, tw, th)
+                cr = cairo.Context(out)
+                cr.scale(tw / w, th / h)
+                cr.set_source_surface(img, 0, 0)
+                cr.get_source().set_filter(cairo.FILTER_GOOD)
+                cr.paint()
+                img = out
+        if isinstance(img, GdkPixbuf.Pixbuf):
+            self._img.set_from_pixbuf(img)
+        else:
+            self._img.set_from_surface(img)
+
+    def set_size(self, w, h):
+        self._base = (w, h)
+        self._apply_size()
+
+    def set_zoom(self, factor):
+        self._zoom = factor
+        self._apply_size()
+
+    def _apply_size(self):
+        w, h = self._size()
+        if w and h:
+            self._show()
+            self.resize(w, h)
+
+    def _hover_start(self):
+        if self._leave_timer:
+            GLib.source_remove(self._leave_timer)
+            self._leave_timer = None
+        if not self._hover:
+            self._hover = True
+            self._apply_size()
+            self._emit("ENTER")
+
+    def _hover_end(self):
+        # 80 ms debounce: the compositor can send LEAVE+ENTER in quick
+        # succession (e.g. while the surface grows under the pointer).
+        if self._leave_timer:
+            GLib.source_remove(self._leave_timer)
+        self._leave_timer = GLib.timeout_add(80, self._do_leave)
+
+    def _do_leave(self):
+        self._leave_timer = None
+        if self._hover:
+            self._hover = False
+            self._apply_size()
+            self._emit("LEAVE")
+        return False
+
+    def _native_surface(self, w, h, rs, data, fmt):
+        # cairo formats are wrapped as-is; GTK paints them without a
+        # conversion.  Greyscale (A8) is expanded through a mask into a
+        # surface kept for the next frame.
+        surf = cairo.ImageSurface.create_for_data(
+            bytearray(data), _CAIRO_FORMATS[fmt], w, h, rs)
+        if fmt != _FMT_A8:
+            return surf
+        grey = self._grey
+        if grey is None or (grey.get_width(), grey.get_height()) != (w, h):
+            grey = self._grey = cairo.ImageSurface(cairo.FORMAT_RGB24, w, h)
+        cr = cairo.Context(grey)
+        cr.set_source_rgb(0, 0, 0)
+        cr.paint()
+        cr.set_source_rgb(1, 1, 1)
+        cr.mask_surface(surf, 0, 0)
+        return grey
+
     def set_active(self, is_active, color):
         self._border_color = color if is_active else None
         self.queue_draw()
@@ -277,13 +516,15 @@ class _Thumb(Gtk.Window):
                 now = _time.monotonic()
                 if now - self._last_click_emit >= 0.4:
                     self._last_click_emit = now
-                    self._emit("CTRL_CLICK" if self._ctrl else "CLICK")
+                    # Surface-local coordinates let a mosaic hit-test.
+                    self._emit(f"{'CTRL_CLICK' if self._ctrl else 'CLICK'} "
+                               f"{int(ev.x)} {int(ev.y)}")
             self._drag = False
             self._btn_down = False
-            # If drag just ended and cursor is still on window, fire ENTER
-            # so the main process zoom debounce restarts cleanly.
+            # If drag just ended and cursor is still on window, re-enter
+            # so the zoom debounce restarts cleanly.
             if was_drag:
-                self._emit("ENTER")
+                self._hover_start()
             return True
         return False
 
@@ -296,58 +537,396 @@ class _Thumb(Gtk.Window):
             # motion event's delta is relative to the correct origin.
             self._last_drag_x = ev.x
             self._last_drag_y = ev.y
-            # Do NOT emit ENTER during a drag — prevents zoom thrash as the
+            # Do NOT zoom during a drag — prevents zoom thrash as the
             # window moves through LEAVE+ENTER cycles on every set_pos().
             return False
-        self._emit("ENTER")
+        self._hover_start()
         return False
 
     def _on_leave(self, w, ev):
         if self._btn_down:
             return False   # suppress zoom-out during drag
-        self._emit("LEAVE")
+        self._hover_end()
         return False
 
 win = _Thumb()
 win.show_all()
 
+_HANDLERS = {
+    "FRAME":  win.set_frame,
+    "POS":    win.set_pos,
+    "SIZE":   win.set_size,
+    "ZOOM":   win.set_zoom,
+    "ACTIVE": win.set_active,
+    "TITLE":  win.set_title,
+    "SHOW":   win.show,
+    "HIDE":   win.hide,
+}
+
 def _reader():
     for raw in sys.stdin:
         line = raw.rstrip("\n")
         if not line:
             continue
-        parts = line.split(" ", 4)
-        cmd = parts[0]
+        t0 = _time.monotonic_ns()
         try:
-            if cmd == "FRAME" and len(parts) == 5:
-                w, h, rs = int(parts[1]), int(parts[2]), int(parts[3])
-                data = base64.b64decode(parts[4])
-                GLib.idle_add(win.set_frame, w, h, rs, data)
-            elif cmd == "POS" and len(parts) == 3:
-                GLib.idle_add(win.set_pos, int(parts[1]), int(parts[2]))
-            elif cmd == "SIZE" and len(parts) == 3:
-                GLib.idle_add(win.resize, int(parts[1]), int(parts[2]))
-            elif cmd == "ACTIVE" and len(parts) == 3:
-                GLib.idle_add(win.set_active, parts[1] == "1", parts[2])
-            elif cmd == "TITLE":
-                GLib.idle_add(win.set_title, " ".join(parts[1:]))
-            elif cmd == "SHOW":
-                GLib.idle_add(win.show)
-            elif cmd == "HIDE":
-                GLib.idle_add(win.hide)
-            elif cmd == "QUIT":
-                GLib.idle_add(Gtk.main_quit)
-                return
+            parsed = _parse_command(line)
         except Exception as e:
-            sys.stderr.write(f"helper [{cmd}]: {e}\n")
+            sys.stderr.write(f"helper [{line[:12]}]: {e}\n")
+            continue
+        if parsed is None:
+            continue
+        cmd, args = parsed
+        if cmd == "QUIT":
+            GLib.idle_add(Gtk.main_quit)
+            return
+        if cmd == "SHMFRAME":
+            frame = _read_shm_slot(*args)
+            if frame is None:
+                continue
+            cmd, args = "FRAME", frame
+        if cmd == "FRAME":
+            _trace("decode", t0, bytes=len(args[3]))
+        GLib.idle_add(_HANDLERS[cmd], *args)
     GLib.idle_add(Gtk.main_quit)
 
 threading.Thread(target=_reader, daemon=True).start()
 Gtk.main()
+_dump_trace()
 """
 
 import base64 as _b64mod, subprocess as _subproc, threading as _threading
-import queue as _queue_mod
+import collections as _collections, queue as _queue_mod, select as _select
+import time as _time
+
+class _PipeChannel:
+    """A child's stdin/stdout pipes, driven from the GLib main loop.
+
+    Both fds are non-blocking and there are no threads: stdout is read from
+    an fd watch and handed to on_line one line at a time; writes go out at
+    once while the pipe has room and otherwise resume from an OUT watch,
+    partial writes included.  Control lines queue in order and are never
+    dropped; frames sit in a single drop-old slot and go out only when no
+    control line is waiting.  An idle channel has no watch but the read one.
+    """
+
+    _IO_ERR = GLib.IOCondition.ERR | GLib.IOCondition.HUP
+    DRAIN_TIMEOUT = 2.0   # close(drain=True): longest wait for the child to read
+
+    def __init__(self, proc, on_line, on_eof=None, priority=GLib.PRIORITY_HIGH):
+        self._proc = proc
+        self._on_line, self._on_eof = on_line, on_eof
+        self._priority = priority
+        self._wfd = proc.stdin.fileno()
+        self._rfd = proc.stdout.fileno()
+        os.set_blocking(self._wfd, False)
+        os.set_blocking(self._rfd, False)
+        self._ctrl = _collections.deque()
+        self._frame = None
+        self._out = None             # memoryview of the write in progress
+        self._out_is_frame = False
+        self._out_watch = None
+        self._closing = False
+        self._rbuf = b""
+        self.bytes_sent = 0
+        self.frames_dropped = 0
+        self._in_watch = GLib.io_add_watch(
+            self._rfd, priority, GLib.IOCondition.IN | self._IO_ERR, self._on_readable)
+
+    @property
+    def pending(self):
+        """True while anything is queued or half-written."""
+        return self._wfd is not None and (
+            self._out is not None or bool(self._ctrl) or self._frame is not None)
+
+    def send_line(self, data):
+        if self._wfd is None or self._closing:
+            return
+        self._ctrl.append(data)
+        self._kick()
+
+    def send_frame(self, data):
+        if self._wfd is None or self._closing:
+            return
+        if self._frame is not None:
+            self.frames_dropped += 1   # replaced before it could go out
+        self._frame = data
+        self._kick()
+
+    def close(self, drain=False):
+        """Close stdin once everything queued so far has been written.
+
+        drain=True writes it out now instead of from the OUT watch, for
+        shutdown after the main loop has stopped; a child that stops
+        reading gets DRAIN_TIMEOUT before its stdin is closed regardless.
+        """
+        self._closing = True
+        self._frame = None
+        if drain:
+            deadline = _time.monotonic() + self.DRAIN_TIMEOUT
+            while not self._flush():
+                left = deadline - _time.monotonic()
+                if left <= 0 or not _select.select([], [self._wfd], [], left)[1]:
+                    break
+            self._close_write()
+        elif self._out_watch is None:
+            self._close_write()
+
+    def _kick(self):
+        if self._out_watch is None and not self._flush():
+            self._out_watch = GLib.io_add_watch(
+                self._wfd, self._priority, GLib.IOCondition.OUT | self._IO_ERR,
+                self._on_writable)
+
+    def _flush(self):
+        """Write until the pipe is full; True once nothing is pending."""
+        while self._wfd is not None:
+            if self._out is None:
+                if self._ctrl:
+                    data, self._out_is_frame = b"".join(self._ctrl), False
+                    self._ctrl.clear()
+                elif self._frame is not None:
+                    data, self._out_is_frame = self._frame, True
+                    self._frame = None
+                else:
+                    return True
+                self._out = memoryview(data)
+            try:
+                if self._out_is_frame:
+                    with _trace_span("ipc_write", "ipc", bytes=len(self._out)):
+                        n = os.write(self._wfd, self._out)
+                else:
+                    n = os.write(self._wfd, self._out)
+            except BlockingIOError:
+                return False
+            except OSError:
+                self._close_write()    # helper gone; drop everything
+                return True
+            self.bytes_sent += n
+            self._out = self._out[n:] if n < len(self._out) else None
+        return True
+
+    def _on_writable(self, _fd, cond):
+        if not cond & self._IO_ERR and not self._flush():
+            return True
+        self._out_watch = None         # returning False removes the watch
+        if cond & self._IO_ERR or self._closing:
+            self._close_write()
+        return False
+
+    def _close_write(self):
+        if self._out_watch is not None:
+            GLib.source_remove(self._out_watch)
+            self._out_watch = None
+        self._ctrl.clear()
+        self._frame = self._out = None
+        if self._wfd is not None:
+            self._wfd = None
+            try:
+                self._proc.stdin.close()
+            except Exception:
+                pass
+
+    def _on_readable(self, _fd, cond):
+        eof = False
+        while True:
+            try:
+                chunk = os.read(self._rfd, 65536)
+            except BlockingIOError:
+                break
+            except OSError:
+                chunk = b""
+            if not chunk:
+                eof = True
+                break
+            self._rbuf += chunk
+        *lines, self._rbuf = self._rbuf.split(b"\n")
+        for line in lines:
+            try:
+                self._on_line(line)
+            except Exception as e:
+                print(f"[ipc] {line[:24]!r}: {e}", flush=True)
+        if not eof and not cond & self._IO_ERR:
+            return True
+        self._in_watch = None
+        try:
+            self._proc.stdout.close()
+        except Exception:
+            pass
+        self._close_write()            # the child is exiting
+        if self._on_eof:
+            self._on_eof()
+        return False
+
+# ---------------------------------------------------------------------------
+# CPU placement of child processes (layer-shell helpers, capture workers).
+# ---------------------------------------------------------------------------
+_SCHED_POLICIES = {
+    "normal": getattr(os, "SCHED_OTHER", None),
+    "batch":  getattr(os, "SCHED_BATCH", None),
+    "idle":   getattr(os, "SCHED_IDLE", None),
+}
+
+def _parse_cpu_list(text):
+    """Parse a CPU list like 0-3,6 into a set; ValueError if malformed."""
+    cpus = set()
+    for part in text.replace(" ", "").split(","):
+        if part:
+            lo, _, hi = part.partition("-")
+            cpus.update(range(int(lo), int(hi or lo) + 1))
+    return cpus
+
+def _format_cpu_list(cpus):
+    runs, cpus = [], sorted(cpus)
+    for c in cpus:
+        if runs and c == runs[-1][1] + 1:
+            runs[-1][1] = c
+        else:
+            runs.append([c, c])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in runs)
+
+class _ProcessPlacement:
+    """Nice level, scheduler policy, CPU set and optional systemd slice with
+    a CPU quota for every helper and worker process, so they yield to the
+    EVE clients they watch.  The UI process itself is left alone.
+
+    Settings are applied to each child (every thread of it) right after it
+    is spawned, and again to all live children when they change; clearing
+    the CPU list or setting nice back to 0 returns them to the UI process's
+    own affinity and nice level.  describe() reads the result back from the
+    kernel.
+    """
+
+    SLICE = "eve-o-preview-helpers.slice"
+
+    def __init__(self):
+        self.settings = {}
+        self.procs = []
+        self._quota = 0          # quota last set on SLICE; 0 = not using it
+        self._want_quota = 0     # quota requested; systemctl may still be running
+        self._nice = 0           # helper_nice last applied; 0 = left alone
+        self._warned = set()
+
+    def configure(self, settings):
+        self.settings = settings
+        self._warned.discard("nice")   # warn again if this change is refused
+        quota = int(settings.get("helper_cpu_quota", 0))
+        if quota != self._want_quota:
+            # systemctl talks to the user bus and can take seconds, so it
+            # runs on a thread; helpers spawned meanwhile skip the slice.
+            self._want_quota, self._quota = quota, 0
+            if quota > 0:
+                _threading.Thread(target=self._set_slice_quota, args=(quota,),
+                                  name="slice-quota", daemon=True).start()
+        for proc in self._live():
+            self.place(proc.pid)
+        self._nice = int(settings.get("helper_nice", 0))
+
+    def _set_slice_quota(self, quota):
+        """Worker thread: set CPUQuota on SLICE, report via _on_slice_quota."""
+        try:
+            r = _subproc.run(["systemctl", "--user", "set-property", "--runtime",
+                              self.SLICE, f"CPUQuota={quota}%"],
+                             capture_output=True, timeout=5)
+        except (OSError, _subproc.SubprocessError) as e:
+            err = f"no systemd user manager ({e})"
+        else:
+            err = None if r.returncode == 0 else (
+                "systemctl set-property failed: "
+                f"{r.stderr.decode(errors='replace').strip()}")
+        GLib.idle_add(self._on_slice_quota, quota, err)
+
+    def _on_slice_quota(self, quota, err):
+        if quota != self._want_quota:
+            return False             # superseded by a later configure()
+        if err:
+            self._want_quota = 0     # retried on the next configure()
+            self._warn("systemd", f"{err}; CPU quota off")
+        else:
+            self._quota = quota
+        return False
+
+    def spawn(self, argv, **kw):
+        """Popen argv inside the slice (if a quota is set) and place it."""
+        if self._quota:
+            argv = ["systemd-run", "--user", "--scope", "--quiet", "--collect",
+                    f"--slice={self.SLICE}", "--"] + argv
+        proc = _subproc.Popen(argv, **kw)
+        self.procs = self._live() + [proc]
+        self.place(proc.pid)
+        return proc
+
+    def _live(self):
+        return [p for p in self.procs if p.poll() is None]
+
+    def place(self, pid):
+        s = self.settings
+        nice = int(s.get("helper_nice", 0))
+        if not nice and self._nice:
+            # Back to the UI's own level.  Lowering nice needs CAP_SYS_NICE
+            # (or RLIMIT_NICE), so this can be refused; see the warning.
+            nice = os.getpriority(os.PRIO_PROCESS, 0)
+        elif not nice:
+            nice = None
+        policy = _SCHED_POLICIES.get(s.get("helper_sched", "normal"))
+        cpus = None
+        if s.get("helper_cpus"):
+            try:
+                cpus = _parse_cpu_list(s["helper_cpus"])
+            except ValueError:
+                self._warn("cpus", f"bad CPU list {s['helper_cpus']!r}; ignored")
+        if not cpus:
+            cpus = os.sched_getaffinity(0)
+        try:
+            tids = [int(t) for t in os.listdir(f"/proc/{pid}/task")]
+        except OSError:
+            tids = [pid]
+        for tid in tids:
+            try:
+                if policy is not None and os.sched_getscheduler(tid) != policy:
+                    os.sched_setscheduler(tid, policy, os.sched_param(0))
+                if nice is not None and os.getpriority(os.PRIO_PROCESS, tid) != nice:
+                    try:
+                        os.setpriority(os.PRIO_PROCESS, tid, nice)
+                    except PermissionError as e:
+                        self._warn("nice", f"kernel refused nice {nice} for pid "
+                                   f"{tid} ({e}); helpers keep their old level")
+                if os.sched_getaffinity(tid) != cpus:
+                    os.sched_setaffinity(tid, cpus)
+            except ProcessLookupError:
+                pass
+            except (OSError, AttributeError) as e:
+                self._warn(type(e).__name__, f"could not place pid {tid}: {e}")
+
+    def _warn(self, key, msg):
+        if key not in self._warned:
+            self._warned.add(key)
+            print(f"[placement] {msg}")
+
+    def describe(self):
+        """Effective placement of the live children, for the status bar."""
+        live = self._live()
+        if not live:
+            return "Helpers: none"
+        names = {v: k for k, v in _SCHED_POLICIES.items() if v is not None}
+        seen = {"nice": set(), "sched": set(), "cpus": set(), "cgroup": set()}
+        for p in live:
+            try:
+                seen["nice"].add(f"nice {os.getpriority(os.PRIO_PROCESS, p.pid)}")
+                seen["sched"].add(names.get(os.sched_getscheduler(p.pid), "other"))
+                seen["cpus"].add("CPUs " + _format_cpu_list(os.sched_getaffinity(p.pid)))
+                with open(f"/proc/{p.pid}/cgroup") as f:
+                    path = f.read().strip().rsplit(":", 1)[-1]
+                seen["cgroup"].add(self.SLICE if self.SLICE in path.split("/")
+                                   else "no slice")
+            except (OSError, AttributeError):
+                continue
+        parts = ["/".join(sorted(v)) for v in seen.values() if v]
+        if self._quota:
+            parts.append(f"quota {self._quota}%")
+        return f"Helpers ({len(live)}): " + " · ".join(parts)
+
+_placement = _ProcessPlacement()
 
 class _LayerShellDisplay:
     """Manages a layer-shell subprocess OVERLAY window for one thumbnail."""
@@ -361,131 +940,78 @@ class _LayerShellDisplay:
         self._pos_cb = pos_cb
         self._enter_cb = enter_cb
         self._leave_cb = leave_cb
-        # Two queues funnelled through one background writer thread so the
-        # GTK main thread NEVER writes to stdin and can never block.
-        #
-        # _ctrl_queue: unlimited size — SIZE, POS, ACTIVE, TITLE, SHOW, HIDE,
-        #   QUIT messages; always delivered in order, never dropped.
-        # _frame_queue: size=1 — large FRAME payloads; stale frames are
-        #   silently replaced so the subprocess always gets the newest image.
-        self._ctrl_queue  = _queue_mod.Queue()          # unbounded
-        self._frame_queue = _queue_mod.Queue(maxsize=1) # drop-old
+        self.last_click = None   # surface-local (x, y) of the latest click
         env = os.environ.copy()
         env["GDK_BACKEND"] = "wayland"
-        self._proc = _subproc.Popen(
+        trace_path = _tracer.helper_env(env) if _tracer else None
+        self._proc = _placement.spawn(
             [_sys.executable, "-c", _LAYER_SHELL_HELPER],
             stdin=_subproc.PIPE,
             stdout=_subproc.PIPE,
             stderr=None,   # inherit terminal so subprocess errors are visible
             env=env,
         )
-        _threading.Thread(target=self._reader, daemon=True).start()
-        _threading.Thread(target=self._writer, daemon=True).start()
+        if trace_path:
+            _tracer.register_helper(self._proc, trace_path)
+        # CRITICAL: the pipe watches run at GLib.PRIORITY_HIGH (-100).  With
+        # two clients the capture timers consume most main-loop time, and
+        # anything at default priority or below is starved — the root cause
+        # of click/zoom/hover death on the second client.
+        self._chan = _PipeChannel(self._proc, self._on_line)
         self._ctrl_send(f"SIZE {w} {h}")
         self._ctrl_send(f"POS {x} {y}")
 
-    # ------------------------------------------------------------------
-    # Internal helpers — only called from the background _writer thread
-    # or at startup before concurrent access begins.
-
-    def _ctrl_send(self, msg):
-        """Enqueue a small control message (non-blocking, never dropped)."""
-        self._ctrl_queue.put((msg + "\n").encode())
-
-    def _writer(self):
-        """Single background thread that owns all stdin writes.
-
-        Drains all pending control messages before sending each frame, so
-        that ACTIVE/POS/SIZE updates are never delayed behind a large FRAME
-        payload.  When no frame is available the loop blocks briefly on the
-        control queue so we don't spin-loop consuming CPU.
-        """
-        stdin = self._proc.stdin
-        while True:
-            try:
-                # 1. Flush all queued control messages first (non-blocking).
-                while True:
-                    try:
-                        data = self._ctrl_queue.get_nowait()
-                        if data is None:
-                            return   # QUIT sentinel
-                        stdin.write(data)
-                    except _queue_mod.Empty:
-                        break
-
-                # 2. Try to send one frame.
-                try:
-                    data = self._frame_queue.get_nowait()
-                    stdin.write(data)
-                    stdin.flush()
-                    continue
-                except _queue_mod.Empty:
-                    pass
-
-                # 3. Nothing to write — wait for next control message,
-                #    flushing any partial writes first.
-                try:
-                    stdin.flush()
-                except Exception:
-                    pass
-                try:
-                    data = self._ctrl_queue.get(timeout=0.05)
-                    if data is None:
-                        return
-                    stdin.write(data)
-                except _queue_mod.Empty:
-                    pass
+    # Counters for the management window's stats line.
+    @property
+    def bytes_sent(self):
+        return self._chan.bytes_sent
 
-            except Exception:
-                break
+    @property
+    def frames_dropped(self):
+        return self._chan.frames_dropped
 
-    def _reader(self):
-        try:
-            for line_b in iter(self._proc.stdout.readline, b""):
-                line = line_b.decode("utf-8", errors="replace").strip()
-                if IPC_DEBUG and line and not line.startswith("FRAME"):
-                    print(f"[ipc] {line}", flush=True)
-                # CRITICAL: Use GLib.idle_add with GLib.PRIORITY_HIGH (-100)
-                # instead of default idle priority (200).  With two clients the
-                # capture timers (priority 0) consume most main-loop time, and
-                # default-priority idle callbacks are starved indefinitely — this
-                # is the root cause of click/zoom/hover death on second client.
-                _P = GLib.PRIORITY_HIGH
-                if line == "CLICK" and self._click_cb:
-                    GLib.idle_add(self._click_cb, priority=_P)
-                elif line == "CTRL_CLICK" and self._ctrl_click_cb:
-                    GLib.idle_add(self._ctrl_click_cb, priority=_P)
-                elif line.startswith("POS ") and self._pos_cb:
-                    p = line.split()
-                    if len(p) == 3:
-                        GLib.idle_add(self._pos_cb, int(p[1]), int(p[2]), priority=_P)
-                elif line == "ENTER" and self._enter_cb:
-                    GLib.idle_add(self._enter_cb, priority=_P)
-                elif line == "LEAVE" and self._leave_cb:
-                    GLib.idle_add(self._leave_cb, priority=_P)
-        except Exception:
-            pass
+    def _ctrl_send(self, msg):
+        """Queue a small control message (non-blocking, never dropped)."""
+        self._chan.send_line((msg + "\n").encode())
+
+    def _on_line(self, line_b):
+        line = line_b.decode("utf-8", errors="replace").strip()
+        if IPC_DEBUG and line and not line.startswith("FRAME"):
+            print(f"[ipc] {line}", flush=True)
+        cmd = line.split(" ", 1)[0]
+        if cmd in ("CLICK", "CTRL_CLICK"):
+            p = line.split()
+            if len(p) == 3:
+                self.last_click = (int(p[1]), int(p[2]))
+        if cmd == "CLICK" and self._click_cb:
+            self._click_cb()
+        elif cmd == "CTRL_CLICK" and self._ctrl_click_cb:
+            self._ctrl_click_cb()
+        elif line.startswith("POS ") and self._pos_cb:
+            p = line.split()
+            if len(p) == 3:
+                self._pos_cb(int(p[1]), int(p[2]))
+        elif line == "ENTER" and self._enter_cb:
+            self._enter_cb()
+        elif line == "LEAVE" and self._leave_cb:
+            self._leave_cb()
 
     def send_frame(self, pixbuf):
         if not pixbuf:
             return
+        with _trace_span("ipc_enqueue", "ipc"):
+            self._enqueue_frame(pixbuf)
+
+    def _enqueue_frame(self, pixbuf):
         if not pixbuf.get_has_alpha():
             pixbuf = pixbuf.add_alpha(False, 0, 0, 0)
         w, h, rs = pixbuf.get_width(), pixbuf.get_height(), pixbuf.get_rowstride()
         b64 = _b64mod.b64encode(bytes(pixbuf.get_pixels())).decode("ascii")
-        data = f"FRAME {w} {h} {rs} {b64}\n".encode()
-        # Replace stale frame with the newest one; never block.
-        try:
-            self._frame_queue.put_nowait(data)
-        except _queue_mod.Full:
-            try:
-                self._frame_queue.get_nowait()
-            except _queue_mod.Empty:
-                pass
-            try:
-                self._frame_queue.put_nowait(data)
-            except _queue_mod.Full:
-                pass
+        self._chan.send_frame(f"FRAME {w} {h} {rs} {b64}\n".encode())
+
+    def send_shm_frame(self, path, offset):
+        """Point the helper at a frame a capture worker left in shared memory."""
+        self._chan.send_frame(f"SHMFRAME {offset} {path}\n".encode())
 
     def set_pos(self, x, y):
         self._x, self._y = x, y
@@ -494,6 +1020,10 @@ class _LayerShellDisplay:
     def set_size(self, w, h):
         self._ctrl_send(f"SIZE {w} {h}")
 
+    def set_zoom(self, factor):
+        """Hover zoom factor the helper applies on its own; 0 disables it."""
+        self._ctrl_send(f"ZOOM {factor:g}")
+
     def send_active(self, is_active, color):
         self._ctrl_send(f"ACTIVE {'1' if is_active else '0'} {color}")
 
@@ -506,13 +1036,389 @@ class _LayerShellDisplay:
     def hide(self):
         self._ctrl_send("HIDE")
 
-    def destroy(self):
+    def destroy(self, drain=False):
+        """Ask the helper to quit; drain=True once the main loop is gone."""
         self._ctrl_send("QUIT")
+        self._chan.close(drain)
+
+# ---------------------------------------------------------------------------
+# Capture worker processes (optional, "capture_workers" > 0)
+# Each worker owns its own X connection and a shard of clients; it captures,
+# downscales and writes frames into the client's shared-memory slot, then
+# tells the UI process on stdout:
+#   FRAME <xid> <seq> <offset> <capture_us> <scale_us> <src_pixels>
+#   MISS <xid>                      (unviewable / no pixels this tick)
+# Commands on stdin:
+#   ADD <xid> <slot path> | SET <xid> <capture xid> <w> <h> <fps> <tier> [<fmt>]
+#   NOW <xid> (capture immediately) | DEL <xid> | QUIT
+# ---------------------------------------------------------------------------
+_CAPTURE_WORKER = _SHM_FRAMES + r"""
+import sys, os, mmap, threading, time
+os.environ["GDK_BACKEND"] = "x11"
+import gi
+gi.require_version("Gtk", "3.0")
+gi.require_version("GdkX11", "3.0")
+from gi.repository import Gtk, Gdk, GdkX11, GdkPixbuf, GLib
+
+_INTERP = {
+    "nearest":  GdkPixbuf.InterpType.NEAREST,
+    "tiles":    GdkPixbuf.InterpType.TILES,
+    "bilinear": GdkPixbuf.InterpType.BILINEAR,
+    "hyper":    GdkPixbuf.InterpType.HYPER,
+}
+# With pycairo, frames are captured and scaled in one cairo paint into a
+# reused RGB24 surface and written in that native format (see _SHM_FRAMES).
+try:
+    import cairo
+    _FILTERS = {"nearest": cairo.FILTER_NEAREST, "tiles": cairo.FILTER_FAST,
+                "bilinear": cairo.FILTER_GOOD, "hyper": cairo.FILTER_BEST}
+except ImportError:
+    cairo = None
+_display = GdkX11.X11Display.get_default()
+_clients = {}
+_watched = {}      # capture xid → _Client, for structure events
+
+def _on_event(event, *_data):
+    kind = event.get_event_type()
+    win = event.get_window()
+    c = _watched.get(win.get_xid()) if win is not None else None
+    if c is not None:
+        if kind == Gdk.EventType.CONFIGURE:
+            c.geom = (event.configure.width, event.configure.height)
+        elif kind == Gdk.EventType.MAP:
+            c.mapped = True
+        elif kind in (Gdk.EventType.UNMAP, Gdk.EventType.DESTROY):
+            c.mapped = False
+    Gtk.main_do_event(event)
+
+Gdk.event_handler_set(_on_event)
+
+def _emit(msg):
+    try:
+        sys.stdout.write(msg + "\n")
+        sys.stdout.flush()
+    except Exception:
+        pass
+
+class _Client:
+    def __init__(self, xid, path):
+        self.xid = xid
+        with open(path, "r+b") as f:
+            self.mm = mmap.mmap(f.fileno(), 0)
+        self.win = None
+        self.capture_xid = None
+        self.geom, self.mapped, self.last_resync = (0, 0), False, 0.0
+        self.w = self.h = 0
+        self.tier = "bilinear"
+        self.fmt = _FMT_RGB24
+        self.surfs = {}
+        self.period = None
+        self.timer = None
+        self.seq = 0
+
+    def configure(self, capture_xid, w, h, fps, tier, fmt=_FMT_RGB24):
+        if capture_xid != self.capture_xid:
+            _watched.pop(self.capture_xid, None)
+            self.capture_xid = capture_xid
+            self.win = GdkX11.X11Window.foreign_new_for_display(_display, capture_xid)
+            self.resync()
+            _watched[capture_xid] = self
+        self.w, self.h, self.tier, self.fmt = w, h, tier, fmt
+        period = max(1, int(1000 / fps)) if fps > 0 else None
+        if period != self.period:
+            self.stop()
+            self.period = period
+            if period:
+                self.timer = GLib.timeout_add(period, self.tick)
+
+    def resync(self):
+        # One synchronous query; StructureNotify events keep it current.
+        self.last_resync = time.monotonic()
+        Gdk.error_trap_push()
+        try:
+            self.win.set_events(self.win.get_events() | Gdk.EventMask.STRUCTURE_MASK)
+            _x, _y, w, h = self.win.get_geometry()
+            self.geom, self.mapped = (w, h), self.win.is_viewable()
+        except Exception:
+            pass
+        if Gdk.error_trap_pop():
+            self.mapped = False
+
+    def stop(self):
+        if self.timer:
+            GLib.source_remove(self.timer)
+            self.timer = None
+
+    def surface(self, w, h, fmt):
+        key = (w, h, fmt)
+        surf = self.surfs.get(key)
+        if surf is None:
+            if len(self.surfs) >= 4:
+                self.surfs.clear()
+            surf = self.surfs[key] = cairo.ImageSurface(fmt, w, h)
+        return surf
+
+    def grab(self, sw, sh):
+        '''Capture and scale in one paint; returns (surface, format) or None.
+
+        Greyscale needs NumPy, which workers don't load; it is sent as
+        RGB565 instead.
+        '''
+        out = self.surface(self.w, self.h, cairo.FORMAT_RGB24)
+        cr = cairo.Context(out)
+        cr.set_operator(cairo.OPERATOR_SOURCE)
+        cr.scale(self.w / sw, self.h / sh)
+        Gdk.cairo_set_source_window(cr, self.win, 0, 0)
+        cr.get_source().set_filter(_FILTERS.get(self.tier, cairo.FILTER_GOOD))
+        try:
+            cr.paint()
+        except cairo.Error:
+            return None
+        out.flush()
+        if self.fmt not in (_FMT_RGB565, _FMT_A8):
+            return out, _FMT_RGB24
+        dst = self.surface(self.w, self.h, cairo.FORMAT_RGB16_565)
+        cr = cairo.Context(dst)
+        cr.set_operator(cairo.OPERATOR_SOURCE)
+        cr.set_source_surface(out, 0, 0)
+        cr.paint()
+        dst.flush()
+        return dst, _FMT_RGB565
+
+    def tick(self):
+        win = self.win
+        try:
+            sw, sh = self.geom
+            if sw <= 0 or sh <= 0 or not self.mapped:
+                _emit(f"MISS {self.xid}")
+                return True
+            t0 = time.perf_counter()
+            Gdk.error_trap_push()
+            try:
+                if cairo is not None:
+                    frame = self.grab(sw, sh)
+                else:
+                    pb = Gdk.pixbuf_get_from_window(win, 0, 0, sw, sh)
+                    frame = (pb, _FMT_RGBA) if pb is not None else None
+            finally:
+                # cairo-xlib hides a failed GetImage behind a fallback copy,
+                # so the trapped error is the only sign the pixels are
+                # garbage.  GetImage is a round trip: no extra XSync.
+                failed = Gdk.error_trap_pop()
+            if failed:
+                frame = None
+            t1 = time.perf_counter()
+            if frame is None:
+                if time.monotonic() - self.last_resync >= 1.0:
+                    self.resync()
+                _emit(f"MISS {self.xid}")
+                return True
+            img, fmt = frame
+            self.seq += 1
+            if fmt == _FMT_RGBA:
+                pb = img.scale_simple(self.w, self.h, _INTERP.get(self.tier, _INTERP["bilinear"]))
+                if not pb.get_has_alpha():
+                    pb = pb.add_alpha(False, 0, 0, 0)
+                off = _shm_write(self.mm, self.seq, pb.get_width(), pb.get_height(),
+                                 pb.get_rowstride(), pb.get_pixels())
+            else:
+                off = _shm_write(self.mm, self.seq, img.get_width(), img.get_height(),
+                                 img.get_stride(), img.get_data(), fmt)
+            t2 = time.perf_counter()
+            if off < 0:
+                _emit(f"MISS {self.xid}")
+            else:
+                _emit(f"FRAME {self.xid} {self.seq} {off} {int((t1 - t0) * 1e6)} "
+                      f"{int((t2 - t1) * 1e6)} {sw * sh}")
+        except Exception as e:
+            sys.stderr.write(f"capture worker 0x{self.xid:x}: {e}\n")
+            _emit(f"MISS {self.xid}")
+        return True
+
+    def close(self):
+        self.stop()
+        self.mm.close()
+
+def _add(xid, path):
+    _clients[xid] = _Client(xid, path)
+
+def _set(xid, capture_xid, w, h, fps, tier, fmt=_FMT_RGB24):
+    c = _clients.get(xid)
+    if c:
+        c.configure(capture_xid, w, h, fps, tier, fmt)
+
+def _now(xid):
+    c = _clients.get(xid)
+    if c and c.win:
+        c.tick()
+
+def _del(xid):
+    c = _clients.pop(xid, None)
+    if c:
+        _watched.pop(c.capture_xid, None)
+        c.close()
+
+def _reader():
+    for raw in sys.stdin:
+        cmd, _, rest = raw.rstrip("\n").partition(" ")
+        p = rest.split(" ")
         try:
-            self._proc.stdin.close()
+            if cmd == "ADD":
+                GLib.idle_add(_add, int(p[0]), " ".join(p[1:]))
+            elif cmd == "SET" and len(p) in (6, 7):
+                GLib.idle_add(_set, int(p[0]), int(p[1]), int(p[2]), int(p[3]),
+                              float(p[4]), p[5], *map(int, p[6:]))
+            elif cmd == "NOW":
+                GLib.idle_add(_now, int(p[0]))
+            elif cmd == "DEL":
+                GLib.idle_add(_del, int(p[0]))
+            elif cmd == "QUIT":
+                break
+        except (ValueError, IndexError, OSError) as e:
+            sys.stderr.write(f"capture worker [{raw[:24]!r}]: {e}\n")
+    GLib.idle_add(Gtk.main_quit)
+
+threading.Thread(target=_reader, daemon=True).start()
+Gtk.main()
+"""
+
+import mmap as _mmap
+
+class _FrameSlot:
+    """A thumbnail's shared-memory frame file (layout in _SHM_FRAMES)."""
+
+    # Largest frame a slot holds: an 800x600 thumbnail at 2.0x zoom, RGBA.
+    # tmpfs only backs pages that are written, so small thumbnails stay small.
+    MAX_BYTES = 1600 * 1200 * 4
+
+    def __init__(self, xid):
+        base = os.environ.get("XDG_RUNTIME_DIR") or "/dev/shm"
+        if not os.path.isdir(base):
+            base = _tempfile.gettempdir()
+        # mkstemp opens with O_EXCL | O_NOFOLLOW under a random name, so a
+        # file or symlink planted in a shared /dev/shm or /tmp is never used.
+        fd, self.path = _tempfile.mkstemp(
+            dir=base, prefix=f"eve-o-preview-{xid:x}-", suffix=".frames")
+        size = 2 * (_SHM_HDR + self.MAX_BYTES)
+        try:
+            os.ftruncate(fd, size)
+            self.mm = _mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+    def read(self, offset):
+        return _shm_read(self.mm, offset)
+
+    def close(self):
+        try:
+            self.mm.close()
+            os.unlink(self.path)
         except Exception:
             pass
 
+class _CaptureWorker:
+    """One _CAPTURE_WORKER process and the thumbnails it currently serves."""
+
+    def __init__(self, pool, index):
+        import sys as _sys
+        self.pool, self.index = pool, index
+        self.thumbs = {}              # root xid → ThumbnailWindow
+        env = os.environ.copy()
+        env["GDK_BACKEND"] = "x11"
+        self._proc = _placement.spawn(
+            [_sys.executable, "-c", _CAPTURE_WORKER],
+            stdin=_subproc.PIPE, stdout=_subproc.PIPE, stderr=None, env=env)
+        # Frames are presented at PRIORITY_LOW, like the in-process capture
+        # timers, so they never delay input or IPC callbacks.
+        self._chan = _PipeChannel(self._proc, self._on_line,
+                                  lambda: self.pool._on_worker_exit(self),
+                                  priority=GLib.PRIORITY_LOW)
+
+    @property
+    def load(self):
+        return len(self.thumbs)
+
+    def send(self, msg):
+        self._chan.send_line((msg + "\n").encode())
+
+    def add(self, thumb):
+        self.thumbs[thumb._root_xid] = thumb
+        self.send(f"ADD {thumb._root_xid} {thumb._slot.path}")
+
+    def remove(self, thumb):
+        if self.thumbs.pop(thumb._root_xid, None) is not None:
+            self.send(f"DEL {thumb._root_xid}")
+
+    def _on_line(self, raw):
+        p = raw.split()
+        if len(p) == 7 and p[0] == b"FRAME":
+            xid, _seq, off, cap_us, scale_us, pixels = map(int, p[1:])
+            t = self.thumbs.get(xid)
+            if t:
+                t._on_worker_frame(off, cap_us, scale_us, pixels)
+        elif len(p) == 2 and p[0] == b"MISS":
+            t = self.thumbs.get(int(p[1]))
+            if t:
+                t._on_worker_miss()
+
+    def stop(self, drain=False):
+        self.send("QUIT")
+        self._chan.close(drain)
+
+class _CaptureWorkerPool:
+    """Shards thumbnails across capture worker processes.
+
+    A single process is GIL-bound no matter how captures are scheduled;
+    workers capture and scale in parallel, each on its own X connection.
+    New clients go to the least-loaded worker, and the pool rebalances
+    whenever a client leaves so no worker carries two more than another.
+    If a worker dies, its clients move to the others, or back in-process
+    when none are left.
+    """
+
+    def __init__(self, count):
+        self.workers = [_CaptureWorker(self, i) for i in range(count)]
+        print(f"[workers] started {count} capture worker process(es)")
+
+    def assign(self, thumb):
+        if self.workers:
+            thumb._attach_worker(min(self.workers, key=lambda w: w.load))
+
+    def release(self, thumb):
+        if thumb._worker:
+            thumb._worker.remove(thumb)
+            thumb._worker = None
+        self.rebalance()
+
+    def rebalance(self):
+        while len(self.workers) > 1:
+            hi = max(self.workers, key=lambda w: w.load)
+            lo = min(self.workers, key=lambda w: w.load)
+            if hi.load - lo.load <= 1:
+                break
+            next(iter(hi.thumbs.values()))._attach_worker(lo)
+
+    def _on_worker_exit(self, worker):
+        if worker not in self.workers:
+            return False
+        self.workers.remove(worker)
+        print(f"[workers] capture worker {worker.index} exited; "
+              f"reassigning {worker.load} client(s)")
+        orphans = list(worker.thumbs.values())
+        worker.thumbs.clear()
+        for t in orphans:
+            t._worker = None
+            if self.workers:
+                self.assign(t)
+            else:
+                t._detach_worker()
+        return False
+
+    def shutdown(self):
+        """Stop every worker; called after the main loop has returned."""
+        for w in self.workers:
+            w.stop(drain=True)
+
 # ---------------------------------------------------------------------------
 # Xlib helpers — own display connection (avoids GDK pointer casting issues)
 # ---------------------------------------------------------------------------
@@ -689,10 +1595,310 @@ def _get_child_xids(parent_xid):
     except Exception:
         return []
 
+_xext = None
+
+def _dpms_display_off():
+    """True if DPMS reports the monitors in standby, suspend or off."""
+    global _xext
+    dpy = _xlib_display()
+    if not dpy:
+        return False
+    if _xext is None:
+        path = ctypes.util.find_library("Xext")
+        _xext = ctypes.CDLL(path) if path else False
+    if not _xext:
+        return False
+    try:
+        if not _xext.DPMSCapable(ctypes.c_void_p(dpy)):
+            return False
+        level, enabled = ctypes.c_ushort(0), ctypes.c_ubyte(0)
+        if not _xext.DPMSInfo(ctypes.c_void_p(dpy), ctypes.byref(level),
+                              ctypes.byref(enabled)):
+            return False
+        return bool(enabled.value) and level.value != 0   # 0 = DPMSModeOn
+    except Exception:
+        return False
+
+_xss = None
+
+class _XScreenSaverInfo(ctypes.Structure):
+    _fields_ = [("window", ctypes.c_ulong), ("state", ctypes.c_int),
+                ("kind", ctypes.c_int), ("til_or_since", ctypes.c_ulong),
+                ("idle", ctypes.c_ulong), ("event_mask", ctypes.c_ulong)]
+
+def _user_idle_ms():
+    """Milliseconds since the last keyboard or pointer input (XScreenSaver
+    extension), or None if the extension is unavailable."""
+    global _xss
+    xlib, dpy = _get_xlib(), _xlib_display()
+    if not xlib or not dpy:
+        return None
+    if _xss is None:
+        path = ctypes.util.find_library("Xss")
+        _xss = ctypes.CDLL(path) if path else False
+        if _xss:
+            ev, err = ctypes.c_int(0), ctypes.c_int(0)
+            if not _xss.XScreenSaverQueryExtension(
+                    ctypes.c_void_p(dpy), ctypes.byref(ev), ctypes.byref(err)):
+                _xss = False
+        if not _xss:
+            print("[idle] XScreenSaver extension unavailable; idle throttling off")
+    if not _xss:
+        return None
+    try:
+        xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        root = xlib.XDefaultRootWindow(ctypes.c_void_p(dpy))
+        info = _XScreenSaverInfo()
+        if not _xss.XScreenSaverQueryInfo(ctypes.c_void_p(dpy), ctypes.c_ulong(root),
+                                          ctypes.byref(info)):
+            return None
+        return info.idle
+    except Exception:
+        return None
+
+# ---------------------------------------------------------------------------
+# Global hotkeys: XGrabKey on the root window.
+# ---------------------------------------------------------------------------
+class _XKeyEvent(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_int), ("serial", ctypes.c_ulong),
+                ("send_event", ctypes.c_int), ("display", ctypes.c_void_p),
+                ("window", ctypes.c_ulong), ("root", ctypes.c_ulong),
+                ("subwindow", ctypes.c_ulong), ("time", ctypes.c_ulong),
+                ("x", ctypes.c_int), ("y", ctypes.c_int),
+                ("x_root", ctypes.c_int), ("y_root", ctypes.c_int),
+                ("state", ctypes.c_uint), ("keycode", ctypes.c_uint),
+                ("same_screen", ctypes.c_int)]
+
+class _XEvent(ctypes.Union):
+    _fields_ = [("type", ctypes.c_int), ("xkey", _XKeyEvent),
+                ("_pad", ctypes.c_long * 24)]
+
+class _Hotkeys:
+    """Global hotkeys grabbed with XGrabKey on the root window.
+
+    Uses libX11 like the other Xlib helpers, but on a Display of its own:
+    the shared one is also read by synchronous calls such as XQueryTree,
+    which would queue key events where the fd watch never sees them.  The
+    connection's fd is watched from the main loop at PRIORITY_HIGH, and
+    each key press calls on_action(action, x_time) with the action string
+    from the config ("next", "previous", "client N", "character NAME").
+    """
+
+    MODIFIERS = {"shift": 1 << 0, "ctrl": 1 << 2, "control": 1 << 2,
+                 "alt": 1 << 3, "mod1": 1 << 3, "super": 1 << 6, "mod4": 1 << 6,
+                 "win": 1 << 6, "altgr": 1 << 7, "mod5": 1 << 7}
+    # Grabs are exact-match, so every combo is also grabbed with Caps Lock
+    # and Num Lock (Mod2) on; events have both masked off before lookup.
+    LOCKS = (0, 1 << 1, 1 << 4, (1 << 1) | (1 << 4))
+    _STATE_MASK = 0xFF & ~((1 << 1) | (1 << 4))
+
+    def __init__(self, on_action):
+        self._on_action = on_action
+        self._xlib = self._dpy = None
+        self._root = 0
+        self._bound = {}          # (keycode, modifiers) → action
+
+    def _open(self):
+        xlib = _get_xlib()
+        if not xlib:
+            return False
+        xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        xlib.XStringToKeysym.restype = ctypes.c_ulong
+        xlib.XStringToKeysym.argtypes = [ctypes.c_char_p]
+        xlib.XKeysymToKeycode.restype = ctypes.c_ubyte
+        xlib.XKeysymToKeycode.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+        xlib.XGrabKey.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_uint,
+                                  ctypes.c_ulong, ctypes.c_int, ctypes.c_int, ctypes.c_int]
+        xlib.XUngrabKey.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_uint,
+                                    ctypes.c_ulong]
+        xlib.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XPending.restype = ctypes.c_int
+        xlib.XPending.argtypes = [ctypes.c_void_p]
+        xlib.XNextEvent.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XEvent)]
+        xlib.XConnectionNumber.restype = ctypes.c_int
+        xlib.XConnectionNumber.argtypes = [ctypes.c_void_p]
+        dpy = xlib.XOpenDisplay(None)
+        if not dpy:
+            return False
+        self._xlib, self._dpy = xlib, ctypes.c_void_p(dpy)
+        self._root = xlib.XDefaultRootWindow(self._dpy)
+        GLib.io_add_watch(xlib.XConnectionNumber(self._dpy), GLib.PRIORITY_HIGH,
+                          GLib.IOCondition.IN, self._on_readable)
+        return True
+
+    def _parse(self, combo):
+        *mods, key = [part.strip() for part in combo.split("+")]
+        mask = 0
+        for m in mods:
+            if m.lower() not in self.MODIFIERS:
+                return None
+            mask |= self.MODIFIERS[m.lower()]
+        sym = self._xlib.XStringToKeysym(key.encode())
+        if not sym and len(key) == 1:
+            sym = self._xlib.XStringToKeysym(key.lower().encode())
+        code = self._xlib.XKeysymToKeycode(self._dpy, sym) if sym else 0
+        return (code, mask) if code else None
+
+    def bind(self, hotkeys):
+        """Replace all grabs with hotkeys ({"Super+Tab": "next", ...})."""
+        if not hotkeys and self._dpy is None:
+            return 0
+        if self._dpy is None and not self._open():
+            print("[hotkeys] no X display; global hotkeys unavailable")
+            return 0
+        xlib = self._xlib
+        for code, mask in self._bound:
+            for lock in self.LOCKS:
+                xlib.XUngrabKey(self._dpy, code, mask | lock, self._root)
+        self._bound = {}
+        for combo, action in hotkeys.items():
+            key = self._parse(combo)
+            if key is None:
+                print(f"[hotkeys] cannot parse {combo!r}; skipped")
+                continue
+            for lock in self.LOCKS:
+                # A combo another client already grabbed fails with
+                # BadAccess, which GDK ignores on a display it doesn't own.
+                xlib.XGrabKey(self._dpy, key[0], key[1] | lock, self._root, 1, 1, 1)
+            self._bound[key] = action
+        xlib.XSync(self._dpy, 0)
+        # XSync reads whatever the server sent into Xlib's queue, where the
+        # fd watch can no longer see it.
+        self._drain()
+        return len(self._bound)
+
+    def _on_readable(self, _fd, _cond):
+        self._drain()
+        return True
+
+    def _drain(self):
+        """Dispatch every event Xlib has read or can read without blocking.
+
+        Runs until XPending() is 0, so nothing is left in Xlib's queue when
+        control returns to the main loop.
+        """
+        ev = _XEvent()
+        while self._xlib.XPending(self._dpy):
+            self._xlib.XNextEvent(self._dpy, ctypes.byref(ev))
+            if ev.type == 2:          # KeyPress
+                k = ev.xkey
+                action = self._bound.get((k.keycode, k.state & self._STATE_MASK))
+                if action:
+                    self._on_action(action, k.time)
+
 # Pass --debug on the command line to enable per-frame capture diagnostics.
 DEBUG_CAPTURE = "--debug" in os.sys.argv
 IPC_DEBUG = os.environ.get("EVE_PREVIEW_IPC_DEBUG", "").lower() in ("1", "true", "yes", "on")
 
+def _cli_value(flag):
+    """Return the value of "--flag VALUE" / "--flag=VALUE" in argv, or None."""
+    argv = os.sys.argv
+    for i, arg in enumerate(argv):
+        if arg == flag and i + 1 < len(argv):
+            return argv[i + 1]
+        if arg.startswith(flag + "="):
+            return arg.split("=", 1)[1]
+    return None
+
+# Pass --trace FILE to record timestamped spans for every pipeline stage in
+# Chrome trace-event format (open in ui.perfetto.dev or chrome://tracing).
+TRACE_FILE = _cli_value("--trace")
+
+class _Tracer:
+    """Collects Chrome trace-event "complete" spans (ph="X") in memory.
+
+    Timestamps are CLOCK_MONOTONIC microseconds, which is system-wide on
+    Linux, so spans recorded by the layer-shell helpers line up with the
+    main process when write() merges their files into TRACE_FILE.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._pid = os.getpid()
+        self._events = [self._meta(self._pid, "eve-o-preview")]
+        self._lock = _threading.Lock()    # spans may come from any thread
+        self._helpers = []                # (Popen, trace path)
+
+    @staticmethod
+    def _meta(pid, name):
+        return {"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                "args": {"name": name}}
+
+    def add(self, name, cat, start_ns, end_ns, args=None):
+        ev = {"name": name, "cat": cat, "ph": "X", "pid": self._pid,
+              "tid": _threading.get_native_id(),
+              "ts": start_ns / 1000.0, "dur": (end_ns - start_ns) / 1000.0}
+        if args:
+            ev["args"] = args
+        with self._lock:
+            self._events.append(ev)
+
+    def counter(self, name, value):
+        ev = {"name": name, "ph": "C", "pid": self._pid, "tid": 0,
+              "ts": _time.monotonic_ns() / 1000.0, "args": {name: value}}
+        with self._lock:
+            self._events.append(ev)
+
+    def helper_env(self, env):
+        """Give a helper subprocess its own trace file via the environment."""
+        path = f"{self.path}.helper-{len(self._helpers)}.json"
+        env["EVE_PREVIEW_TRACE_FILE"] = path
+        return path
+
+    def register_helper(self, proc, path):
+        self._helpers.append((proc, path))
+
+    def write(self):
+        events = list(self._events)
+        for proc, path in self._helpers:
+            # Helpers dump their spans when their main loop exits (QUIT or
+            # stdin EOF); give them a moment to do so.
+            try:
+                proc.wait(timeout=2)
+            except Exception:
+                pass
+            try:
+                with open(path) as f:
+                    helper_events = json.load(f)
+                events.append(self._meta(proc.pid, f"layer-shell helper {proc.pid}"))
+                events.extend(helper_events)
+                os.unlink(path)
+            except Exception as e:
+                print(f"[trace] helper trace {path}: {e}")
+        events.sort(key=lambda ev: ev.get("ts", 0))
+        try:
+            with open(self.path, "w") as f:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+            print(f"[trace] wrote {len(events)} events to {self.path}")
+        except Exception as e:
+            print(f"[trace] write failed: {e}")
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "t0")
+
+    def __init__(self, name, cat, args):
+        self.name, self.cat, self.args = name, cat, args
+
+    def __enter__(self):
+        self.t0 = _time.monotonic_ns()
+        return self
+
+    def __exit__(self, *_exc):
+        _tracer.add(self.name, self.cat, self.t0, _time.monotonic_ns(), self.args)
+        return False
+
+import contextlib as _contextlib
+_NO_SPAN = _contextlib.nullcontext()
+_tracer = _Tracer(TRACE_FILE) if TRACE_FILE else None
+
+def _trace_span(name, cat, **args):
+    """Context manager recording one span; a shared no-op when not tracing."""
+    if _tracer is None:
+        return _NO_SPAN
+    return _Span(name, cat, args)
+
 SELF_PID = os.getpid()
 SCRIPT_BASENAME = os.path.basename(__file__)
 
@@ -711,6 +1917,15 @@ def _get_window_name(wnck_window):
     except Exception:
         return ""
 
+def _character_name(title):
+    """Character name from an EVE window title ("EVE - Name [tag]" -> "Name").
+
+    Titles without " - " (e.g. a bare "EVE" during startup) are returned as-is.
+    """
+    if " - " in title:
+        return title.split(" - ", 1)[1].split("[")[0].strip()
+    return title
+
 def _looks_like_launcher(name, pid=0):
     low = (name or "").lower()
     if any(k in low for k in ("launcher", "eve launcher")):
@@ -759,7 +1974,395 @@ def is_eve_window_steamaware(wnck_window):
         return True
     return False
 
+# ---------------------------------------------------------------------------
+# NumPy scaling stage — optional replacement for pixbuf.scale_simple()
+# ---------------------------------------------------------------------------
+
+def _pixbuf_array(pb):
+    """Return a read-only (h, w, n_channels) uint8 array of a pixbuf's pixels.
+
+    Not zero-copy: PyGObject hands pixbuf storage to Python as a bytes copy.
+    get_pixels() makes that one copy (read_pixel_bytes().get_data() made
+    two for captured pixbufs), and the strided view over it honours the
+    rowstride without another.  The zero-copy path is the pooled one
+    (_FramePool), used whenever pycairo is installed.
+    """
+    w, h = pb.get_width(), pb.get_height()
+    n, rs = pb.get_n_channels(), pb.get_rowstride()
+    buf = _np.frombuffer(pb.get_pixels(), dtype=_np.uint8)
+    return _np.lib.stride_tricks.as_strided(
+        buf, shape=(h, w, n), strides=(rs, n, 1), writeable=False)
+
+def _array_to_pixbuf(arr):
+    """Copy a contiguous (h, w, 3|4) uint8 array into a new GdkPixbuf.
+
+    The array itself is the scaler's reusable output; the pixbuf is new
+    each call because GdkPixbuf storage cannot be written from Python
+    (get_pixels() returns a copy).  Reused outputs all the way to the
+    display exist only with pycairo, in _FramePool.
+    """
+    h, w, n = arr.shape
+    return GdkPixbuf.Pixbuf.new_from_bytes(
+        GLib.Bytes.new(arr.tobytes()),
+        GdkPixbuf.Colorspace.RGB, n == 4, 8, w, h, w * n)
+
+# Scaling quality tiers, selectable per thumbnail state (background, active,
+# hovered).  With the NumPy backend "nearest" point-samples, "tiles" averages
+# a 2x2 sample grid per output pixel, "bilinear" runs the full area filter
+# (which already beats bilinear when downscaling), and "hyper" skips NumPy
+# for cairo's BEST filter (GdkPixbuf HYPER without pycairo).
+_SCALE_TIERS = {
+    "nearest":  GdkPixbuf.InterpType.NEAREST,
+    "tiles":    GdkPixbuf.InterpType.TILES,
+    "bilinear": GdkPixbuf.InterpType.BILINEAR,
+    "hyper":    GdkPixbuf.InterpType.HYPER,
+}
+
+# The same tiers for the cairo scaler (_FramePool without NumPy, or
+# scale_backend "gdk").  cairo's GOOD filter box-filters when downscaling.
+_CAIRO_FILTERS = {
+    "nearest":  _cairo.FILTER_NEAREST,
+    "tiles":    _cairo.FILTER_FAST,
+    "bilinear": _cairo.FILTER_GOOD,
+    "hyper":    _cairo.FILTER_BEST,
+} if _cairo is not None else {}
+
+# Slot pixel formats (_FMT_*, see _SHM_FRAMES) as cairo formats.
+_CAIRO_FORMATS = {
+    _FMT_RGB24:  _cairo.FORMAT_RGB24,
+    _FMT_RGB565: _cairo.FORMAT_RGB16_565,
+    _FMT_A8:     _cairo.FORMAT_A8,
+    _FMT_ARGB32: _cairo.FORMAT_ARGB32,
+} if _cairo is not None else {}
+
+class _AreaScaler:
+    """Downscales frames with a box/area filter into reusable output arrays.
+
+    One instance per thumbnail.  A "plan" (bin edges, accumulators, output
+    array) is built once per (source size, target size) pair and reused on
+    every following tick, so steady-state scaling allocates nothing.
+
+    Rows are reduced first by adding whole source rows into a row
+    accumulator (one vectorised add per row offset inside a bin), then
+    columns are reduced the same way.  np.add.reduceat along axis 0 would be
+    shorter but is several times slower on a 2560-wide frame.
+
+    - Integer reduction factors (e.g. 2560x1440 -> 320x180) take the fast
+      path: plain strided slices, no gathers and no masks.
+    - Any other ratio (e.g. 2560x1440 -> 320x200) averages pixel-aligned
+      bins whose sizes differ by at most one row/column.
+    - Upscaling is not handled; scale() returns None and the caller falls
+      back to scale_simple().
+
+    nearest() is the cheapest tier: it point-samples the centre of each bin.
+    tiles() sits between the two: it averages four samples per bin, at the
+    quarter and three-quarter points, so it reads two source rows per output
+    row instead of every row.
+    """
+
+    _MAX_PLANS = 6   # normal + zoomed size per tier, plus spares for resizes
+
+    def __init__(self):
+        self._plans = {}
+
+    def _get_plan(self, kind, src, dw, dh):
+        sh, sw, n = src.shape
+        if dw <= 0 or dh <= 0 or dw > sw or dh > sh:
+            return None
+        key = (kind, sw, sh, n, dw, dh)
+        plan = self._plans.get(key)
+        if plan is None:
+            if len(self._plans) >= self._MAX_PLANS:
+                self._plans.clear()
+            make = {"area": self._make_plan, "nearest": self._make_nearest_plan,
+                    "tiles": self._make_tiles_plan}[kind]
+            plan = self._plans[key] = make(sw, sh, n, dw, dh)
+        return plan
+
+    def nearest(self, src, dw, dh, out=None):
+        plan = self._get_plan("nearest", src, dw, dh)
+        if plan is None:
+            return None
+        if out is None:
+            out = plan["out"]
+        if plan["integer"]:
+            fy, fx = plan["factor"]
+            _np.copyto(out, src[fy // 2::fy, fx // 2::fx][:dh, :dw])
+        else:
+            _np.take(src, plan["iy"], axis=0, out=plan["rows"])
+            _np.take(plan["rows"], plan["ix"], axis=1, out=out)
+        return out
+
+    def tiles(self, src, dw, dh, out=None):
+        plan = self._get_plan("tiles", src, dw, dh)
+        if plan is None:
+            return None
+        if out is None:
+            out = plan["out"]
+        r0, r1, tmp, acc = plan["r0"], plan["r1"], plan["tmp"], plan["acc"]
+        ix0, ix1 = plan["ix0"], plan["ix1"]
+        _np.take(src, plan["iy0"], axis=0, out=r0)
+        _np.take(src, plan["iy1"], axis=0, out=r1)
+        _np.take(r0, ix0, axis=1, out=tmp)
+        _np.copyto(acc, tmp)
+        for rows, ix in ((r0, ix1), (r1, ix0), (r1, ix1)):
+            _np.take(rows, ix, axis=1, out=tmp)
+            _np.add(acc, tmp, out=acc)
+        acc += 2
+        _np.right_shift(acc, 2, out=acc)
+        _np.copyto(out, acc, casting="unsafe")
+        return out
+
+    def by_tier(self, tier, src, dw, dh, out=None):
+        """Scale with the NumPy filter for a quality tier (see _SCALE_TIERS)."""
+        if tier == "nearest":
+            return self.nearest(src, dw, dh, out=out)
+        if tier == "tiles":
+            return self.tiles(src, dw, dh, out=out)
+        return self.scale(src, dw, dh, out=out)
+
+    def scale(self, src, dw, dh, out=None):
+        plan = self._get_plan("area", src, dw, dh)
+        if plan is None:
+            return None
+        sh, sw, n = src.shape
+        # (h, w, n) -> (h, w*n): a no-copy reshape since each row is contiguous.
+        rows_in = src.reshape(sh, sw * n)
+        rows, acc = plan["rows"], plan["acc"]
+        if out is None:
+            out = plan["out"]
+
+        if plan["integer"]:
+            fy, fx = plan["factor"]
+            rows_in = rows_in[:fy * dh]
+            _np.copyto(rows, rows_in[0::fy])
+            for k in range(1, fy):
+                _np.add(rows, rows_in[k::fy], out=rows)
+            cols = rows.reshape(dh, dw, fx, n)
+            _np.copyto(acc, cols[:, :, 0])
+            for k in range(1, fx):
+                _np.add(acc, cols[:, :, k], out=acc)
+        else:
+            gather = plan["gather"]
+            for k, (idx, mask) in enumerate(plan["row_steps"]):
+                _np.take(rows_in, idx, axis=0, out=gather)
+                if k == 0:
+                    _np.copyto(rows, gather)
+                elif mask is None:
+                    _np.add(rows, gather, out=rows)
+                else:
+                    _np.add(rows, gather, out=rows, where=mask)
+            _np.add.reduceat(rows.reshape(dh, sw, n), plan["xs"], axis=1,
+                             out=acc)
+
+        # Round to nearest rather than truncate: (sum + count/2) // count.
+        acc += plan["half"]
+        _np.floor_divide(acc, plan["count"], out=acc)
+        _np.copyto(out, acc, casting="unsafe")
+        return out
+
+    @staticmethod
+    def _make_plan(sw, sh, n, dw, dh):
+        ys = (_np.arange(dh, dtype=_np.intp) * sh) // dh
+        xs = (_np.arange(dw, dtype=_np.intp) * sw) // dw
+        y_end = _np.append(ys, sh)[1:]
+        cy = y_end - ys
+        cx = _np.append(xs, sw)[1:] - xs
+        # uint16 accumulators halve memory traffic; fall back to uint32 only
+        # for extreme ratios where a bin could overflow 65535.
+        max_area = int(cy.max()) * int(cx.max())
+        acc_t = _np.uint16 if max_area * 255 < 65536 else _np.uint32
+        plan = {
+            "rows": _np.empty((dh, sw * n), dtype=acc_t),
+            "acc": _np.empty((dh, dw, n), dtype=acc_t),
+            "out": _np.empty((dh, dw, n), dtype=_np.uint8),
+        }
+        if sw % dw == 0 and sh % dh == 0:
+            fy, fx = sh // dh, sw // dw
+            plan["integer"] = True
+            plan["factor"] = (fy, fx)
+            plan["count"] = acc_t(fy * fx)
+            plan["half"] = acc_t(fy * fx // 2)
+            return plan
+        # Row offset k inside each bin: gather row ys+k for every output row;
+        # bins shorter than k+1 rows are masked out of the add.
+        steps = []
+        min_cy = int(cy.min())
+        for k in range(int(cy.max())):
+            idx = _np.minimum(ys + k, y_end - 1)
+            mask = None if k < min_cy else (cy > k)[:, None]
+            steps.append((idx, mask))
+        count = (cy[:, None, None] * cx[None, :, None]
+                 * _np.ones((1, 1, n), dtype=_np.intp)).astype(acc_t)
+        plan["integer"] = False
+        plan["xs"] = xs
+        plan["row_steps"] = steps
+        plan["gather"] = _np.empty((dh, sw * n), dtype=_np.uint8)
+        plan["count"] = count
+        plan["half"] = count // 2
+        return plan
+
+    @staticmethod
+    def _make_tiles_plan(sw, sh, n, dw, dh):
+        def points(src_len, dst_len, k):
+            return ((4 * _np.arange(dst_len, dtype=_np.intp) + k) * src_len) // (4 * dst_len)
+        return {
+            "iy0": points(sh, dh, 1), "iy1": points(sh, dh, 3),
+            "ix0": points(sw, dw, 1), "ix1": points(sw, dw, 3),
+            "r0": _np.empty((dh, sw, n), dtype=_np.uint8),
+            "r1": _np.empty((dh, sw, n), dtype=_np.uint8),
+            "tmp": _np.empty((dh, dw, n), dtype=_np.uint8),
+            "acc": _np.empty((dh, dw, n), dtype=_np.uint16),
+            "out": _np.empty((dh, dw, n), dtype=_np.uint8),
+        }
+
+    @staticmethod
+    def _make_nearest_plan(sw, sh, n, dw, dh):
+        plan = {"out": _np.empty((dh, dw, n), dtype=_np.uint8)}
+        if sw % dw == 0 and sh % dh == 0:
+            plan["integer"] = True
+            plan["factor"] = (sh // dh, sw // dw)
+            return plan
+        plan["integer"] = False
+        plan["iy"] = ((2 * _np.arange(dh, dtype=_np.intp) + 1) * sh) // (2 * dh)
+        plan["ix"] = ((2 * _np.arange(dw, dtype=_np.intp) + 1) * sw) // (2 * dw)
+        plan["rows"] = _np.empty((dh, sw, n), dtype=_np.uint8)
+        return plan
+
+class _FramePool:
+    """Per-thumbnail frame buffers, reused from one tick to the next.
+
+    Capture paints the client window into a pooled full-size surface, the
+    scaler reads it in place and writes into a pooled thumbnail-size
+    surface, and the GTK image, the mosaic and the layer-shell slot all
+    borrow that one.  Buffers are keyed by (role, w, h) and are cairo RGB24
+    (the X server's BGRX on little-endian machines), so NumPy sees them as
+    (h, w, 4) arrays without a copy.
+
+    "allocs" counts pool buffers created, "reuses" counts hits; after
+    warm-up (one source size, normal + zoomed output) allocs stays flat.
+    It does not cover the small cairo.Context objects still made per tick
+    for capture, scaling and wire conversion.
+    """
+
+    _MAX_BUFFERS = 6
+
+    def __init__(self):
+        self._bufs = {}
+        self.allocs = 0
+        self.alloc_bytes = 0
+        self.reuses = 0
+
+    def _get(self, key, make):
+        buf = self._bufs.get(key)
+        if buf is not None:
+            self.reuses += 1
+            return buf
+        if len(self._bufs) >= self._MAX_BUFFERS:
+            self._bufs.clear()
+        buf = self._bufs[key] = make()
+        self.allocs += 1
+        return buf
+
+    def surface(self, role, w, h, fmt=None):
+        """(cairo.ImageSurface, (h, w, bpp) view or None) for role at w x h.
+
+        fmt is a cairo format, RGB24 by default.
+        """
+        if fmt is None:
+            fmt = _cairo.FORMAT_RGB24
+        def make():
+            stride = _cairo.ImageSurface.format_stride_for_width(fmt, w)
+            data = bytearray(stride * h)
+            self.alloc_bytes += len(data)
+            surf = _cairo.ImageSurface.create_for_data(data, fmt, w, h, stride)
+            arr = None
+            if _np is not None:
+                bpp = {_cairo.FORMAT_RGB16_565: 2, _cairo.FORMAT_A8: 1}.get(fmt, 4)
+                arr = _np.ndarray((h, w, bpp), dtype=_np.uint8, buffer=data,
+                                  strides=(stride, bpp, 1))
+            return surf, arr
+        return self._get((role, w, h, int(fmt)), make)
+
+    def array(self, role, h, w, n, dtype=None):
+        """A reusable (h, w, n) array (uint8 by default) for intermediates."""
+        dtype = dtype or _np.uint8
+        def make():
+            arr = _np.empty((h, w, n), dtype=dtype)
+            self.alloc_bytes += arr.nbytes
+            return arr
+        return self._get((role, w, h, n, _np.dtype(dtype).str), make)
+
+    def to_wire(self, surf, wire_fmt):
+        """Convert a pooled RGB24 frame for the helper: (data, stride, fmt).
+
+        RGB24 goes as-is.  RGB565 is a cairo paint into a pooled 16-bit
+        surface; greyscale (A8) is an integer luma pass with NumPy.
+        """
+        w, h = surf.get_width(), surf.get_height()
+        if wire_fmt == _FMT_RGB565:
+            dst, _arr = self.surface("wire", w, h, _cairo.FORMAT_RGB16_565)
+            cr = _cairo.Context(dst)
+            cr.set_operator(_cairo.OPERATOR_SOURCE)
+            cr.set_source_surface(surf, 0, 0)
+            cr.paint()
+            dst.flush()
+            return dst.get_data(), dst.get_stride(), wire_fmt
+        if wire_fmt == _FMT_A8 and _np is not None:
+            stride = surf.get_stride()
+            src = _np.ndarray((h, w, 4), dtype=_np.uint8, buffer=surf.get_data(),
+                              strides=(stride, 4, 1))
+            dst, grey = self.surface("wire", w, h, _cairo.FORMAT_A8)
+            acc = self.array("luma", h, w, 1, _np.uint16)[..., 0]
+            tmp = self.array("luma_tmp", h, w, 1, _np.uint16)[..., 0]
+            # BT.601 luma in 8.8 fixed point; BGRX byte order.
+            _np.multiply(src[..., 2], 77, out=acc, dtype=_np.uint16)
+            _np.multiply(src[..., 1], 150, out=tmp, dtype=_np.uint16)
+            _np.add(acc, tmp, out=acc)
+            _np.multiply(src[..., 0], 29, out=tmp, dtype=_np.uint16)
+            _np.add(acc, tmp, out=acc)
+            _np.right_shift(acc, 8, out=acc)
+            _np.copyto(grey[..., 0], acc, casting="unsafe")
+            dst.mark_dirty()
+            return dst.get_data(), dst.get_stride(), wire_fmt
+        return surf.get_data(), surf.get_stride(), _FMT_RGB24
+
+    def scale(self, src, src_arr, w, h, tier, scaler=None):
+        """Downscale a pooled capture into the pooled "out" surface.
+
+        Uses the NumPy area filter when a scaler is given, else cairo with
+        the tier's filter.  Returns the out surface (reused next tick).
+        """
+        out, out_arr = self.surface("out", w, h)
+        if scaler is not None and src_arr is not None:
+            res = scaler.by_tier(tier, src_arr, w, h, out=out_arr)
+            if res is not None:
+                out.mark_dirty()
+                return out
+        cr = _cairo.Context(out)
+        cr.set_operator(_cairo.OPERATOR_SOURCE)
+        cr.scale(w / src.get_width(), h / src.get_height())
+        cr.set_source_surface(src, 0, 0)
+        cr.get_source().set_filter(_CAIRO_FILTERS.get(tier, _cairo.FILTER_GOOD))
+        cr.paint()
+        out.flush()
+        return out
+
+    def clear(self):
+        self._bufs.clear()
+
+import copy as _copy, tempfile as _tempfile
+
 class Config:
+    # save() is write-behind: it only arms a short GLib timer.  When the timer
+    # fires, a snapshot of the settings is handed to a background writer
+    # thread that replaces config.json atomically (temp file + fsync +
+    # rename), so a drag, a settings change and N thumbnail teardowns all
+    # collapse into one write and a crash can never leave a truncated file.
+    # flush() writes any pending change synchronously; main() calls it once
+    # on shutdown.
+    SAVE_DELAY_MS = 500
+
     def __init__(self):
         from pathlib import Path as _Path
         self.config_dir = _Path.home() / ".config" / "eve-o-preview-linux"
@@ -771,14 +2374,74 @@ class Config:
             "opacity": 0.95,
             "always_on_top": True,
             "hide_active_client": False,
+            "pause_active_client": False,
             "zoom_on_hover": True,
             "zoom_factor": 1.25,
             "show_overlay": True,
             "refresh_fps": 10,  # FPS instead of period
+            # Capture rate of the hovered (zoomed) thumbnail; bypasses the
+            # capture budget and never drops below refresh_fps.
+            "hover_fps": 30,
             "active_border_color": "#00FF00",  # Neon green default
+            "scale_backend": "auto",  # "auto" (NumPy if installed), "numpy" or "gdk"
+            # Scaling quality per thumbnail state — see _SCALE_TIERS.
+            "scale_quality_background": "tiles",
+            "scale_quality_active": "bilinear",
+            "scale_quality_hover": "bilinear",
+            # Layer-shell frames of background thumbnails: "full" (native
+            # 32-bit), "rgb565" (half the bytes) or "grey" (a quarter).
+            "background_depth": "full",
+            # Main-loop round trip that counts as a freeze; 0 disables the
+            # stall watchdog.
+            "stall_threshold_ms": 250,
+            # Global capture ceilings shared by all thumbnails (0 = none):
+            # percent of one core for capture + scale, and megapixels/s.
+            "capture_budget_pct": 0,
+            "capture_budget_mpix": 0,
+            # After this many seconds without keyboard or mouse input every
+            # thumbnail drops to idle_fps until the next input; 0 = never.
+            "idle_after_s": 180,
+            "idle_fps": 1,
+            # Capture in N worker processes (own X connection each) instead
+            # of on the UI thread; 0 = in-process.
+            "capture_workers": 0,
+            # Placement of helper and worker processes (see _ProcessPlacement):
+            # nice 0 = unchanged, scheduler "normal" / "batch" / "idle", CPU
+            # list like "2-3" ("" = any) and a CPU quota in % of one core
+            # shared through a systemd user slice (0 = no slice).
+            "helper_nice": 0,
+            "helper_sched": "normal",
+            "helper_cpus": "",
+            "helper_cpu_quota": 0,
+            # "windows" (one thumbnail window per client) or "mosaic" (all
+            # thumbnails in one surface; see _Mosaic).  Needs a restart.
+            "display_mode": "windows",
+            "mosaic_layout": "grid",   # or "free"
+            "mosaic_columns": 0,       # grid width; 0 = roughly square
+            "mosaic_position": [12, 12],
+            "mosaic_cells": {},        # free layout: window name → [x, y]
+            # Per-character overrides keyed by character name, e.g.
+            # {"Scout": {"fps": 30}, "Miner": {"mode": "snapshot",
+            # "snapshot_s": 10}}.  Keys: fps, width, height, zoom_factor,
+            # mode ("live" / "snapshot"), snapshot_s.  Missing keys fall
+            # back to the global settings; see ThumbnailWindow.apply_profile.
+            "character_profiles": {},
+            # Global hotkeys, key combo → action: "next", "previous",
+            # "client N" (position in the cycle order) or "character NAME".
+            # e.g. {"Super+Tab": "next", "Super+1": "client 1"}.
+            "hotkeys": {},
+            # Character names in hotkey cycle order; others follow by name.
+            "cycle_order": [],
             "thumbnail_positions": {}
         }
         self.settings = self.load()
+        self._save_timer = None
+        self._dirty = False
+        self._generation = 0          # bumped for every snapshot taken
+        self._written_generation = 0  # newest snapshot already on disk
+        self._write_lock = _threading.Lock()
+        self._write_queue = _queue_mod.Queue(maxsize=1)   # latest snapshot wins
+        self._writer_thread = None
 
     def load(self):
         try:
@@ -793,34 +2456,410 @@ class Config:
         return self.default_config.copy()
 
     def save(self):
+        """Schedule a write of the current settings (coalesced, off-thread)."""
+        self._dirty = True
+        if self._save_timer is None:
+            self._save_timer = GLib.timeout_add(self.SAVE_DELAY_MS, self._hand_off)
+
+    def flush(self):
+        """Write pending changes now, on the calling thread."""
+        if self._save_timer is not None:
+            try:
+                GLib.source_remove(self._save_timer)
+            except Exception:
+                pass
+            self._save_timer = None
         try:
-            with open(self.config_file, "w") as f:
-                json.dump(self.settings, f, indent=2)
-        except Exception as e:
-            print("Config save error:", e)
+            while True:
+                self._write_queue.get_nowait()
+                self._dirty = True   # superseded by the snapshot below
+        except _queue_mod.Empty:
+            pass
+        # A snapshot the writer thread has already dequeued may still be in
+        # flight; the daemon thread dies at exit, so write it here too.
+        # _write() waits on the writer's lock, and the newer generation wins.
+        if self._dirty or self._generation > self._written_generation:
+            self._dirty = False
+            self._write(self._snapshot())
+
+    def _snapshot(self):
+        # Taken on the main thread so the writer never iterates a dict that
+        # GTK callbacks are still mutating.
+        self._generation += 1
+        return self._generation, _copy.deepcopy(self.settings)
+
+    def _hand_off(self):
+        self._save_timer = None
+        if not self._dirty:
+            return False
+        self._dirty = False
+        snap = self._snapshot()
+        try:
+            self._write_queue.put_nowait(snap)
+        except _queue_mod.Full:
+            try:
+                self._write_queue.get_nowait()
+            except _queue_mod.Empty:
+                pass
+            try:
+                self._write_queue.put_nowait(snap)
+            except _queue_mod.Full:
+                pass
+        if self._writer_thread is None or not self._writer_thread.is_alive():
+            self._writer_thread = _threading.Thread(
+                target=self._writer, name="config-writer", daemon=True)
+            self._writer_thread.start()
+        return False  # one-shot
+
+    def _writer(self):
+        while True:
+            self._write(self._write_queue.get())
+
+    def _write(self, snap):
+        generation, settings = snap
+        with self._write_lock:
+            # A slower writer holding an older snapshot must not overwrite a
+            # newer one that flush() already put on disk.
+            if generation <= self._written_generation:
+                return
+            tmp = None
+            try:
+                data = json.dumps(settings, indent=2)
+                fd, tmp = _tempfile.mkstemp(
+                    dir=str(self.config_dir), prefix=".config.", suffix=".tmp")
+                with os.fdopen(fd, "w") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, str(self.config_file))
+                tmp = None
+                self._written_generation = generation
+            except Exception as e:
+                print("Config save error:", e)
+            finally:
+                if tmp:
+                    try:
+                        os.unlink(tmp)
+                    except Exception:
+                        pass
+
+class _CaptureStats:
+    """Per-thumbnail capture counters for the management window stats line.
+
+    Updated from tick() on the main thread; read and rolled over once per
+    second by EVEOPreview._refresh_stats().  Timings are EWMAs so a single
+    slow frame is visible without making the number jump around.
+    """
+
+    _ALPHA = 0.2
+
+    def __init__(self):
+        self.frames = 0             # frames presented in the current window
+        self.capture_ms = 0.0
+        self.scale_ms = 0.0
+        self.fallbacks = 0          # icon fallbacks since start
+        self.src_pixels = 0         # size of the last captured source frame
+        self._window_start = _time.monotonic()
+        self._bytes_mark = 0
+
+    def record_frame(self, capture_s, scale_s, src_pixels=0):
+        a = self._ALPHA
+        self.frames += 1
+        self.capture_ms += a * (capture_s * 1000.0 - self.capture_ms)
+        self.scale_ms += a * (scale_s * 1000.0 - self.scale_ms)
+        if src_pixels:
+            self.src_pixels = src_pixels
+
+    @property
+    def cost_ms(self):
+        """Measured main-thread cost of one frame (capture + scale)."""
+        return self.capture_ms + self.scale_ms
+
+    def roll(self, bytes_total=0):
+        """Return (fps, bytes/s) for the window just ended and start a new one."""
+        now = _time.monotonic()
+        elapsed = max(now - self._window_start, 1e-6)
+        fps = self.frames / elapsed
+        bps = (bytes_total - self._bytes_mark) / elapsed
+        self.frames = 0
+        self._window_start = now
+        self._bytes_mark = bytes_total
+        return fps, bps
+
+class _LoopLagProbe:
+    """Measures GLib main-loop lag: how late a fixed-period timer fires.
+
+    Runs at PRIORITY_DEFAULT like GTK input handling, so the lag it reports
+    is roughly the delay a click or hover would see.
+    """
+
+    def __init__(self, period_ms=100):
+        self._period = period_ms / 1000.0
+        self._expected = _time.monotonic() + self._period
+        self.avg_ms = 0.0
+        self.max_ms = 0.0
+        GLib.timeout_add(period_ms, self._beat)
+
+    def _beat(self):
+        now = _time.monotonic()
+        lag_ms = max(0.0, (now - self._expected) * 1000.0)
+        self._expected = now + self._period
+        self.avg_ms += 0.1 * (lag_ms - self.avg_ms)
+        self.max_ms = max(self.max_ms, lag_ms)
+        if _tracer:
+            _tracer.counter("loop_lag_ms", round(lag_ms, 2))
+        return True
+
+    def roll(self):
+        """Return (avg_ms, max_ms) and reset the max for the next window."""
+        avg, peak = self.avg_ms, self.max_ms
+        self.max_ms = 0.0
+        return avg, peak
+
+class _CaptureBudget:
+    """Divides a global capture budget across thumbnails by priority.
+
+    Two optional ceilings, either or both: "capture_budget_pct" is the CPU
+    time capture + scale may use, in percent of one core, and
+    "capture_budget_mpix" is the megapixels captured per second.  Clients
+    are served in priority order (hovered, recently active, recently
+    changed, idle).  Each class is raised to its full rate (refresh_fps or
+    the character profile's) before the next
+    one gets anything; a class that cannot be fully served shares what is
+    left at an equal frame rate.  Every client keeps MIN_FPS so nothing
+    freezes.  Per-frame costs are the thumbnails' measured EWMAs, so the
+    split follows real load rather than a guess.
+    """
+
+    MIN_FPS = 0.5
+    ACTIVE_HOLD_S = 30.0     # "recently active" window
+    CHANGE_HOLD_S = 5.0      # "recently changed" window
+    DEFAULT_COST_MS = 5.0    # until a thumbnail has measured its own
+    DEFAULT_MPIX = 2.0
+
+    def __init__(self, config):
+        self.config = config
+        self.used_pct = 0.0     # estimated capture CPU after the last split
+
+    def _priority(self, t, now):
+        if t.is_hovering:
+            return 0
+        if t.is_active or now - t.last_active < self.ACTIVE_HOLD_S:
+            return 1
+        if now - t.last_change < self.CHANGE_HOLD_S:
+            return 2
+        return 3
+
+    def allocate(self, thumbs):
+        s = self.config.settings
+        pct = float(s.get("capture_budget_pct", 0) or 0)
+        mpix = float(s.get("capture_budget_mpix", 0) or 0)
+        live = [t for t in thumbs if t.live_window and not t.paused]
+        now = _time.monotonic()
+        prio = {t: self._priority(t, now) for t in live}
+        order = sorted(live, key=prio.get)
+        alloc = {t: t._base_fps() for t in live}
+
+        def cpu_cost(t):
+            return t.stats.cost_ms or self.DEFAULT_COST_MS
+
+        def pix_cost(t):
+            return t.stats.src_pixels / 1e6 or self.DEFAULT_MPIX
+
+        if pct > 0:
+            # pct % of one core = pct * 10 ms of CPU per second.
+            self._fill(order, prio, pct * 10.0, cpu_cost, alloc)
+        if mpix > 0:
+            self._fill(order, prio, mpix, pix_cost, alloc)
+        self.used_pct = sum(alloc[t] * cpu_cost(t) for t in live) / 10.0
+        for t in live:
+            t.set_budget_fps(alloc[t])
+        if _tracer:
+            _tracer.counter("capture_budget_pct", round(self.used_pct, 1))
+
+    def _fill(self, order, prio, budget, cost, alloc):
+        # alloc holds each client's ceiling on entry.
+        floor = {t: min(self.MIN_FPS, alloc[t]) for t in order}
+        fps = dict(floor)
+        remaining = budget - sum(floor[t] * cost(t) for t in order)
+        i = 0
+        while i < len(order) and remaining > 0:
+            j = i
+            while j < len(order) and prio[order[j]] == prio[order[i]]:
+                j += 1
+            group = order[i:j]
+            need = sum((alloc[t] - floor[t]) * cost(t) for t in group)
+            if need <= remaining:
+                for t in group:
+                    fps[t] = alloc[t]
+                remaining -= need
+            else:
+                extra = remaining / sum(cost(t) for t in group)
+                for t in group:
+                    fps[t] = floor[t] + extra
+                remaining = 0
+            i = j
+        for t in order:
+            alloc[t] = min(alloc[t], fps[t])
+
+import sys as _sys, traceback as _traceback, zlib as _zlib
+
+class _StallWatchdog:
+    """Background thread that pings the GLib main loop and catches freezes.
+
+    Every PING_MS the thread queues an idle callback at PRIORITY_DEFAULT and
+    waits for it to run.  The round trip goes into a latency histogram; if
+    it exceeds threshold_ms the main thread's Python stack is captured
+    while it is still stuck, and printed as a "[watchdog]" report once the
+    loop recovers.  C calls that keep the GIL held delay the capture until
+    they return, so the reported stack is then the first Python line after
+    the blocking call.
+    """
+
+    PING_MS = 100
+    BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 250, 500, 1000, 2500)
+
+    def __init__(self, threshold_ms):
+        self.threshold_ms = threshold_ms
+        self.histogram = [0] * (len(self.BUCKETS_MS) + 1)   # last = overflow
+        self.stalls = 0
+        self.worst_ms = 0.0
+        self._main_ident = _threading.main_thread().ident
+        self._pong = _threading.Event()
+        _threading.Thread(target=self._run, name="stall-watchdog", daemon=True).start()
+
+    def _run(self):
+        threshold = self.threshold_ms / 1000.0
+        while True:
+            self._pong.clear()
+            t0 = _time.monotonic_ns()
+            GLib.idle_add(self._on_pong, priority=GLib.PRIORITY_DEFAULT)
+            stack = None
+            if not self._pong.wait(threshold):
+                stack = self._main_stack()
+                self._pong.wait()
+            t1 = _time.monotonic_ns()
+            lat_ms = (t1 - t0) / 1e6
+            self._record(lat_ms)
+            if stack is not None:
+                self._report(t0, t1, lat_ms, stack)
+            rest = self.PING_MS / 1000.0 - (t1 - t0) / 1e9
+            if rest > 0:
+                _time.sleep(rest)
+
+    def _on_pong(self):
+        self._pong.set()
+        return False
+
+    def _main_stack(self):
+        frame = _sys._current_frames().get(self._main_ident)
+        return _traceback.format_stack(frame)[-12:] if frame else []
+
+    def _record(self, lat_ms):
+        for i, edge in enumerate(self.BUCKETS_MS):
+            if lat_ms <= edge:
+                self.histogram[i] += 1
+                break
+        else:
+            self.histogram[-1] += 1
+        self.worst_ms = max(self.worst_ms, lat_ms)
+
+    def _report(self, t0_ns, t1_ns, lat_ms, stack):
+        self.stalls += 1
+        print(f"[watchdog] main loop stalled {lat_ms:.0f} ms "
+              f"(threshold {self.threshold_ms} ms); main thread was in:\n"
+              + "".join(stack).rstrip(), flush=True)
+        if _tracer:
+            _tracer.add("stall", "watchdog", t0_ns, t1_ns, {"stack": "".join(stack)})
+
+    def summary(self):
+        """One-line histogram, e.g. "<=1ms:812 <=2ms:40 ... >2500ms:0"."""
+        parts = [f"<={edge}ms:{n}" for edge, n in zip(self.BUCKETS_MS, self.histogram)]
+        parts.append(f">{self.BUCKETS_MS[-1]}ms:{self.histogram[-1]}")
+        return " ".join(parts)
+
+# Capture windows by XID → the ThumbnailWindow caching their state.
+_foreign_watch = {}
+
+_FOREIGN_EVENTS = (Gdk.EventType.CONFIGURE, Gdk.EventType.MAP,
+                   Gdk.EventType.UNMAP, Gdk.EventType.DESTROY)
+
+def _dispatch_gdk_event(event, *_data):
+    """Gdk.event_handler_set hook: structure events for captured (foreign)
+    windows update their thumbnail; everything goes on to GTK as usual."""
+    if event.get_event_type() in _FOREIGN_EVENTS:
+        win = event.get_window()
+        thumb = _foreign_watch.get(win.get_xid()) if win is not None else None
+        if thumb is not None:
+            thumb._on_foreign_event(event)
+    Gtk.main_do_event(event)
 
 class ThumbnailWindow(Gtk.Window):
-    def __init__(self, wnck_window, config, on_activate_callback):
+    def __init__(self, wnck_window, config, on_activate_callback, mosaic=None):
         super().__init__()
         self.wnck_window = wnck_window
         self.config = config
         self.on_activate_callback = on_activate_callback
-
-        self.original_size = (config.settings["thumbnail_width"],
-                              config.settings["thumbnail_height"])
+        # Mosaic mode: frames go to the shared _Mosaic surface, which also
+        # schedules captures; this window is never shown.
+        self._mosaic = mosaic
+        self._next_capture = 0.0
+        self._last_click_time = 0.0
+
+        self._profile = self._lookup_profile()
+        self.original_size = self._profile_size()
         self.is_hovering = False
         self.is_active = False
         self.live_window = None
         self.update_id = None
         self._root_xid = None
         self._capture_xid = None
+        # Capture window state, maintained from X events (_watch_live_window).
+        self._geom = (0, 0)
+        self._mapped = False
+        self._minimized = False
+        self._last_resync = 0.0
         self._target_w, self._target_h = self.original_size
+        self._scaler = _AreaScaler() if _np is not None else None
+        self._pool = _FramePool() if _cairo is not None else None
+        self._slot_seq = 0
+        self.stats = _CaptureStats()
+        # Capture scheduling: _CaptureBudget sets _budget_fps; the timer runs
+        # at _desired_fps().  last_active / last_change feed its priorities.
+        self._tick = None
+        self._timer_period = None
+        self._timer_prio = None
+        self._budget_fps = None
+        self._idle_fps = None
+        self.last_active = 0.0
+        self.last_change = 0.0
+        self._frame_crc = None
+        # Visibility: capture stops while any reason is set ("hidden",
+        # "unmapped", "offscreen", "focused") and resumes with an immediate
+        # capture.  _last_frame is what a "focused" freeze dims.
+        self._pause_reasons = set()
+        self._last_frame = None
+        # Minimized / unviewable: capture drops to LIVENESS_FPS and the
+        # thumbnail keeps its last frame, or a cached scaled icon.
+        self._stalled = False
+        self._fallback_size = None
+        self._icon_cache = {}         # (w, h) → scaled icon
+        self._state_handler = wnck_window.connect("state-changed", self._on_wnck_state)
+        # The character name (and so the profile) settles after login.
+        self._name_handler = wnck_window.connect("name-changed",
+                                                 lambda *_: self.apply_profile())
+        self._last_raise = _time.monotonic()
+        self._last_child_bind = 0.0
+        # Capture worker mode (_CaptureWorkerPool): frames arrive in _slot.
+        self._worker = None
+        self._worker_msg = None
+        self._slot = None
 
         # Layer-shell mode: display via a Wayland OVERLAY subprocess.
         # This guarantees thumbnails appear above every fullscreen/fixed-window
         # surface because the Wayland compositor renders OVERLAY above all managed
         # windows unconditionally, regardless of XWayland stacking tricks.
-        self._use_ls = _LAYER_SHELL_AVAILABLE and _WAYLAND_SESSION
+        self._use_ls = _LAYER_SHELL_AVAILABLE and _WAYLAND_SESSION and mosaic is None
         self._ls = None       # _LayerShellDisplay, created after GTK init
         self._ls_x = self._ls_y = 0
 
@@ -836,6 +2875,8 @@ class ThumbnailWindow(Gtk.Window):
             self.set_keep_above(True)
         self.connect("realize", self._on_realize)
         self.connect("map", self._on_map)
+        if not self._use_ls and mosaic is None:
+            self.connect("unmap", lambda *_: self.set_paused("unmapped", True))
         try:
             self.set_opacity(self.config.settings.get("opacity", 0.95))
         except Exception:
@@ -861,14 +2902,8 @@ class ThumbnailWindow(Gtk.Window):
 
         # Always create the label for character name
         self.label = Gtk.Label()
-        title = self.wnck_window.get_name() or "EVE"
         # Extract character name from window title (format: "EVE - Character Name")
-        if " - " in title:
-            char_name = title.split(" - ", 1)[1]
-            # Remove any trailing parts like " [Omega]" or similar
-            if "[" in char_name:
-                char_name = char_name.split("[")[0].strip()
-            title = char_name
+        title = _character_name(self.wnck_window.get_name() or "EVE")
         self.label.set_markup(f"<b>{title}</b>")
         self.label.set_halign(Gtk.Align.CENTER)
         self.label.set_valign(Gtk.Align.START)
@@ -911,124 +2946,8 @@ class ThumbnailWindow(Gtk.Window):
         # Position/size are sent after subprocess starts; the actual show() call
         # comes later from _add_thumb() via show_all().
         if self._use_ls:
-            import time as _time_mod
-            _last_click_time = [0.0]
-
             def _click():
-                # Secondary debounce in the main process: in case the subprocess
-                # debounce is bypassed (e.g. two subprocesses both firing CLICK),
-                # reject calls arriving within 500 ms of the last activation.
-                now = _time_mod.monotonic()
-                if now - _last_click_time[0] < 0.5:
-                    print(f"[click] debounced", flush=True)
-                    return
-                _last_click_time[0] = now
-                # Use the XID actually being screenshotted (_capture_xid).  Wine/
-                # Proton often opens an "Untitled window" parent that KWin doesn't
-                # track; the real EVE content is in a child window found by
-                # bind_live.  Activating the capture XID targets the visible surface.
-                xid = getattr(self, "_capture_xid", None) or self.wnck_window.get_xid()
-                name = self.wnck_window.get_name()
-                print(f"[click] activating '{name}' xid=0x{xid:x} (capture={xid!=self.wnck_window.get_xid()})", flush=True)
-
-                # Get a real X11 server timestamp — use for all activation methods.
-                try:
-                    _ts = GdkX11.x11_get_server_time(Gdk.get_default_root_window())
-                except Exception:
-                    _ts = 0
-
-                # Unminimize first — wmctrl/xdotool exit=1 on minimized windows.
-                try:
-                    if self.wnck_window.is_minimized():
-                        print(f"[click] unminimizing first", flush=True)
-                        self.wnck_window.unminimize(_ts)
-                except Exception as e:
-                    print(f"[click] unminimize error: {e}", flush=True)
-
-                # Map the X11 window if it's currently unmapped (EVE's loading
-                # screen temporarily withdraws the XWayland surface). We must do
-                # this BEFORE wmctrl/xdotool so they get a mapped window.
-                xlib = _get_xlib()
-                dpy  = _xlib_display()
-                if xlib and dpy:
-                    try:
-                        xlib.XMapWindow.restype  = ctypes.c_int
-                        xlib.XMapWindow.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
-                        xlib.XMapWindow(ctypes.c_void_p(dpy), ctypes.c_ulong(xid))
-                        xlib.XFlush.restype = ctypes.c_int
-                        xlib.XFlush(ctypes.c_void_p(dpy))
-                        print(f"[click] XMapWindow called", flush=True)
-                    except Exception as e:
-                        print(f"[click] XMapWindow error: {e}", flush=True)
-
-                import subprocess as _sp
-                # 1) wmctrl — plain activation request to KWin
-                _wmctrl_ok = False
-                try:
-                    r = _sp.run(["wmctrl", "-ia", hex(xid)],
-                                capture_output=True, timeout=2)
-                    print(f"[click] wmctrl exit={r.returncode}", flush=True)
-                    _wmctrl_ok = (r.returncode == 0)
-                except FileNotFoundError:
-                    print("[click] wmctrl not found", flush=True)
-                except Exception as e:
-                    print(f"[click] wmctrl error: {e}", flush=True)
-
-                # 2) xdotool — often more reliable for XWayland windows
-                #    (sudo dnf install xdotool / sudo apt install xdotool)
-                _xdotool_ok = False
-                try:
-                    r = _sp.run(
-                        ["xdotool", "windowactivate", "--sync", str(xid)],
-                        capture_output=True, timeout=2)
-                    print(f"[click] xdotool exit={r.returncode}", flush=True)
-                    _xdotool_ok = (r.returncode == 0)
-                except FileNotFoundError:
-                    print("[click] xdotool not found (dnf install xdotool)", flush=True)
-                except Exception as e:
-                    print(f"[click] xdotool error: {e}", flush=True)
-
-                if _wmctrl_ok or _xdotool_ok:
-                    return
-
-                # 2b) PID fallback: search for a sibling window from the same
-                # process that KWin DOES manage (_NET_CLIENT_LIST).  Wine/Proton
-                # at character-selection creates an "Untitled window" that KWin
-                # doesn't track; another window from the same PID is the one
-                # KWin can activate.
-                if not _wmctrl_ok:
-                    try:
-                        target_pid = self.wnck_window.get_pid()
-                        if target_pid:
-                            for sibling in Wnck.Screen.get_default().get_windows():
-                                s_xid = sibling.get_xid()
-                                if s_xid == xid or sibling.get_pid() != target_pid:
-                                    continue
-                                s_name = sibling.get_name()
-                                print(f"[click] trying PID sibling 0x{s_xid:x} '{s_name}'", flush=True)
-                                r2 = _sp.run(["wmctrl", "-ia", hex(s_xid)],
-                                             capture_output=True, timeout=2)
-                                print(f"[click] sibling wmctrl exit={r2.returncode}", flush=True)
-                                if r2.returncode == 0:
-                                    _wmctrl_ok = True
-                                    break
-                    except Exception as e:
-                        print(f"[click] sibling search: {e}", flush=True)
-
-                if _wmctrl_ok:
-                    return
-
-                # 3) Direct Xlib _NET_ACTIVE_WINDOW + XSetInputFocus
-                ok = _net_activate_window(xid, _ts)
-                print(f"[click] _net_activate_window={ok}", flush=True)
-                # 4) Wnck fallback
-                try:
-                    print(f"[click] Wnck activate ts={_ts}", flush=True)
-                    if self.wnck_window.is_minimized():
-                        self.wnck_window.unminimize(_ts)
-                    self.wnck_window.activate(_ts)
-                except Exception as e:
-                    print(f"[click] Wnck error: {e}", flush=True)
+                self._click_activate()
 
             def _ctrl_click():
                 try:
@@ -1036,38 +2955,21 @@ class ThumbnailWindow(Gtk.Window):
                 except Exception:
                     pass
 
-            # Zoom debounce state — shared across _enter/_leave closures.
-            _leave_timer = [None]
-
+            # The helper zooms its surface itself and debounces LEAVE (see
+            # ZOOM); these only move capture to the matching resolution.
             def _enter():
                 if not self.config.settings.get("zoom_on_hover", True):
                     return
-                if _leave_timer[0]:
-                    GLib.source_remove(_leave_timer[0])
-                    _leave_timer[0] = None
                 if not self.is_hovering:
-                    self.is_hovering = True
-                    z = self.config.settings.get("zoom_factor", 1.25)
-                    zw = int(self.original_size[0] * z)
-                    zh = int(self.original_size[1] * z)
-                    # Update capture size so frames render at zoomed resolution
-                    self._target_w, self._target_h = zw, zh
-                    if self._ls:
-                        self._ls.set_size(zw, zh)
+                    z = self._zoom_factor()
+                    self._target_w = int(self.original_size[0] * z)
+                    self._target_h = int(self.original_size[1] * z)
+                    self._set_hovering(True)
 
             def _leave():
-                if not self.config.settings.get("zoom_on_hover", True):
-                    return
-                if _leave_timer[0]:
-                    GLib.source_remove(_leave_timer[0])
-                def _do_leave():
-                    _leave_timer[0] = None
-                    if self.is_hovering:
-                        self.is_hovering = False
-                        self._target_w, self._target_h = self.original_size
-                        if self._ls:
-                            self._ls.set_size(*self.original_size)
-                _leave_timer[0] = GLib.timeout_add(80, _do_leave)
+                if self.is_hovering:
+                    self._target_w, self._target_h = self.original_size
+                    self._set_hovering(False)
 
             self._ls = _LayerShellDisplay(
                 self._ls_x, self._ls_y,
@@ -1075,19 +2977,14 @@ class ThumbnailWindow(Gtk.Window):
                 _click, _ctrl_click, self._on_ls_pos,
                 _enter, _leave,
             )
+            self._send_zoom()
             self._ls_save_timer = None
 
             def _send_title():
                 if not self._ls or not self.config.settings.get("show_overlay", True):
                     return
-                raw = self.wnck_window.get_name() or ""
                 # EVE window title format: "EVE - CharacterName" or just "EVE"
-                # Extract everything after the first " - "
-                if " - " in raw:
-                    title = raw.split(" - ", 1)[1].split("[")[0].strip()
-                else:
-                    title = raw
-                self._ls.send_title(title)
+                self._ls.send_title(_character_name(self.wnck_window.get_name() or ""))
 
             _send_title()
             # Update label whenever EVE finishes loading the character.
@@ -1101,27 +2998,164 @@ class ThumbnailWindow(Gtk.Window):
                 return _poll_count[0] < 20  # stop after 20 * 3s = 60s
             GLib.timeout_add(3000, _poll_title)
 
+    def _click_activate(self):
+        """Layer-shell click: the full activation cascade, traced."""
+        with _trace_span("click", "activate"):
+            self._activate_cascade()
+
+    def _activate_cascade(self):
+        # Secondary debounce in the main process: in case the subprocess
+        # debounce is bypassed (e.g. two subprocesses both firing CLICK),
+        # reject calls arriving within 500 ms of the last activation.
+        now = _time.monotonic()
+        if now - self._last_click_time < 0.5:
+            print(f"[click] debounced", flush=True)
+            return
+        self._last_click_time = now
+        # Use the XID actually being screenshotted (_capture_xid).  Wine/
+        # Proton often opens an "Untitled window" parent that KWin doesn't
+        # track; the real EVE content is in a child window found by
+        # bind_live.  Activating the capture XID targets the visible surface.
+        xid = getattr(self, "_capture_xid", None) or self.wnck_window.get_xid()
+        name = self.wnck_window.get_name()
+        print(f"[click] activating '{name}' xid=0x{xid:x} (capture={xid!=self.wnck_window.get_xid()})", flush=True)
+
+        # Get a real X11 server timestamp — use for all activation methods.
+        try:
+            _ts = GdkX11.x11_get_server_time(Gdk.get_default_root_window())
+        except Exception:
+            _ts = 0
+
+        # Unminimize first — wmctrl/xdotool exit=1 on minimized windows.
+        with _trace_span("unminimize", "activate"):
+            try:
+                if self.wnck_window.is_minimized():
+                    print(f"[click] unminimizing first", flush=True)
+                    self.wnck_window.unminimize(_ts)
+            except Exception as e:
+                print(f"[click] unminimize error: {e}", flush=True)
+
+        # Map the X11 window if it's currently unmapped (EVE's loading
+        # screen temporarily withdraws the XWayland surface). We must do
+        # this BEFORE wmctrl/xdotool so they get a mapped window.
+        with _trace_span("XMapWindow", "activate"):
+            xlib = _get_xlib()
+            dpy  = _xlib_display()
+            if xlib and dpy:
+                try:
+                    xlib.XMapWindow.restype  = ctypes.c_int
+                    xlib.XMapWindow.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+                    xlib.XMapWindow(ctypes.c_void_p(dpy), ctypes.c_ulong(xid))
+                    xlib.XFlush.restype = ctypes.c_int
+                    xlib.XFlush(ctypes.c_void_p(dpy))
+                    print(f"[click] XMapWindow called", flush=True)
+                except Exception as e:
+                    print(f"[click] XMapWindow error: {e}", flush=True)
+
+        import subprocess as _sp
+        # 1) wmctrl — plain activation request to KWin
+        _wmctrl_ok = False
+        with _trace_span("wmctrl", "activate"):
+            try:
+                r = _sp.run(["wmctrl", "-ia", hex(xid)],
+                            capture_output=True, timeout=2)
+                print(f"[click] wmctrl exit={r.returncode}", flush=True)
+                _wmctrl_ok = (r.returncode == 0)
+            except FileNotFoundError:
+                print("[click] wmctrl not found", flush=True)
+            except Exception as e:
+                print(f"[click] wmctrl error: {e}", flush=True)
+
+        # 2) xdotool — often more reliable for XWayland windows
+        #    (sudo dnf install xdotool / sudo apt install xdotool)
+        _xdotool_ok = False
+        with _trace_span("xdotool", "activate"):
+            try:
+                r = _sp.run(
+                    ["xdotool", "windowactivate", "--sync", str(xid)],
+                    capture_output=True, timeout=2)
+                print(f"[click] xdotool exit={r.returncode}", flush=True)
+                _xdotool_ok = (r.returncode == 0)
+            except FileNotFoundError:
+                print("[click] xdotool not found (dnf install xdotool)", flush=True)
+            except Exception as e:
+                print(f"[click] xdotool error: {e}", flush=True)
+
+        if _wmctrl_ok or _xdotool_ok:
+            return
+
+        # 2b) PID fallback: search for a sibling window from the same
+        # process that KWin DOES manage (_NET_CLIENT_LIST).  Wine/Proton
+        # at character-selection creates an "Untitled window" that KWin
+        # doesn't track; another window from the same PID is the one
+        # KWin can activate.
+        if not _wmctrl_ok:
+            with _trace_span("pid_sibling", "activate"):
+                try:
+                    target_pid = self.wnck_window.get_pid()
+                    if target_pid:
+                        for sibling in Wnck.Screen.get_default().get_windows():
+                            s_xid = sibling.get_xid()
+                            if s_xid == xid or sibling.get_pid() != target_pid:
+                                continue
+                            s_name = sibling.get_name()
+                            print(f"[click] trying PID sibling 0x{s_xid:x} '{s_name}'", flush=True)
+                            r2 = _sp.run(["wmctrl", "-ia", hex(s_xid)],
+                                         capture_output=True, timeout=2)
+                            print(f"[click] sibling wmctrl exit={r2.returncode}", flush=True)
+                            if r2.returncode == 0:
+                                _wmctrl_ok = True
+                                break
+                except Exception as e:
+                    print(f"[click] sibling search: {e}", flush=True)
+
+        if _wmctrl_ok:
+            return
+
+        # 3) Direct Xlib _NET_ACTIVE_WINDOW + XSetInputFocus
+        with _trace_span("net_activate_window", "activate"):
+            ok = _net_activate_window(xid, _ts)
+        print(f"[click] _net_activate_window={ok}", flush=True)
+        # 4) Wnck fallback
+        with _trace_span("wnck_activate", "activate"):
+            try:
+                print(f"[click] Wnck activate ts={_ts}", flush=True)
+                if self.wnck_window.is_minimized():
+                    self.wnck_window.unminimize(_ts)
+                self.wnck_window.activate(_ts)
+            except Exception as e:
+                print(f"[click] Wnck error: {e}", flush=True)
+
     # ------------------------------------------------------------------
     # Layer-shell delegation — override GTK.Window methods so callers
     # in EVEOPreview don't need to know which display mode is active.
     # ------------------------------------------------------------------
 
     def show(self):
-        if self._use_ls:
+        self.set_paused("hidden", False)
+        if self._mosaic:
+            self._mosaic.set_visible(self, True)
+        elif self._use_ls:
             if self._ls:
                 self._ls.show()
         else:
             super().show()
 
     def show_all(self):
-        if self._use_ls:
+        self.set_paused("hidden", False)
+        if self._mosaic:
+            self._mosaic.set_visible(self, True)
+        elif self._use_ls:
             if self._ls:
                 self._ls.show()
         else:
             super().show_all()
 
     def hide(self):
-        if self._use_ls:
+        self.set_paused("hidden", True)
+        if self._mosaic:
+            self._mosaic.set_visible(self, False)
+        elif self._use_ls:
             if self._ls:
                 self._ls.hide()
         else:
@@ -1129,6 +3163,8 @@ class ThumbnailWindow(Gtk.Window):
 
     def move(self, x, y):
         self._ls_x, self._ls_y = x, y
+        if self._mosaic:
+            return
         if self._use_ls:
             if self._ls:
                 self._ls.set_pos(x, y)
@@ -1137,6 +3173,7 @@ class ThumbnailWindow(Gtk.Window):
 
     def resize(self, w, h):
         self._target_w, self._target_h = w, h
+        self._worker_sync()
         if self._use_ls:
             if self._ls:
                 self._ls.set_size(w, h)
@@ -1160,6 +3197,8 @@ class ThumbnailWindow(Gtk.Window):
                 pass
             if self._ls:
                 self._ls.destroy()
+            self._tick = None
+            self._close_slot()
             if self.update_id:
                 try:
                     GLib.source_remove(self.update_id)
@@ -1197,6 +3236,7 @@ class ThumbnailWindow(Gtk.Window):
 
     def _on_map(self, widget):
         """Re-assert after map — KWin processes _NET_WM_STATE changes post-map."""
+        self.set_paused("unmapped", False)
         if self._always_on_top and not self._use_ls:
             super().set_keep_above(True)
             gdk_win = self.get_window()
@@ -1211,74 +3251,28 @@ class ThumbnailWindow(Gtk.Window):
             self._root_xid = xid
             self._capture_xid = xid          # may be replaced by child in tick
             self.live_window = GdkX11.X11Window.foreign_new_for_display(display, xid)
+            self._watch_live_window()
             self._target_w, self._target_h = int(target_w), int(target_h)
             self._start_live_timer()
         except Exception as e:
             print("Live capture bind failed:", e)
 
     def _start_live_timer(self):
-        if self.update_id:
-            try:
-                GLib.source_remove(self.update_id)
-            except Exception:
-                pass
-            self.update_id = None
-        
-        # Convert FPS to milliseconds
-        fps = int(self.config.settings.get("refresh_fps", 10))
-        period = int(1000 / fps)  # Convert FPS to ms
-
-        # Rate-limit _try_bind_child: at most once per second, not every tick.
-        _child_bind_counter = [0]
-        _child_bind_interval = max(fps, 10)  # try once per second
-
-        def _try_bind_child():
-            """Wine Fixed Window renders into a child XID — find and bind it."""
-            try:
-                display = GdkX11.X11Display.get_default()
-                children = _get_child_xids(self._root_xid)
-                if DEBUG_CAPTURE:
-                    print(f"[capture] XID=0x{self._root_xid:x} children={[hex(c) for c in children]}")
-                for child_xid in reversed(children):   # last = topmost
-                    cw = GdkX11.X11Window.foreign_new_for_display(display, child_xid)
-                    if cw:
-                        cw_w, cw_h = cw.get_width(), cw.get_height()
-                        if DEBUG_CAPTURE:
-                            print(f"[capture]   child 0x{child_xid:x} size={cw_w}x{cw_h}")
-                        if cw_w > 0 and cw_h > 0:
-                            self.live_window   = cw
-                            self._capture_xid  = child_xid
-                            return True
-            except Exception as e:
-                if DEBUG_CAPTURE:
-                    print(f"[capture] _try_bind_child error: {e}")
-            return False
-
-        _raise_counter = [0]
-
         # NOTE: tick takes *_args because GLib.Source.set_callback passes
         # user_data as an extra positional argument to the callback.
         def tick(*_args):
             if not self.live_window:
-                return False
-            # Re-assert window stacking every ~2 s (every 20 ticks at 10 fps).
-            _raise_counter[0] += 1
-            if _raise_counter[0] >= 20:
-                _raise_counter[0] = 0
-                if self._always_on_top:
-                    self.set_keep_above(True)
-                    gdk_win = self.get_window()
-                    if gdk_win:
-                        gdk_win.raise_()
-            try:
-                if self.wnck_window.is_minimized():
-                    self._set_icon_fallback()
-                    return True
-            except Exception:
-                pass
+                self.update_id = None
+                return False
+            now = _time.monotonic()
+            self._reassert_above(now)
+            if self._minimized:
+                self._set_icon_fallback()
+                return True
             try:
-                w = self.live_window.get_width()
-                h = self.live_window.get_height()
+                # Geometry and map state come from events (_dispatch_gdk_event),
+                # so the only request in a steady-state tick is the GetImage.
+                w, h = self._geom
                 if DEBUG_CAPTURE:
                     print(f"[capture] XID=0x{self._capture_xid:x} size={w}x{h}", end="")
                 if w <= 0 or h <= 0:
@@ -1286,29 +3280,43 @@ class ThumbnailWindow(Gtk.Window):
                     self._set_icon_fallback()
                     return True
                 # Skip non-viewable windows to avoid Gdk-CRITICAL spam.
-                if not self.live_window.is_viewable():
+                if not self._mapped:
                     self._set_icon_fallback()
                     return True
+                t0 = _time.perf_counter()
                 Gdk.error_trap_push()
-                pb = Gdk.pixbuf_get_from_window(self.live_window, 0, 0, w, h)
-                if Gdk.error_trap_pop():
-                    pb = None  # BadDrawable / window gone — ignore
-                if DEBUG_CAPTURE:
-                    print(f" → pixbuf={'ok' if pb else 'None'}")
-                if pb:
-                    pb = pb.scale_simple(self._target_w, self._target_h, GdkPixbuf.InterpType.BILINEAR)
-                    if self._use_ls and self._ls:
-                        self._ls.send_frame(pb)
+                with _trace_span("capture", "capture", w=w, h=h, xid=self._root_xid):
+                    if self._pool:
+                        src = self._capture_pooled(w, h)
                     else:
-                        self.image.set_from_pixbuf(pb)
+                        src = Gdk.pixbuf_get_from_window(self.live_window, 0, 0, w, h)
+                if self._pool:
+                    # cairo-xlib papers over a failed GetImage with a fallback
+                    # copy, so the trapped error is the only sign the pixels
+                    # are garbage.  GetImage is a round trip, so popping the
+                    # trap costs no extra XSync.
+                    if Gdk.error_trap_pop():
+                        src = None
+                else:
+                    # No XSync: a failed GetImage already yields no frame, and
+                    # the error itself is dropped whenever it arrives.
+                    Gdk.error_trap_pop_ignored()
+                t1 = _time.perf_counter()
+                if DEBUG_CAPTURE:
+                    print(f" → frame={'ok' if src else 'None'}")
+                if src:
+                    tier = self._quality_tier()
+                    with _trace_span("scale", "capture", tier=tier):
+                        frame = self._scale(src, self._target_w, self._target_h, tier)
+                    self.stats.record_frame(t1 - t0, _time.perf_counter() - t1, w * h)
+                    self._note_change(frame.get_data() if self._pool else frame.get_pixels())
+                    self._present(frame)
+                    self._mark_live()
                 else:
-                    # Parent returned no pixels — try child windows (Wine Fixed Window)
-                    # Rate-limited: once per second instead of every tick to avoid
-                    # X11 round-trip storms with multiple clients.
-                    _child_bind_counter[0] += 1
-                    if self._capture_xid == self._root_xid and _child_bind_counter[0] >= _child_bind_interval:
-                        _child_bind_counter[0] = 0
-                        _try_bind_child()
+                    # Parent returned no pixels — try child windows (Wine Fixed
+                    # Window), and re-query geometry in case an event was missed.
+                    if not self._maybe_bind_child(now):
+                        self._resync_live(now)
                     self._set_icon_fallback()
             except Exception as e:
                 if DEBUG_CAPTURE:
@@ -1316,24 +3324,544 @@ class ThumbnailWindow(Gtk.Window):
                 self._set_icon_fallback()
             return True
 
+        self._tick = tick
+        self._timer_period = None
+        self._retune_capture()
+
+    def _reassert_above(self, now):
+        """Re-assert window stacking every ~2 s."""
+        if now - self._last_raise < 2.0:
+            return
+        self._last_raise = now
+        if self._always_on_top:
+            self.set_keep_above(True)
+            gdk_win = self.get_window()
+            if gdk_win:
+                gdk_win.raise_()
+
+    def _maybe_bind_child(self, now):
+        """Rate-limited _try_bind_child(): at most once per second, not every
+        tick, to avoid X11 round-trip storms with multiple clients."""
+        if self._capture_xid != self._root_xid or now - self._last_child_bind < 1.0:
+            return False
+        self._last_child_bind = now
+        return self._try_bind_child()
+
+    def _try_bind_child(self):
+        """Wine Fixed Window renders into a child XID — find and bind it."""
+        with _trace_span("child_scan", "discovery"):
+            return self._scan_children()
+
+    def _scan_children(self):
+        try:
+            display = GdkX11.X11Display.get_default()
+            children = _get_child_xids(self._root_xid)
+            if DEBUG_CAPTURE:
+                print(f"[capture] XID=0x{self._root_xid:x} children={[hex(c) for c in children]}")
+            for child_xid in reversed(children):   # last = topmost
+                cw = GdkX11.X11Window.foreign_new_for_display(display, child_xid)
+                if cw:
+                    cw_w, cw_h = cw.get_width(), cw.get_height()
+                    if DEBUG_CAPTURE:
+                        print(f"[capture]   child 0x{child_xid:x} size={cw_w}x{cw_h}")
+                    if cw_w > 0 and cw_h > 0:
+                        self.live_window   = cw
+                        self._capture_xid  = child_xid
+                        self._watch_live_window()
+                        return True
+        except Exception as e:
+            if DEBUG_CAPTURE:
+                print(f"[capture] _try_bind_child error: {e}")
+        return False
+
+    def _watch_live_window(self):
+        """Track the capture window's geometry and map state from events.
+
+        Selects StructureNotify on it and seeds the cache with one query;
+        from then on ConfigureNotify / MapNotify / UnmapNotify keep _geom
+        and _mapped current via _dispatch_gdk_event, and Wnck state-changed
+        keeps _minimized current, so tick never asks the server.
+        """
+        for xid, t in list(_foreign_watch.items()):
+            if t is self:
+                del _foreign_watch[xid]
+        win = self.live_window
+        _foreign_watch[self._capture_xid] = self
+        try:
+            win.set_events(win.get_events() | Gdk.EventMask.STRUCTURE_MASK)
+            _x, _y, w, h = win.get_geometry()
+            self._geom = (w, h)
+            self._mapped = win.is_viewable()
+            self._minimized = self.wnck_window.is_minimized()
+        except Exception as e:
+            if DEBUG_CAPTURE:
+                print(f"[capture] watch 0x{self._capture_xid:x} failed: {e}")
+
+    def _on_foreign_event(self, event):
+        kind = event.get_event_type()
+        if kind == Gdk.EventType.CONFIGURE:
+            self._geom = (event.configure.width, event.configure.height)
+        elif kind == Gdk.EventType.MAP:
+            self._mapped = True
+        elif kind in (Gdk.EventType.UNMAP, Gdk.EventType.DESTROY):
+            self._mapped = False
+
+    def _resync_live(self, now):
+        """Deferred error check: after a failed capture, re-query geometry
+        (at most once a second) in case the cached state went stale."""
+        if now - self._last_resync < 1.0 or not self.live_window:
+            return
+        self._last_resync = now
+        Gdk.error_trap_push()
+        try:
+            _x, _y, w, h = self.live_window.get_geometry()
+            self._geom = (w, h)
+        except Exception:
+            pass
+        if Gdk.error_trap_pop():
+            self._mapped = False   # window is gone
+
+    # ------------------------------------------------------------------
+    # Character profiles (character_profiles in the config).
+
+    def _lookup_profile(self):
+        profiles = self.config.settings.get("character_profiles", {})
+        return dict(profiles.get(_character_name(self.wnck_window.get_name() or ""), {}))
+
+    def _profile_size(self):
+        s = self.config.settings
+        if self._mosaic:
+            # Mosaic cells share one size.
+            return s["thumbnail_width"], s["thumbnail_height"]
+        p = self._profile
+        return (int(p.get("width", s["thumbnail_width"])),
+                int(p.get("height", s["thumbnail_height"])))
+
+    def _zoom_factor(self):
+        return float(self._profile.get("zoom_factor",
+                                       self.config.settings.get("zoom_factor", 1.25)))
+
+    def _base_fps(self):
+        """Rate before pauses, hover and caps: the profile's, else refresh_fps.
+        Snapshot profiles refresh every snapshot_s and go live on hover."""
+        p = self._profile
+        if p.get("mode") == "snapshot":
+            return 1.0 / max(float(p.get("snapshot_s", 10)), 0.1)
+        return float(p.get("fps", self.config.settings.get("refresh_fps", 10)))
+
+    def apply_profile(self):
+        """Re-read settings and this character's profile.  Only a thumbnail
+        whose rate, size or zoom changed is resized and retuned; returns
+        whether it was."""
+        before = (self._base_fps(), self.original_size, self._zoom_factor())
+        self._profile = self._lookup_profile()
+        size = self._profile_size()
+        if (self._base_fps(), size, self._zoom_factor()) == before:
+            return False
+        if size != self.original_size:
+            self.original_size = size
+            if not self.is_hovering:
+                self.resize(*size)
+        self._send_zoom()
+        self._retune_capture()
+        return True
+
+    def _desired_fps(self):
+        """Capture rate for this thumbnail right now (0 while paused)."""
+        if self._pause_reasons:
+            return 0.0
+        fps = self._base_fps()
+        if self.is_hovering and not self._stalled:
+            # Priority lane: the zoomed client ignores the capture budget.
+            return max(fps, float(self.config.settings.get("hover_fps", 30)))
+        if self._stalled:
+            fps = min(fps, self.LIVENESS_FPS)
+        if self._budget_fps is not None:
+            fps = min(fps, self._budget_fps)
+        if self._idle_fps is not None:
+            fps = min(fps, self._idle_fps)
+        return fps
+
+    def set_budget_fps(self, fps):
+        """Called by _CaptureBudget with this thumbnail's share."""
+        self._budget_fps = fps
+        self._retune_capture()
+
+    def set_idle_fps(self, fps):
+        """Cap while the user is idle (see EVEOPreview._check_user_idle);
+        None restores the full rate with an immediate capture."""
+        if fps == self._idle_fps:
+            return
+        resumed = fps is None
+        self._idle_fps = fps
+        self._retune_capture()
+        if resumed and not self.paused:
+            self._next_capture = 0.0
+            GLib.idle_add(self._capture_now, priority=GLib.PRIORITY_DEFAULT)
+
+    @property
+    def paused(self):
+        return bool(self._pause_reasons)
+
+    def set_paused(self, reason, paused):
+        """Set or clear one pause reason; capture runs only with none set."""
+        if paused == (reason in self._pause_reasons):
+            return
+        was_paused = self.paused
+        if paused:
+            self._pause_reasons.add(reason)
+        else:
+            self._pause_reasons.discard(reason)
+        if self.paused == was_paused:
+            return
+        self._retune_capture()
+        if not self.paused:
+            # Visible again: don't wait a whole period with a stale frame.
+            self._next_capture = 0.0
+            GLib.idle_add(self._capture_now, priority=GLib.PRIORITY_DEFAULT)
+
+    def set_focus_paused(self, on):
+        """pause_active_client: freeze on a dimmed copy of the last frame."""
+        if on == ("focused" in self._pause_reasons):
+            return
+        self.set_paused("focused", on)
+        frame = self._last_frame
+        if on and frame is not None:
+            if isinstance(frame, tuple):      # raw worker frame (layer-shell)
+                w, h, rs, data, fmt = frame
+                if fmt == _FMT_RGBA:
+                    frame = GdkPixbuf.Pixbuf.new_from_bytes(
+                        GLib.Bytes.new(data), GdkPixbuf.Colorspace.RGB, True, 8, w, h, rs)
+                else:
+                    frame = Gdk.pixbuf_get_from_surface(_cairo.ImageSurface.create_for_data(
+                        bytearray(data), _CAIRO_FORMATS[fmt], w, h, rs), 0, 0, w, h)
+            elif not isinstance(frame, GdkPixbuf.Pixbuf):   # pooled surface
+                frame = Gdk.pixbuf_get_from_surface(
+                    frame, 0, 0, frame.get_width(), frame.get_height())
+            w, h = frame.get_width(), frame.get_height()
+            dim = GdkPixbuf.Pixbuf.new(GdkPixbuf.Colorspace.RGB, True, 8, w, h)
+            dim.fill(0x000000FF)
+            frame.composite(dim, 0, 0, w, h, 0, 0, 1.0, 1.0,
+                            GdkPixbuf.InterpType.NEAREST, 110)
+            self._present(dim, remember=False)
+
+    def _send_zoom(self):
+        if self._ls:
+            s = self.config.settings
+            self._ls.set_zoom(self._zoom_factor() if s.get("zoom_on_hover", True) else 0)
+
+    def _set_hovering(self, on):
+        """Enter or leave the hover lane.  Call after the target size has
+        been updated so the out-of-band capture lands at the zoomed size."""
+        if on == self.is_hovering:
+            return
+        self.is_hovering = on
+        self._retune_capture()
+        if on:
+            self._next_capture = 0.0
+            self._capture_now()
+
+    def _capture_now(self):
+        if not self.live_window or self.paused:
+            return False
+        if self._worker:
+            self._worker.send(f"NOW {self._root_xid}")
+        elif self._tick:
+            self._tick()
+        return False
+
+    def _retune_capture(self):
+        """(Re)attach the capture timer if _desired_fps() moved by >10 %."""
+        if self._mosaic:
+            self._mosaic._retime()   # one timer paces every cell
+        if self._worker:
+            self._worker_sync()
+            return
+        if not self._tick or self._mosaic:
+            return   # the mosaic's scheduler calls _tick itself
+        fps = self._desired_fps()
+        if fps <= 0:
+            if self.update_id:
+                GLib.source_remove(self.update_id)
+                self.update_id = None
+            self._timer_period = None
+            return
+        period = max(1, int(1000 / fps))
+        prio = GLib.PRIORITY_DEFAULT if self.is_hovering else GLib.PRIORITY_LOW
+        old = self._timer_period
+        if (old is not None and self.update_id and prio == self._timer_prio
+                and abs(period - old) <= old * 0.1):
+            return
+        if self.update_id:
+            try:
+                GLib.source_remove(self.update_id)
+            except Exception:
+                pass
+            self.update_id = None
+        self._timer_period = period
+        self._timer_prio = prio
         # CRITICAL: Use GLib.PRIORITY_LOW (300) for capture timers so they yield
         # to user input events (PRIORITY_DEFAULT=0) and IPC callbacks
         # (PRIORITY_HIGH=-100).  With two EVE clients, two capture timers at
         # PRIORITY_DEFAULT consume the entire main loop, starving idle_add
         # callbacks that deliver CLICK/ENTER/LEAVE from subprocesses.
+        # Only the one hovered thumbnail is lifted to PRIORITY_DEFAULT.
         src = GLib.timeout_source_new(period)
-        src.set_priority(GLib.PRIORITY_LOW)
-        src.set_callback(tick)
+        src.set_priority(prio)
+        src.set_callback(self._tick)
         self.update_id = src.attach()
 
-    def _set_icon_fallback(self):
+    # ------------------------------------------------------------------
+    # Capture worker mode — see _CaptureWorkerPool.
+
+    def _attach_worker(self, worker):
+        """Hand capture to a worker process instead of the local timer."""
+        if self._worker is worker:
+            return
+        if self._worker:
+            self._worker.remove(self)
+        if self._slot is None:
+            self._slot = _FrameSlot(self._root_xid)
+        if self.update_id:
+            try:
+                GLib.source_remove(self.update_id)
+            except Exception:
+                pass
+            self.update_id = None
+        self._worker = worker
+        self._worker_msg = None
+        worker.add(self)
+        self._worker_sync()
+
+    def _detach_worker(self):
+        """Back to in-process capture (the worker went away)."""
+        self._worker = None
+        self._timer_period = None
+        self._retune_capture()
+
+    def _worker_sync(self):
+        """Send the worker this thumbnail's current capture parameters."""
+        if not self._worker or not self._root_xid:
+            return
+        msg = (f"SET {self._root_xid} {self._capture_xid} {self._target_w} "
+               f"{self._target_h} {self._desired_fps():.2f} {self._quality_tier()} "
+               f"{self._wire_format() if self._use_ls else _FMT_RGB24}")
+        if msg != self._worker_msg:
+            self._worker_msg = msg
+            self._worker.send(msg)
+
+    def _on_worker_frame(self, offset, capture_us, scale_us, src_pixels):
+        if not self.live_window or not self._slot:
+            return
+        self._reassert_above(_time.monotonic())
+        frame = self._slot.read(offset)
+        if frame is None:
+            return   # already overwritten; a newer frame is on its way
+        _seq, w, h, rs, data, fmt = frame
+        self.stats.record_frame(capture_us / 1e6, scale_us / 1e6, src_pixels)
+        self._note_change(data)
+        if self._use_ls and self._ls:
+            # The helper maps the slot itself — no base64 over the pipe.
+            self._ls.send_shm_frame(self._slot.path, offset)
+            self._last_frame = (w, h, rs, data, fmt)
+        elif fmt == _FMT_RGB24 and self._pool:
+            # Native frame: copy into the pooled out surface, no conversion.
+            surf, _arr = self._pool.surface("out", w, h)
+            if surf.get_stride() != rs:
+                return   # not presented, so not live either
+            surf.get_data()[:] = data
+            surf.mark_dirty()
+            self._present(surf)
+        elif fmt == _FMT_RGBA:
+            self._present(GdkPixbuf.Pixbuf.new_from_bytes(
+                GLib.Bytes.new(data), GdkPixbuf.Colorspace.RGB, True, 8, w, h, rs))
+        else:
+            return
+        self._mark_live()
+
+    def _on_worker_miss(self):
+        if self._minimized:
+            self._set_icon_fallback()
+            return
+        if self._maybe_bind_child(_time.monotonic()):
+            self._worker_sync()
+        self._set_icon_fallback()
+
+    def _close_slot(self):
+        if self._slot:
+            self._slot.close()
+            self._slot = None
+
+    def _present(self, pb, remember=True):
+        """Show a scaled frame wherever this thumbnail is displayed.
+
+        pb is a GdkPixbuf or a pooled cairo surface; surfaces are shown
+        without copying, except into the layer-shell slot.
+        """
+        if remember:
+            self._last_frame = pb
+        is_pb = isinstance(pb, GdkPixbuf.Pixbuf)
+        if self._mosaic:
+            self._mosaic.set_frame(self, pb)
+        elif self._use_ls and self._ls:
+            if is_pb:
+                self._ls.send_frame(pb)
+            else:
+                self._send_surface(pb)
+        elif is_pb:
+            self.image.set_from_pixbuf(pb)
+        else:
+            self.image.set_from_surface(pb)
+
+    def _send_surface(self, surf):
+        """Hand a pooled surface to the layer-shell helper via the frame slot.
+
+        Pixels stay in cairo's native format (or the reduced depth from
+        _wire_format()) and are written straight into the slot — no pixbuf,
+        no alpha channel added, no base64.
+        """
+        if self._slot is None:
+            self._slot = _FrameSlot(self._root_xid)
+        data, rs, fmt = self._pool.to_wire(surf, self._wire_format())
+        self._slot_seq += 1
+        off = _shm_write(self._slot.mm, self._slot_seq, surf.get_width(),
+                         surf.get_height(), rs, data, fmt)
+        if off >= 0:
+            self._ls.send_shm_frame(self._slot.path, off)
+        else:
+            self._ls.send_frame(Gdk.pixbuf_get_from_surface(
+                surf, 0, 0, surf.get_width(), surf.get_height()))
+
+    def _wire_format(self):
+        """Slot format for this thumbnail: native RGB24, or the reduced
+        "background_depth" while it is neither active nor hovered."""
+        if self.is_hovering or self.is_active:
+            return _FMT_RGB24
+        depth = self.config.settings.get("background_depth", "full")
+        if depth == "rgb565":
+            return _FMT_RGB565
+        if depth == "grey":
+            return _FMT_A8
+        return _FMT_RGB24
+
+    def _note_change(self, pixels):
+        """Stamp last_change when the scaled frame differs from the last one."""
+        crc = _zlib.crc32(pixels)
+        if crc != self._frame_crc:
+            self._frame_crc = crc
+            self.last_change = _time.monotonic()
+
+    def _quality_tier(self):
+        """Scaling tier for the thumbnail's current state.
+
+        Hovered (zoomed) beats active beats background, so only the one or
+        two thumbnails the user is looking at pay for the expensive filter.
+        """
+        if self.is_hovering:
+            key = "scale_quality_hover"
+        elif self.is_active:
+            key = "scale_quality_active"
+        else:
+            key = "scale_quality_background"
+        tier = self.config.settings.get(key, "bilinear")
+        return tier if tier in _SCALE_TIERS else "bilinear"
+
+    def _capture_pooled(self, w, h):
+        """Paint the client window into the pooled source surface.
+
+        The same server-side copy gdk_pixbuf_get_from_window() makes, minus
+        its per-frame pixbuf.  Returns the surface, or None if cairo could
+        not read it.  The tick has already checked the event-driven _mapped
+        cache, which stands in for the viewability test that
+        pixbuf_get_from_window() makes, and it checks X errors afterwards.
+        """
+        surf, _arr = self._pool.surface("src", w, h)
+        cr = _cairo.Context(surf)
+        cr.set_operator(_cairo.OPERATOR_SOURCE)
+        Gdk.cairo_set_source_window(cr, self.live_window, 0, 0)
         try:
-            pixbuf = self.wnck_window.get_icon()
-            if pixbuf:
-                scaled = pixbuf.scale_simple(self._target_w, self._target_h, GdkPixbuf.InterpType.BILINEAR)
-                self.image.set_from_pixbuf(scaled)
-        except Exception:
-            pass
+            cr.paint()
+        except _cairo.Error:
+            return None
+        surf.flush()
+        return surf
+
+    def _scale(self, pb, w, h, tier):
+        """Downscale a captured frame to the thumbnail size.
+
+        Uses the NumPy scaler when available (and not disabled via the
+        "scale_backend" setting, or bypassed by the "hyper" tier); otherwise
+        GdkPixbuf.scale_simple() with the interpolation of the current
+        quality tier.  Pooled captures stay in the pool (see _FramePool.scale).
+        tier comes from the caller, which already has it for its trace span.
+        """
+        backend = self.config.settings.get("scale_backend", "auto")
+        scaler = self._scaler if backend != "gdk" and tier != "hyper" else None
+        if self._pool and not isinstance(pb, GdkPixbuf.Pixbuf):
+            src_arr = self._pool.surface("src", pb.get_width(), pb.get_height())[1]
+            return self._pool.scale(pb, src_arr, w, h, tier, scaler)
+        if scaler is not None:
+            # Pixbuf path (no pycairo): one copy in, one new pixbuf out per
+            # tick.  Reused, copy-free buffers need the pooled path above.
+            try:
+                out = scaler.by_tier(tier, _pixbuf_array(pb), w, h)
+                if out is not None:
+                    return _array_to_pixbuf(out)
+            except Exception as e:
+                if DEBUG_CAPTURE:
+                    print(f"[capture] numpy scale failed, using gdk: {e}")
+        return pb.scale_simple(w, h, _SCALE_TIERS[tier])
+
+    LIVENESS_FPS = 1.0
+
+    def _set_icon_fallback(self):
+        """No pixels this tick: slow to a liveness check and keep the last
+        good frame on screen, or the window icon scaled once per size."""
+        self.stats.fallbacks += 1
+        if not self._stalled:
+            self._stalled = True
+            self._retune_capture()
+        size = (self._target_w, self._target_h)
+        if self._fallback_size == size:
+            return   # already showing it
+        self._fallback_size = size
+        if self._last_frame_size() == size:
+            return   # freeze on the last frame, which is still displayed
+        icon = self._icon_cache.get(size)
+        if icon is None:
+            try:
+                pixbuf = self.wnck_window.get_icon()
+            except Exception:
+                pixbuf = None
+            if not pixbuf:
+                return
+            icon = pixbuf.scale_simple(*size, GdkPixbuf.InterpType.BILINEAR)
+            self._icon_cache[size] = icon
+        self._present(icon, remember=False)
+
+    def _last_frame_size(self):
+        frame = self._last_frame
+        if frame is None:
+            return None
+        if isinstance(frame, tuple):
+            return frame[0], frame[1]
+        return frame.get_width(), frame.get_height()
+
+    def _mark_live(self):
+        """A real frame arrived: back to the normal capture rate."""
+        self._fallback_size = None
+        if self._stalled:
+            self._stalled = False
+            self._retune_capture()
+
+    def _on_wnck_state(self, _win, changed, new):
+        self._minimized = bool(new & Wnck.WindowState.MINIMIZED)
+        # Restored from minimized: capture now rather than at the next
+        # liveness check.
+        if (self._stalled and changed & Wnck.WindowState.MINIMIZED
+                and not new & Wnck.WindowState.MINIMIZED):
+            self._mark_live()
+            GLib.idle_add(self._capture_now, priority=GLib.PRIORITY_DEFAULT)
 
     def _update_border_style(self):
         """Update the border color based on active state"""
@@ -1366,6 +3894,10 @@ class ThumbnailWindow(Gtk.Window):
         """Set whether this thumbnail represents the active window"""
         if self.is_active != is_active:
             self.is_active = is_active
+            self.last_active = _time.monotonic()
+            self._worker_sync()
+            if self._mosaic:
+                self._mosaic.invalidate()
             if self._use_ls:
                 if self._ls:
                     color = self.config.settings.get("active_border_color", "#00FF00")
@@ -1418,19 +3950,19 @@ class ThumbnailWindow(Gtk.Window):
         if not self.config.settings.get("zoom_on_hover", True):
             return
         if not self.is_hovering:
-            self.is_hovering = True
-            z = self.config.settings.get("zoom_factor", 1.25)
+            z = self._zoom_factor()
             self.resize(int(self.original_size[0]*z), int(self.original_size[1]*z))
+            self._set_hovering(True)
 
     def _on_mouse_leave(self, *_):
         if not self.config.settings.get("zoom_on_hover", True):
             return
         if self.is_hovering:
-            self.is_hovering = False
             self.resize(*self.original_size)
+            self._set_hovering(False)
 
     def _on_destroy(self, *_):
-        if not self._use_ls:
+        if not self._use_ls and not self._mosaic:
             # Layer-shell mode saves position in destroy() and _on_ls_pos().
             try:
                 x, y = self.get_position()
@@ -1440,6 +3972,15 @@ class ThumbnailWindow(Gtk.Window):
                 self.config.save()
             except Exception:
                 pass
+        self._tick = None
+        self._close_slot()
+        if _foreign_watch.get(self._capture_xid) is self:
+            del _foreign_watch[self._capture_xid]
+        try:
+            self.wnck_window.disconnect(self._state_handler)
+            self.wnck_window.disconnect(self._name_handler)
+        except Exception:
+            pass
         if self.update_id:
             try:
                 GLib.source_remove(self.update_id)
@@ -1447,13 +3988,415 @@ class ThumbnailWindow(Gtk.Window):
                 pass
             self.update_id = None
 
+import math
+
+class _Mosaic:
+    """Mosaic "wall" mode: every client's thumbnail drawn into one surface.
+
+    One window (or one layer-shell helper on Wayland), one redraw per frame
+    and one restack, instead of one toplevel per client.  A single timer
+    drives all in-process captures: each frame it ticks the thumbnails
+    whose _desired_fps() says they are due, then repaints once.  Clicks are
+    hit-tested against the cell rectangles and go through the same
+    activation path as a standalone thumbnail.
+
+    "mosaic_layout" is "grid" (mosaic_columns wide, 0 = roughly square) or
+    "free" (cells at mosaic_cells[window name]; left-drag a cell to move
+    it, X11 surface only).  Right-drag, or left-drag in grid layout, moves
+    the whole mosaic.
+    """
+
+    GAP = 4
+    DRAG_THRESHOLD = 6
+
+    def __init__(self, app):
+        self.app = app
+        self.config = app.config
+        self.thumbs = []            # display order
+        self.frames = {}            # thumb → latest scaled pixbuf
+        self.rects = {}             # thumb → (x, y, w, h) in mosaic coordinates
+        self.hidden = set()         # hide_active_client
+        self._size = None
+        self._surface = None        # layer-shell: reused composition surface
+        self._slot = None           # ... and the frame slot it is sent through
+        self._slot_seq = 0
+        self._dirty = False
+        self._hover = None
+        self._press = None          # (thumb, x_root, y_root, x, y, time)
+        self._drag_offset = None    # free layout: pointer offset inside the cell
+        self._timer = None
+        self._period = None
+        self._last_raise = 0.0
+        pos = self.config.settings.get("mosaic_position", [12, 12])
+        self._x, self._y = int(pos[0]), int(pos[1])
+        self.window = self._ls = None
+        if _LAYER_SHELL_AVAILABLE and _WAYLAND_SESSION:
+            self._ls = _LayerShellDisplay(self._x, self._y, 1, 1, self._on_ls_click,
+                                          self._on_ls_ctrl_click, self._on_ls_pos)
+        else:
+            self._build_window()
+        self._retime()
+
+    def _build_window(self):
+        win = Gtk.Window()
+        win.set_type_hint(Gdk.WindowTypeHint.UTILITY)
+        win.set_skip_taskbar_hint(True)
+        win.set_skip_pager_hint(True)
+        win.set_decorated(False)
+        win.set_title("EVE-O Preview Mosaic")
+        visual = win.get_screen().get_rgba_visual()
+        if visual:
+            win.set_visual(visual)
+        try:
+            win.set_opacity(self.config.settings.get("opacity", 0.95))
+        except Exception:
+            pass
+        if self.config.settings.get("always_on_top", True):
+            win.set_keep_above(True)
+        area = Gtk.DrawingArea()
+        area.connect("draw", lambda _w, cr: self._paint(cr) or False)
+        win.add(area)
+        win.add_events(
+            Gdk.EventMask.BUTTON_PRESS_MASK |
+            Gdk.EventMask.BUTTON_RELEASE_MASK |
+            Gdk.EventMask.POINTER_MOTION_MASK |
+            Gdk.EventMask.LEAVE_NOTIFY_MASK
+        )
+        win.connect("button-press-event", self._on_press)
+        win.connect("button-release-event", self._on_release)
+        win.connect("motion-notify-event", self._on_motion)
+        win.connect("leave-notify-event", lambda *_: self._set_hover(None))
+        win.connect("configure-event", self._on_configure)
+        win.move(self._x, self._y)
+        self.window, self.area = win, area
+
+    # ------------------------------------------------------------------
+    # Thumbnails
+
+    def add(self, thumb):
+        self.thumbs.append(thumb)
+        self.relayout()
+        self._retime()
+        if self.window:
+            self.window.show_all()
+        elif self._ls:
+            self._ls.show()
+
+    def remove(self, thumb):
+        if thumb in self.thumbs:
+            self.thumbs.remove(thumb)
+        self.frames.pop(thumb, None)
+        self.hidden.discard(thumb)
+        if self._hover is thumb:
+            self._hover = None
+        if self._press and self._press[0] is thumb:
+            self._press = None
+        self.relayout()
+        self._retime()
+
+    def set_visible(self, thumb, visible):
+        if visible == (thumb not in self.hidden):
+            return
+        if visible:
+            self.hidden.discard(thumb)
+        else:
+            self.hidden.add(thumb)
+        self.relayout()
+
+    def set_frame(self, thumb, pb):
+        self.frames[thumb] = pb
+        self._dirty = True
+
+    def invalidate(self):
+        self._dirty = True
+
+    @staticmethod
+    def _key(thumb):
+        return thumb.wnck_window.get_name() or ""
+
+    def relayout(self):
+        s = self.config.settings
+        tw, th = s["thumbnail_width"], s["thumbnail_height"]
+        g = self.GAP
+        visible = [t for t in self.thumbs if t not in self.hidden]
+        cols = int(s.get("mosaic_columns", 0)) or max(1, math.ceil(math.sqrt(len(visible))))
+        free = s.get("mosaic_layout", "grid") == "free"
+        cells = s.get("mosaic_cells", {})
+        self.rects = {}
+        for i, t in enumerate(visible):
+            pos = cells.get(self._key(t)) if free else None
+            if pos is None:
+                pos = (g + (i % cols) * (tw + g), g + (i // cols) * (th + g))
+            self.rects[t] = (int(pos[0]), int(pos[1]), tw, th)
+        w = max([x + cw for x, _y, cw, _h in self.rects.values()] or [tw]) + g
+        h = max([y + ch for _x, y, _w, ch in self.rects.values()] or [th]) + g
+        if (w, h) != self._size:
+            self._size = (w, h)
+            if self.window:
+                self.area.set_size_request(w, h)
+                self.window.resize(w, h)
+            elif self._ls:
+                self._ls.set_size(w, h)
+        self._dirty = True
+
+    def _cell_at(self, x, y):
+        for t, (cx, cy, cw, ch) in self.rects.items():
+            if cx <= x < cx + cw and cy <= y < cy + ch:
+                return t
+        return None
+
+    # ------------------------------------------------------------------
+    # Scheduling and drawing
+
+    # Floor on the frame rate, so worker frames are still composited and
+    # the window restacked when every cell is paused or on a slow profile.
+    MIN_FPS = 1.0
+
+    def _retime(self):
+        # The fastest cell (hovered, or a profile above refresh_fps) sets
+        # the pace; _frame skips the others until they are due.  Called
+        # from ThumbnailWindow._retune_capture whenever a cell's rate
+        # changes, and when cells come and go.
+        fps = max([self.MIN_FPS] + [t._desired_fps() for t in self.thumbs])
+        period = max(1, int(1000 / fps))
+        if period == self._period:
+            return
+        if self._timer:
+            GLib.source_remove(self._timer)
+        self._period = period
+        # PRIORITY_LOW like the per-thumbnail capture timers it replaces.
+        src = GLib.timeout_source_new(period)
+        src.set_priority(GLib.PRIORITY_LOW)
+        src.set_callback(self._frame)
+        self._timer = src.attach()
+
+    def _frame(self, *_args):
+        now = _time.monotonic()
+        slack = self._period / 2000.0    # half a frame, so 10 fps stays 10 fps
+        for t in list(self.thumbs):
+            if t._worker or not t._tick or t.paused:
+                continue
+            if now + slack >= t._next_capture:
+                t._next_capture = now + 1.0 / max(t._desired_fps(), 0.01)
+                t._tick()
+        if self._dirty:
+            self._dirty = False
+            self._redraw()
+        if now - self._last_raise >= 2.0:
+            self._last_raise = now
+            self.raise_()
+        return True
+
+    def raise_(self):
+        if self.window and self.config.settings.get("always_on_top", True):
+            self.window.set_keep_above(True)
+            gdk_win = self.window.get_window()
+            if gdk_win:
+                gdk_win.raise_()
+
+    def _redraw(self):
+        if self.window:
+            self.area.queue_draw()
+        elif self._ls and self._size:
+            import cairo
+            w, h = self._size
+            surface = self._surface
+            if surface is None or (surface.get_width(), surface.get_height()) != (w, h):
+                surface = self._surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, w, h)
+            self._paint(cairo.Context(surface))
+            surface.flush()
+            # Premultiplied ARGB32 goes into the slot as-is; the helper
+            # wraps it in a surface of the same format.
+            if self._slot is None:
+                self._slot = _FrameSlot(0)
+            self._slot_seq += 1
+            off = _shm_write(self._slot.mm, self._slot_seq, w, h, surface.get_stride(),
+                             surface.get_data(), _FMT_ARGB32)
+            if off >= 0:
+                self._ls.send_shm_frame(self._slot.path, off)
+            else:
+                self._ls.send_frame(Gdk.pixbuf_get_from_surface(surface, 0, 0, w, h))
+
+    def _paint(self, cr):
+        s = self.config.settings
+        cr.set_source_rgba(0.05, 0.05, 0.05, 0.85)
+        cr.paint()
+        try:
+            hexc = s.get("active_border_color", "#00FF00").lstrip("#")
+            active_rgb = tuple(int(hexc[i:i + 2], 16) / 255.0 for i in (0, 2, 4))
+        except Exception:
+            active_rgb = (0.0, 1.0, 0.0)
+        show_label = s.get("show_overlay", True)
+        cr.select_font_face("Sans", 0, 1)   # normal slant, bold weight
+        cr.set_font_size(11)
+        for t, (x, y, w, h) in self.rects.items():
+            pb = self.frames.get(t)
+            if pb:
+                cr.save()
+                cr.rectangle(x, y, w, h)
+                cr.clip()
+                if isinstance(pb, GdkPixbuf.Pixbuf):
+                    Gdk.cairo_set_source_pixbuf(cr, pb, x, y)
+                else:
+                    cr.set_source_surface(pb, x, y)
+                cr.paint()
+                cr.restore()
+            if t.is_active:
+                cr.set_source_rgb(*active_rgb)
+                cr.set_line_width(4)
+                cr.rectangle(x + 2, y + 2, w - 4, h - 4)
+                cr.stroke()
+            elif t is self._hover:
+                cr.set_source_rgba(1, 1, 1, 0.5)
+                cr.set_line_width(2)
+                cr.rectangle(x + 1, y + 1, w - 2, h - 2)
+                cr.stroke()
+            if show_label:
+                name = _character_name(t.wnck_window.get_name() or "")
+                ext = cr.text_extents(name)
+                lw, lh = ext[2] + 16, 20
+                lx, ly = x + (w - lw) / 2, y + 6
+                cr.set_source_rgba(0, 0, 0, 0.7)
+                cr.rectangle(lx, ly, lw, lh)
+                cr.fill()
+                cr.set_source_rgb(1, 1, 1)
+                cr.move_to(lx + 8 - ext[0], ly + (lh - ext[3]) / 2 - ext[1])
+                cr.show_text(name)
+
+    # ------------------------------------------------------------------
+    # Input (X11 surface)
+
+    def _on_press(self, _w, ev):
+        t = self._cell_at(ev.x, ev.y)
+        if ev.button == 3:
+            self.window.begin_move_drag(ev.button, int(ev.x_root), int(ev.y_root), ev.time)
+            return True
+        if ev.button != 1:
+            return False
+        if ev.state & Gdk.ModifierType.CONTROL_MASK:
+            if t:
+                try:
+                    t.wnck_window.minimize()
+                except Exception:
+                    pass
+            return True
+        self._press = (t, ev.x_root, ev.y_root, ev.x, ev.y, ev.time)
+        self._drag_offset = None
+        return True
+
+    def _on_motion(self, _w, ev):
+        if not self._press:
+            self._set_hover(self._cell_at(ev.x, ev.y))
+            return False
+        t, xr, yr, x0, y0, etime = self._press
+        if self._drag_offset is None:
+            if abs(ev.x_root - xr) + abs(ev.y_root - yr) <= self.DRAG_THRESHOLD:
+                return True
+            if t is None or self.config.settings.get("mosaic_layout", "grid") != "free":
+                self._press = None
+                self.window.begin_move_drag(1, int(xr), int(yr), etime)
+                return True
+            cx, cy, _cw, _ch = self.rects[t]
+            self._drag_offset = (x0 - cx, y0 - cy)
+        cells = self.config.settings.setdefault("mosaic_cells", {})
+        cells[self._key(t)] = [max(0, int(ev.x - self._drag_offset[0])),
+                               max(0, int(ev.y - self._drag_offset[1]))]
+        self.relayout()
+        return True
+
+    def _on_release(self, _w, ev):
+        if ev.button != 1 or not self._press:
+            return False
+        t = self._press[0]
+        dragged = self._drag_offset is not None
+        self._press = self._drag_offset = None
+        if dragged:
+            self.config.save()
+        elif t:
+            try:
+                if t.wnck_window.is_minimized():
+                    t.wnck_window.unminimize(Gtk.get_current_event_time())
+                t.on_activate_callback(t.wnck_window)
+            except Exception:
+                pass
+        return True
+
+    def _set_hover(self, t):
+        if t is self._hover:
+            return
+        if self._hover:
+            self._hover._set_hovering(False)
+        self._hover = t
+        if t:
+            t._set_hovering(True)   # retimes via _retune_capture
+        self._dirty = True
+
+    def _on_configure(self, win, _ev):
+        x, y = win.get_position()
+        if (x, y) != (self._x, self._y):
+            self._x, self._y = x, y
+            self.config.settings["mosaic_position"] = [x, y]
+            self.config.save()
+        return False
+
+    # ------------------------------------------------------------------
+    # Input (layer-shell surface)
+
+    def _ls_target(self):
+        pos = self._ls.last_click
+        return self._cell_at(*pos) if pos else None
+
+    def _on_ls_click(self):
+        t = self._ls_target()
+        if t:
+            t._click_activate()
+
+    def _on_ls_ctrl_click(self):
+        t = self._ls_target()
+        if t:
+            try:
+                t.wnck_window.minimize()
+            except Exception:
+                pass
+
+    def _on_ls_pos(self, x, y):
+        self._x, self._y = x, y
+        self.config.settings["mosaic_position"] = [x, y]
+        self.config.save()
+
+    def destroy(self, drain=False):
+        if self._timer:
+            GLib.source_remove(self._timer)
+            self._timer = None
+        if self._ls:
+            self._ls.destroy(drain)
+        if self._slot:
+            self._slot.close()
+        if self.window:
+            self.window.destroy()
+
 class EVEOPreview(Gtk.Window):
     def __init__(self):
         super().__init__()
         self.config = Config()
         self.thumbnails = {}
         self.client_rows = {}        # xid → Gtk.ListBoxRow in the management window
+        self.client_stats_labels = {}  # xid → Gtk.Label with live capture stats
         self._pending_watches = {}   # xid → handler_id for name-changed watchers
+        _placement.configure(self.config.settings)
+        n_workers = int(self.config.settings.get("capture_workers", 0))
+        self._worker_pool = _CaptureWorkerPool(n_workers) if n_workers > 0 else None
+        self._mosaic = (_Mosaic(self)
+                        if self.config.settings.get("display_mode") == "mosaic" else None)
+        # Inputs to the off-screen check, kept current from events so
+        # _refresh_visibility makes no X requests per thumbnail: surface
+        # rects from configure-event, monitor rects until the layout changes.
+        self._surface_rects = {}      # X11 thumbnail surface → (x, y, w, h)
+        self._monitor_rects = None
+        self._visibility_queued = False
+        Gdk.Screen.get_default().connect("monitors-changed", self._on_monitors_changed)
+        if self._mosaic and self._mosaic.window:
+            self._watch_surface(self._mosaic.window)
         self.screen = Wnck.Screen.get_default()
         self.screen.force_update()
 
@@ -1501,6 +4444,12 @@ class EVEOPreview(Gtk.Window):
         
         backend_label = Gtk.Label(label=f"Backend: {backend}")
         info_box.pack_start(backend_label, False, False, 0)
+
+        info_box.pack_start(Gtk.Separator(orientation=Gtk.Orientation.VERTICAL),
+                            False, False, 0)
+        self.placement_label = Gtk.Label(label=_placement.describe())
+        self.placement_label.get_style_context().add_class("client-stats")
+        info_box.pack_start(self.placement_label, False, False, 0)
         
         vbox.pack_start(info_box, False, False, 0)
 
@@ -1521,6 +4470,11 @@ class EVEOPreview(Gtk.Window):
         self.status_label = Gtk.Label(label="Scanning for EVE clients...")
         self.status_label.set_halign(Gtk.Align.START)
         status_box.pack_start(self.status_label, True, True, 0)
+
+        self.loop_stats_label = Gtk.Label()
+        self.loop_stats_label.get_style_context().add_class("client-stats")
+        self.loop_stats_label.set_halign(Gtk.Align.END)
+        status_box.pack_end(self.loop_stats_label, False, False, 0)
         
         vbox.pack_start(status_box, False, False, 0)
 
@@ -1545,6 +4499,7 @@ class EVEOPreview(Gtk.Window):
         self.screen.connect("window-opened", self._on_window_opened)
         self.screen.connect("window-closed", self._on_window_closed)
         self.screen.connect("active-window-changed", self._on_active_changed)
+        Gdk.event_handler_set(_dispatch_gdk_event)
 
         # Periodic safety-net poll: KDE Plasma 6 sometimes doesn't fire
         # active-window-changed after alt-tab between XWayland windows.
@@ -1554,6 +4509,28 @@ class EVEOPreview(Gtk.Window):
         self._scan_existing()
         GLib.timeout_add(2000, self._periodic_client_scan)
 
+        # Live per-client stats — replaces reading --debug output per frame.
+        self._loop_probe = _LoopLagProbe()
+        stall_ms = int(self.config.settings.get("stall_threshold_ms", 250))
+        self._watchdog = _StallWatchdog(stall_ms) if stall_ms > 0 else None
+        self._budget = _CaptureBudget(self.config)
+        GLib.timeout_add(1000, self._rebalance_capture)
+        self._user_idle = False
+        GLib.timeout_add(1000, self._check_user_idle)
+        # Global hotkeys switch clients without the click cascade.
+        self._rebuild_cycle()         # _cycle: xids in hotkey cycle order
+        self._hotkey_pending = None   # (xid, monotonic time of the key press)
+        self._hotkey_ms = None        # last key-to-focus latency
+        self._hotkeys = _Hotkeys(self._on_hotkey)
+        self._bind_hotkeys()
+        # Off-screen thumbnails (other desktop, monitor off or gone) stop
+        # capturing; a desktop switch, a move or a monitor change re-checks
+        # at once, and the 1 s timer picks up DPMS and desktop moves.
+        self.screen.connect("active-workspace-changed",
+                            lambda *_: self._refresh_visibility())
+        GLib.timeout_add(1000, self._refresh_visibility)
+        GLib.timeout_add(1000, self._refresh_stats)
+
     def _apply_styles(self):
         css_provider = Gtk.CssProvider()
         css = b"""
@@ -1563,6 +4540,11 @@ class EVEOPreview(Gtk.Window):
         .client-name {
             font-weight: bold;
         }
+        .client-stats {
+            font-size: smaller;
+            font-family: monospace;
+            opacity: 0.75;
+        }
         """
         css_provider.load_from_data(css)
         Gtk.StyleContext.add_provider_for_screen(
@@ -1572,6 +4554,10 @@ class EVEOPreview(Gtk.Window):
         )
 
     def _scan_existing(self):
+        with _trace_span("scan_existing", "discovery"):
+            self._scan_existing_windows()
+
+    def _scan_existing_windows(self):
         for w in self.screen.get_windows():
             self._check_and_add(w)
         self._update_status()
@@ -1622,9 +4608,17 @@ class EVEOPreview(Gtk.Window):
 
     def _add_thumb(self, window):
         xid = window.get_xid()
-        thumb = ThumbnailWindow(window, self.config, self._activate_window)
+        thumb = ThumbnailWindow(window, self.config, self._activate_window,
+                                mosaic=self._mosaic)
         self.thumbnails[xid] = thumb
-        thumb.bind_live(xid, self.config.settings["thumbnail_width"], self.config.settings["thumbnail_height"])
+        self._rebuild_cycle()
+        if self._mosaic:
+            self._mosaic.add(thumb)
+        thumb.bind_live(xid, *thumb.original_size)
+        if self._worker_pool:
+            self._worker_pool.assign(thumb)
+        if not self._mosaic and not thumb._use_ls:
+            self._watch_surface(thumb)
 
         name = window.get_name()
         pos = self.config.settings.get("thumbnail_positions", {}).get(name)
@@ -1647,11 +4641,20 @@ class EVEOPreview(Gtk.Window):
         icon = Gtk.Image.new_from_icon_name("application-x-executable", Gtk.IconSize.DND)
         row_box.pack_start(icon, False, False, 0)
         
+        text_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=2)
         label = Gtk.Label(label=name)
         label.get_style_context().add_class("client-name")
         label.set_halign(Gtk.Align.START)
         label.set_ellipsize(3)  # Ellipsize at end
-        row_box.pack_start(label, True, True, 0)
+        text_box.pack_start(label, False, False, 0)
+
+        stats_label = Gtk.Label()
+        stats_label.get_style_context().add_class("client-stats")
+        stats_label.set_halign(Gtk.Align.START)
+        stats_label.set_ellipsize(3)
+        text_box.pack_start(stats_label, False, False, 0)
+        row_box.pack_start(text_box, True, True, 0)
+        self.client_stats_labels[xid] = stats_label
         
         row.add(row_box)
         self.client_list.add(row)
@@ -1659,11 +4662,8 @@ class EVEOPreview(Gtk.Window):
         self.client_rows[xid] = row
 
         def _refresh_row_label(*_args):
-            raw = window.get_name() or "EVE"
-            display = raw
-            if " - " in raw:
-                display = raw.split(" - ", 1)[1].split("[")[0].strip()
-            label.set_text(display)
+            label.set_text(_character_name(window.get_name() or "EVE"))
+            self._rebuild_cycle()
         window.connect("name-changed", _refresh_row_label)
         _refresh_row_label()
 
@@ -1672,11 +4672,17 @@ class EVEOPreview(Gtk.Window):
     def _remove_thumb(self, xid):
         t = self.thumbnails.pop(xid, None)
         if t:
+            if self._worker_pool:
+                self._worker_pool.release(t)
+            if self._mosaic:
+                self._mosaic.remove(t)
             t.destroy()
 
         row = self.client_rows.pop(xid, None)
         if row:
             row.destroy()
+        self.client_stats_labels.pop(xid, None)
+        self._rebuild_cycle()
 
         self._update_status()
 
@@ -1722,6 +4728,11 @@ class EVEOPreview(Gtk.Window):
         windows into the final character client window. This keeps the client
         list and thumbnail set in sync without requiring an app restart.
         """
+        with _trace_span("periodic_client_scan", "discovery"):
+            self._sync_client_list()
+        return True
+
+    def _sync_client_list(self):
         try:
             self.screen.force_update()
             windows = list(self.screen.get_windows())
@@ -1739,7 +4750,6 @@ class EVEOPreview(Gtk.Window):
                 self._apply_active_borders(active.get_xid())
         except Exception as e:
             print(f"[scan] periodic client scan error: {e}")
-        return True
 
     def _on_active_changed(self, _screen, _prev):
         active = self.screen.get_active_window()
@@ -1796,7 +4806,79 @@ class EVEOPreview(Gtk.Window):
                     t.set_active_state(t_xid == xid)
         return True  # keep repeating
 
+    # ------------------------------------------------------------------
+    # Global hotkeys (_Hotkeys).
+
+    def _bind_hotkeys(self):
+        n = self._hotkeys.bind(self.config.settings.get("hotkeys", {}))
+        if n:
+            print(f"[hotkeys] {n} global hotkey(s) grabbed")
+
+    def _rebuild_cycle(self):
+        """Hotkey cycle order: cycle_order names first, the rest by name."""
+        order = [n.lower() for n in self.config.settings.get("cycle_order", [])]
+        names = {xid: _character_name(t.wnck_window.get_name() or "").lower()
+                 for xid, t in self.thumbnails.items()}
+        self._cycle = sorted(names, key=lambda xid: (
+            order.index(names[xid]) if names[xid] in order else len(order), names[xid]))
+        self._cycle_names = {name: xid for xid, name in names.items()}
+
+    def _on_hotkey(self, action, x_time):
+        cmd, _, arg = action.strip().partition(" ")
+        cycle, xid = self._cycle, None
+        if not cycle:
+            return
+        if cmd in ("next", "previous"):
+            step = 1 if cmd == "next" else -1
+            active = self.screen.get_active_window()
+            cur = active.get_xid() if active else None
+            if cur in cycle:
+                xid = cycle[(cycle.index(cur) + step) % len(cycle)]
+            else:
+                xid = cycle[0 if step > 0 else -1]
+        elif cmd == "client" and arg.isdigit():
+            n = int(arg)
+            xid = cycle[n - 1] if 1 <= n <= len(cycle) else None
+        elif cmd == "character":
+            xid = self._cycle_names.get(arg.strip().lower())
+        else:
+            print(f"[hotkeys] unknown action {action!r}")
+        if xid is not None:
+            self._fast_activate(xid, x_time)
+
+    # A hotkey activation that has not focused its client by then is
+    # dropped, so a later focus change is not reported as its latency.
+    HOTKEY_FOCUS_TIMEOUT = 2.0
+
+    def _fast_activate(self, xid, x_time):
+        """One _NET_ACTIVE_WINDOW with the key press's own server time —
+        a real user timestamp the WM honours — instead of the click path's
+        cascade of strategies; Wnck activation only if that fails."""
+        t = self.thumbnails.get(xid)
+        if t is None:
+            return
+        active = self.screen.get_active_window()
+        if active is None or active.get_xid() != xid:
+            # Nothing to measure when the target already has focus.
+            self._hotkey_pending = (xid, _time.monotonic())
+        with _trace_span("hotkey_activate", "focus", xid=xid):
+            if t._minimized:
+                try:
+                    t.wnck_window.unminimize(x_time)
+                except Exception:
+                    pass
+            if not _net_activate_window(xid, x_time):
+                self._activate_window(t.wnck_window)
+
     def _apply_active_borders(self, active_xid):
+        pending = self._hotkey_pending
+        if pending and _time.monotonic() - pending[1] > self.HOTKEY_FOCUS_TIMEOUT:
+            pending = self._hotkey_pending = None   # activation never landed
+        if pending and pending[0] == active_xid:
+            self._hotkey_pending = None
+            self._hotkey_ms = (_time.monotonic() - pending[1]) * 1000.0
+            if _tracer:
+                _tracer.counter("hotkey_focus_ms", round(self._hotkey_ms, 1))
         for xid, t in self.thumbnails.items():
             is_active = (xid == active_xid)
 
@@ -1807,6 +4889,11 @@ class EVEOPreview(Gtk.Window):
             if self.config.settings.get("hide_active_client", False):
                 t.hide() if is_active else t.show()
 
+            # Or keep it on screen, frozen, so the focused client doesn't
+            # compete with its own preview for CPU.
+            t.set_focus_paused(is_active and
+                               self.config.settings.get("pause_active_client", False))
+
             # Update opacity (layer-shell subprocess doesn't support GTK opacity)
             if not t._use_ls:
                 try:
@@ -1819,6 +4906,8 @@ class EVEOPreview(Gtk.Window):
             GLib.timeout_add(100, self._raise_all_thumbnails)
 
     def _raise_all_thumbnails(self):
+        if self._mosaic:
+            self._mosaic.raise_()
         for t in self.thumbnails.values():
             if t._use_ls:
                 continue  # Layer-shell OVERLAY needs no raising
@@ -1843,11 +4932,16 @@ class EVEOPreview(Gtk.Window):
         dialog = SettingsDialog(self, self.config)
         if dialog.run() == Gtk.ResponseType.OK:
             dialog.save_settings()
+            _placement.configure(self.config.settings)
+            self._bind_hotkeys()
+            self._rebuild_cycle()
             for t in self.thumbnails.values():
-                t.original_size = (self.config.settings["thumbnail_width"],
-                                   self.config.settings["thumbnail_height"])
-                t.resize(*t.original_size)
-                t._target_w, t._target_h = t.original_size
+                # Retunes only thumbnails whose rate, size or zoom changed;
+                # the rest keep their capture timers.
+                if not t.apply_profile():
+                    t._send_zoom()         # zoom_on_hover may have changed
+                    if t._worker:
+                        t._worker_sync()   # scale tier / depth
                 if not t._use_ls:
                     try:
                         t.set_opacity(self.config.settings.get("opacity", 0.95))
@@ -1861,11 +4955,140 @@ class EVEOPreview(Gtk.Window):
                             t.label.hide()
                     # Update border colors
                     t._update_border_style()
-                # Restart capture timer with new FPS (applies to both modes)
-                if t.live_window:
-                    t._start_live_timer()
+            if self._mosaic:
+                self._mosaic.relayout()
         dialog.destroy()
 
+    def _watch_surface(self, gtk_win):
+        """Track an X11 thumbnail surface's root geometry for _surface_offscreen."""
+        gtk_win.connect("configure-event", self._on_surface_configure)
+        gtk_win.connect("destroy", lambda w: self._surface_rects.pop(w, None))
+
+    def _on_surface_configure(self, gtk_win, ev):
+        rect = (ev.x, ev.y, ev.width, ev.height)
+        if self._surface_rects.get(gtk_win) != rect:
+            self._surface_rects[gtk_win] = rect
+            self._queue_visibility()
+        return False
+
+    def _on_monitors_changed(self, _screen):
+        self._monitor_rects = None
+        self._queue_visibility()
+
+    def _queue_visibility(self):
+        """Re-run _refresh_visibility once, after the current burst of events."""
+        if not self._visibility_queued:
+            self._visibility_queued = True
+            GLib.idle_add(self._refresh_visibility_once)
+
+    def _refresh_visibility_once(self):
+        self._visibility_queued = False
+        self._refresh_visibility()
+        return False
+
+    def _surface_offscreen(self, gtk_win, workspace):
+        """True if an X11 thumbnail surface can't currently be seen.
+
+        Uses only cached state: the surface rect from configure-event, the
+        monitor rects, and Wnck's view of the surface's desktop.
+        """
+        gdk_win = gtk_win.get_window()
+        rect = self._surface_rects.get(gtk_win)
+        if gdk_win is None or rect is None or not gtk_win.get_mapped():
+            return False    # the "unmapped" reason covers this
+        if workspace is not None:
+            ww = Wnck.Window.get(gdk_win.get_xid())
+            ws = ww.get_workspace() if ww and not ww.is_pinned() else None
+            if ws is not None and ws.get_number() != workspace:
+                return True
+        if self._monitor_rects is None:
+            display = gdk_win.get_display()
+            self._monitor_rects = [display.get_monitor(i).get_geometry()
+                                   for i in range(display.get_n_monitors())]
+        x, y, w, h = rect
+        for g in self._monitor_rects:
+            if x < g.x + g.width and x + w > g.x and y < g.y + g.height and y + h > g.y:
+                return False
+        return True
+
+    def _refresh_visibility(self):
+        """Pause capture for thumbnails nobody can see."""
+        dpms_off = _dpms_display_off()
+        ws = self.screen.get_active_workspace()
+        ws = ws.get_number() if ws else None
+        mosaic_off = False
+        if self._mosaic and self._mosaic.window and not dpms_off:
+            mosaic_off = self._surface_offscreen(self._mosaic.window, ws)
+        for t in self.thumbnails.values():
+            if dpms_off:
+                off = True
+            elif t._mosaic:
+                off = mosaic_off
+            elif t._use_ls:
+                off = False     # overlay surfaces show on every desktop
+            else:
+                off = self._surface_offscreen(t, ws)
+            t.set_paused("offscreen", off)
+        return True
+
+    def _check_user_idle(self):
+        """Throttle every thumbnail to idle_fps while nobody is at the
+        keyboard or mouse.  Polls every 200 ms while idle so the first input
+        brings full rate back at once, every second otherwise."""
+        after = float(self.config.settings.get("idle_after_s", 180))
+        idle_ms = _user_idle_ms() if after > 0 else None
+        idle = idle_ms is not None and idle_ms >= after * 1000
+        if idle != self._user_idle:
+            self._user_idle = idle
+            print(f"[idle] user {'idle' if idle else 'back'}; "
+                  f"capture {'throttled' if idle else 'at full rate'}")
+        fps = float(self.config.settings.get("idle_fps", 1)) if idle else None
+        for t in self.thumbnails.values():
+            t.set_idle_fps(fps)
+        GLib.timeout_add(200 if idle else 1000, self._check_user_idle)
+        return False
+
+    def _rebalance_capture(self):
+        """Once a second: re-split the capture budget across thumbnails."""
+        self._budget.allocate(list(self.thumbnails.values()))
+        return True
+
+    def _refresh_stats(self):
+        """Once a second: roll every thumbnail's counters into its list row."""
+        for xid, t in self.thumbnails.items():
+            ls = t._ls
+            fps, bps = t.stats.roll(ls.bytes_sent if ls else 0)
+            label = self.client_stats_labels.get(xid)
+            if label is None:
+                continue
+            if t.paused:
+                label.set_text("paused: " + ", ".join(sorted(t._pause_reasons)))
+                continue
+            parts = [f"{fps:4.1f}/{t._desired_fps():.1f} fps",
+                     f"cap {t.stats.capture_ms:5.1f} ms",
+                     f"scale {t.stats.scale_ms:5.1f} ms"]
+            if ls:
+                parts.append(f"{bps / 1024:6.0f} KB/s")
+                parts.append(f"{ls.frames_dropped} dropped")
+            parts.append(f"{t.stats.fallbacks} icon")
+            if t._pool:
+                parts.append(f"{t._pool.allocs} allocs")
+            label.set_text(" · ".join(parts))
+        avg, peak = self._loop_probe.roll()
+        text = f"Main loop lag: {avg:.1f} ms avg, {peak:.0f} ms max"
+        if self._watchdog:
+            text += f" · {self._watchdog.stalls} stalls"
+        budget_pct = self.config.settings.get("capture_budget_pct", 0)
+        if budget_pct:
+            text += f" · capture ~{self._budget.used_pct:.0f}% of {budget_pct}% budget"
+        if self._user_idle:
+            text += " · user idle"
+        if self._hotkey_ms is not None:
+            text += f" · hotkey→focus {self._hotkey_ms:.0f} ms"
+        self.loop_stats_label.set_text(text)
+        self.placement_label.set_text(_placement.describe())
+        return True
+
     def _update_status(self):
         count = len(self.thumbnails)
         if count == 0:
@@ -1876,9 +5099,15 @@ class EVEOPreview(Gtk.Window):
             self.status_icon.set_from_icon_name("emblem-default", Gtk.IconSize.MENU)
 
 class SettingsDialog(Gtk.Dialog):
+    # Profiles tab columns after "Character": (profile key, header, parser).
+    PROFILE_COLUMNS = [("fps", "FPS", float), ("width", "Width", int),
+                       ("height", "Height", int), ("zoom_factor", "Zoom", float),
+                       ("mode", "Mode", str), ("snapshot_s", "Snapshot s", float)]
+
     def __init__(self, parent, config):
         super().__init__(title="Settings", parent=parent, flags=0)
         self.config = config
+        self._app = parent
         self.set_default_size(480, 520)
         self.set_resizable(False)
 
@@ -1920,6 +5149,10 @@ class SettingsDialog(Gtk.Dialog):
         behavior_page = self._create_behavior_page()
         notebook.append_page(behavior_page, Gtk.Label(label="Behavior"))
 
+        # Per-character profiles page
+        profiles_page = self._create_profiles_page()
+        notebook.append_page(profiles_page, Gtk.Label(label="Profiles"))
+
         self.show_all()
 
     def _apply_styles(self):
@@ -2161,6 +5394,12 @@ class SettingsDialog(Gtk.Dialog):
         self.hide_active.set_active(self.config.settings["hide_active_client"])
         behavior_box.pack_start(self.hide_active, False, False, 0)
 
+        self.pause_active = Gtk.CheckButton(label="Freeze active client thumbnail")
+        self.pause_active.set_tooltip_text(
+            "Stop capturing the focused client; its thumbnail keeps a dimmed last frame")
+        self.pause_active.set_active(self.config.settings.get("pause_active_client", False))
+        behavior_box.pack_start(self.pause_active, False, False, 0)
+
         self.show_overlay = Gtk.CheckButton(label="Show character name overlay")
         self.show_overlay.set_active(self.config.settings["show_overlay"])
         behavior_box.pack_start(self.show_overlay, False, False, 0)
@@ -2245,6 +5484,127 @@ class SettingsDialog(Gtk.Dialog):
         
         perf_grid.attach(fps_box, 1, 0, 2, 1)
 
+        # Scaling quality per thumbnail state
+        self.quality_combos = {}
+        tiers = [("nearest", "Nearest (fastest)"), ("tiles", "Tiles"),
+                 ("bilinear", "Bilinear"), ("hyper", "Hyper (slowest)")]
+        states = [("scale_quality_background", "Background quality:"),
+                  ("scale_quality_active", "Active quality:"),
+                  ("scale_quality_hover", "Hover quality:")]
+        for row, (key, text) in enumerate(states, start=1):
+            q_label = Gtk.Label(label=text)
+            q_label.set_halign(Gtk.Align.END)
+            q_label.set_tooltip_text("Cheaper filters cost less CPU per frame")
+            perf_grid.attach(q_label, 0, row, 1, 1)
+            combo = Gtk.ComboBoxText()
+            for tier_id, tier_text in tiers:
+                combo.append(tier_id, tier_text)
+            if not combo.set_active_id(self.config.settings.get(key, "bilinear")):
+                combo.set_active_id("bilinear")
+            perf_grid.attach(combo, 1, row, 2, 1)
+            self.quality_combos[key] = combo
+
+        # Global capture budget
+        row = len(states) + 1
+        budget_label = Gtk.Label(label="CPU budget:")
+        budget_label.set_halign(Gtk.Align.END)
+        budget_label.set_tooltip_text(
+            "Ceiling on capture CPU across all clients, in % of one core. "
+            "Hovered and recently active clients are served first. 0 = no limit")
+        perf_grid.attach(budget_label, 0, row, 1, 1)
+        self.budget_spin = Gtk.SpinButton()
+        self.budget_spin.set_range(0, 100)
+        self.budget_spin.set_increments(1, 5)
+        self.budget_spin.set_value(self.config.settings.get("capture_budget_pct", 0))
+        perf_grid.attach(self.budget_spin, 1, row, 1, 1)
+        perf_grid.attach(Gtk.Label(label="% of a core"), 2, row, 1, 1)
+
+        # Reduced colour depth for background thumbnails (layer-shell)
+        row += 1
+        depth_label = Gtk.Label(label="Background depth:")
+        depth_label.set_halign(Gtk.Align.END)
+        depth_label.set_tooltip_text(
+            "Pixel format for inactive thumbnails sent to the overlay helper. "
+            "Lower depth halves or quarters the bytes per frame")
+        perf_grid.attach(depth_label, 0, row, 1, 1)
+        self.depth_combo = Gtk.ComboBoxText()
+        for depth_id, depth_text in (("full", "Full colour"), ("rgb565", "RGB565 (16-bit)"),
+                                     ("grey", "Greyscale")):
+            self.depth_combo.append(depth_id, depth_text)
+        if not self.depth_combo.set_active_id(self.config.settings.get("background_depth", "full")):
+            self.depth_combo.set_active_id("full")
+        perf_grid.attach(self.depth_combo, 1, row, 2, 1)
+
+        # Throttle while nobody is at the keyboard or mouse
+        row += 1
+        idle_label = Gtk.Label(label="When idle for:")
+        idle_label.set_halign(Gtk.Align.END)
+        idle_label.set_tooltip_text(
+            "Drop every thumbnail to a low frame rate after this long without "
+            "keyboard or mouse input; full rate returns on the next input. 0 = off")
+        perf_grid.attach(idle_label, 0, row, 1, 1)
+        self.idle_after_spin = Gtk.SpinButton()
+        self.idle_after_spin.set_range(0, 120)
+        self.idle_after_spin.set_increments(1, 5)
+        self.idle_after_spin.set_value(self.config.settings.get("idle_after_s", 180) / 60.0)
+        perf_grid.attach(self.idle_after_spin, 1, row, 1, 1)
+        idle_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
+        idle_box.pack_start(Gtk.Label(label="min →"), False, False, 0)
+        self.idle_fps_spin = Gtk.SpinButton()
+        self.idle_fps_spin.set_range(0.1, 10)
+        self.idle_fps_spin.set_increments(0.5, 1)
+        self.idle_fps_spin.set_digits(1)
+        self.idle_fps_spin.set_value(self.config.settings.get("idle_fps", 1))
+        idle_box.pack_start(self.idle_fps_spin, False, False, 0)
+        idle_box.pack_start(Gtk.Label(label="FPS"), False, False, 0)
+        perf_grid.attach(idle_box, 2, row, 1, 1)
+
+        # Where overlay helpers and capture workers run
+        row += 1
+        sched_label = Gtk.Label(label="Helper priority:")
+        sched_label.set_halign(Gtk.Align.END)
+        sched_label.set_tooltip_text(
+            "Scheduler policy and nice level of overlay helper and capture "
+            "worker processes, so they yield CPU to the EVE clients")
+        perf_grid.attach(sched_label, 0, row, 1, 1)
+        self.sched_combo = Gtk.ComboBoxText()
+        for sched_id, sched_text in (("normal", "Normal"), ("batch", "Batch"),
+                                     ("idle", "Idle only")):
+            self.sched_combo.append(sched_id, sched_text)
+        if not self.sched_combo.set_active_id(self.config.settings.get("helper_sched", "normal")):
+            self.sched_combo.set_active_id("normal")
+        perf_grid.attach(self.sched_combo, 1, row, 1, 1)
+        self.nice_spin = Gtk.SpinButton()
+        self.nice_spin.set_range(0, 19)
+        self.nice_spin.set_increments(1, 5)
+        self.nice_spin.set_value(self.config.settings.get("helper_nice", 0))
+        self.nice_spin.set_tooltip_text("Nice level (0 = unchanged)")
+        perf_grid.attach(self.nice_spin, 2, row, 1, 1)
+
+        row += 1
+        cpus_label = Gtk.Label(label="Helper CPUs:")
+        cpus_label.set_halign(Gtk.Align.END)
+        cpus_label.set_tooltip_text("CPU list such as 2-3 or 0,4-5; empty = any CPU")
+        perf_grid.attach(cpus_label, 0, row, 1, 1)
+        self.cpus_entry = Gtk.Entry()
+        self.cpus_entry.set_text(self.config.settings.get("helper_cpus", ""))
+        self.cpus_entry.set_placeholder_text("any")
+        perf_grid.attach(self.cpus_entry, 1, row, 2, 1)
+
+        row += 1
+        quota_label = Gtk.Label(label="Helper CPU quota:")
+        quota_label.set_halign(Gtk.Align.END)
+        quota_label.set_tooltip_text(
+            "Shared CPU quota for all helpers, via a systemd user slice. "
+            "Applies to helpers started afterwards. 0 = no limit")
+        perf_grid.attach(quota_label, 0, row, 1, 1)
+        self.quota_spin = Gtk.SpinButton()
+        self.quota_spin.set_range(0, 800)
+        self.quota_spin.set_increments(5, 25)
+        self.quota_spin.set_value(self.config.settings.get("helper_cpu_quota", 0))
+        perf_grid.attach(self.quota_spin, 1, row, 1, 1)
+        perf_grid.attach(Gtk.Label(label="% of a core"), 2, row, 1, 1)
+
         vbox.pack_start(perf_grid, False, False, 0)
 
         # Info section at bottom
@@ -2261,12 +5621,91 @@ class SettingsDialog(Gtk.Dialog):
 
         return vbox
 
+    def _create_profiles_page(self):
+        vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
+        vbox.set_margin_start(15)
+        vbox.set_margin_end(15)
+        vbox.set_margin_top(15)
+        vbox.set_margin_bottom(15)
+
+        title = Gtk.Label(label="Character Profiles")
+        title.set_halign(Gtk.Align.START)
+        title.get_style_context().add_class("section-title")
+        vbox.pack_start(title, False, False, 0)
+
+        hint = Gtk.Label(label="Empty cells use the global setting. Mode \"snapshot\" "
+                               "refreshes every Snapshot s seconds and live while hovered.")
+        hint.set_line_wrap(True)
+        hint.set_xalign(0)
+        vbox.pack_start(hint, False, False, 0)
+
+        self.profile_store = Gtk.ListStore(*([str] * (1 + len(self.PROFILE_COLUMNS))))
+        for name, prof in sorted(self.config.settings.get("character_profiles", {}).items()):
+            self.profile_store.append([name] + [
+                "" if prof.get(key) is None else
+                (f"{prof[key]:g}" if isinstance(prof[key], (int, float)) else str(prof[key]))
+                for key, _header, _parse in self.PROFILE_COLUMNS])
+
+        self.profile_view = Gtk.TreeView(model=self.profile_store)
+        modes = Gtk.ListStore(str)
+        for mode in ("", "live", "snapshot"):
+            modes.append([mode])
+        headers = ["Character"] + [h for _k, h, _p in self.PROFILE_COLUMNS]
+        for i, header in enumerate(headers):
+            if header == "Mode":
+                cell = Gtk.CellRendererCombo(model=modes, text_column=0, has_entry=False)
+            else:
+                cell = Gtk.CellRendererText()
+            cell.set_property("editable", True)
+            cell.connect("edited", self._on_profile_edited, i)
+            col = Gtk.TreeViewColumn(header, cell, text=i)
+            col.set_resizable(True)
+            self.profile_view.append_column(col)
+
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.set_vexpand(True)
+        scrolled.set_shadow_type(Gtk.ShadowType.IN)
+        scrolled.add(self.profile_view)
+        vbox.pack_start(scrolled, True, True, 0)
+
+        btn_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
+        running_btn = Gtk.Button(label="Add running clients")
+        running_btn.connect("clicked", self._on_profile_add_running)
+        btn_box.pack_start(running_btn, False, False, 0)
+        add_btn = Gtk.Button(label="Add")
+        add_btn.connect("clicked", lambda _b: self.profile_store.append(
+            ["New character"] + [""] * len(self.PROFILE_COLUMNS)))
+        btn_box.pack_start(add_btn, False, False, 0)
+        remove_btn = Gtk.Button(label="Remove")
+        remove_btn.connect("clicked", self._on_profile_remove)
+        btn_box.pack_end(remove_btn, False, False, 0)
+        vbox.pack_start(btn_box, False, False, 0)
+
+        return vbox
+
+    def _on_profile_edited(self, _cell, path, text, column):
+        self.profile_store[path][column] = text.strip()
+
+    def _on_profile_add_running(self, _btn):
+        known = {row[0] for row in self.profile_store}
+        for t in getattr(self._app, "thumbnails", {}).values():
+            name = _character_name(t.wnck_window.get_name() or "")
+            if name and name != "EVE" and name not in known:
+                known.add(name)
+                self.profile_store.append([name] + [""] * len(self.PROFILE_COLUMNS))
+
+    def _on_profile_remove(self, _btn):
+        model, it = self.profile_view.get_selection().get_selected()
+        if it is not None:
+            model.remove(it)
+
     def save_settings(self):
         self.config.settings["thumbnail_width"] = int(self.w_spin.get_value())
         self.config.settings["thumbnail_height"] = int(self.h_spin.get_value())
         self.config.settings["opacity"] = float(self.opacity.get_value())
         self.config.settings["always_on_top"] = self.always_on_top.get_active()
         self.config.settings["hide_active_client"] = self.hide_active.get_active()
+        self.config.settings["pause_active_client"] = self.pause_active.get_active()
         self.config.settings["zoom_on_hover"] = self.zoom_hover.get_active()
         self.config.settings["zoom_factor"] = float(self.zoom_factor.get_value())
         self.config.settings["show_overlay"] = self.show_overlay.get_active()
@@ -2286,6 +5725,39 @@ class SettingsDialog(Gtk.Dialog):
         elif self.fps_30.get_active():
             self.config.settings["refresh_fps"] = 30
 
+        for key, combo in self.quality_combos.items():
+            tier = combo.get_active_id()
+            if tier in _SCALE_TIERS:
+                self.config.settings[key] = tier
+        self.config.settings["capture_budget_pct"] = int(self.budget_spin.get_value())
+        self.config.settings["background_depth"] = self.depth_combo.get_active_id() or "full"
+        self.config.settings["idle_after_s"] = int(self.idle_after_spin.get_value() * 60)
+        self.config.settings["idle_fps"] = float(self.idle_fps_spin.get_value())
+        self.config.settings["helper_sched"] = self.sched_combo.get_active_id() or "normal"
+        self.config.settings["helper_nice"] = int(self.nice_spin.get_value())
+        cpus = self.cpus_entry.get_text().strip()
+        try:
+            _parse_cpu_list(cpus)
+            self.config.settings["helper_cpus"] = cpus
+        except ValueError:
+            print(f"[settings] ignoring bad CPU list {cpus!r}")
+        self.config.settings["helper_cpu_quota"] = int(self.quota_spin.get_value())
+
+        profiles = {}
+        for row in self.profile_store:
+            name = row[0].strip()
+            if not name:
+                continue
+            prof = {}
+            for i, (key, _header, parse) in enumerate(self.PROFILE_COLUMNS, start=1):
+                if row[i]:
+                    try:
+                        prof[key] = parse(row[i])
+                    except ValueError:
+                        print(f"[settings] profile {name}: ignoring {key} {row[i]!r}")
+            profiles[name] = prof
+        self.config.settings["character_profiles"] = profiles
+
         self.config.save()
 
 def main():
@@ -2329,8 +5801,32 @@ def main():
         return True  # keep repeating
     GLib.timeout_add(4000, _keep_app_above)
 
+    # SIGTERM/SIGINT quit the main loop cleanly so pending config changes
+    # are flushed below instead of being lost with the process.
+    import signal as _signal
+    for _sig in (_signal.SIGTERM, _signal.SIGINT):
+        GLib.unix_signal_add(GLib.PRIORITY_HIGH, _sig, lambda *_: Gtk.main_quit() or False)
+
     app.show_all()
-    Gtk.main()
+    try:
+        Gtk.main()
+    finally:
+        app.config.flush()
+        if app._worker_pool:
+            app._worker_pool.shutdown()
+        if app._mosaic:
+            app._mosaic.destroy(drain=True)
+        for t in app.thumbnails.values():
+            t._close_slot()
+        if app._watchdog:
+            print(f"[watchdog] {app._watchdog.stalls} stalls, worst "
+                  f"{app._watchdog.worst_ms:.0f} ms; loop latency {app._watchdog.summary()}")
+        if _tracer:
+            # Closing the helpers' stdin makes them exit and dump their spans.
+            for t in list(app.thumbnails.values()):
+                if t._ls:
+                    t._ls.destroy(drain=True)
+            _tracer.write()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file